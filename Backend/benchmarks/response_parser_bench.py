@@ -0,0 +1,89 @@
+"""
+Micro-benchmark for the streaming LLM response parser.
+
+Builds a large multi-file answer and times ResponseParser fed (a) in one
+piece and (b) in small token-sized chunks, next to the naive approach of
+re-parsing the accumulated text after every chunk. Run from Backend/:
+
+    python benchmarks/response_parser_bench.py [files] [lines-per-file]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mainframe_backend.services.response_parser import ResponseParser, parse_response  # noqa: E402
+
+
+def build_response(files: int, lines: int) -> str:
+    parts = ["Here are the members you asked for.\n"]
+    for index in range(files):
+        parts.append(f"Member {index} copies the input dataset:\n")
+        parts.append(f"```MEMBER{index:04}.jcl\n")
+        for line in range(lines):
+            parts.append(f"//STEP{line:04} EXEC PGM=IEBGENER,PARM='COPY {index}/{line}'\n")
+        parts.append("```\n")
+    parts.append("```json\n")
+    parts.append('{"commands": [{"command": "zowe jobs submit data-set \'USER.JCL(MEMBER0000)\'", "description": "Submit"}]}\n')
+    parts.append("```\n")
+    parts.append("Run `zowe zos-files list data-set USER.*` to check the results.\n")
+    return "".join(parts)
+
+
+def chunked(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def timed(label: str, size: int, run):
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed * 1000:9.1f} ms  {size / elapsed / 1e6:8.1f} MB/s")
+    return result
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    response = build_response(files, lines)
+    chunks = chunked(response, 4)  # roughly one token per chunk
+    print(f"{files} files x {lines} lines: {len(response) / 1e6:.2f} MB, {len(chunks)} chunks\n")
+
+    whole = timed("whole response", len(response), lambda: parse_response(response))
+
+    def streamed():
+        parser = ResponseParser()
+        events = 0
+        for chunk in chunks:
+            events += len(parser.feed(chunk))
+        events += len(parser.close())
+        return parser, events
+
+    parser, events = timed("streamed, 4-char chunks", len(response), streamed)
+    assert parser.result() == whole.result(), "streamed and whole parses differ"
+    assert len(parser.files) == files and parser.json_commands and parser.line_commands
+    print(f"{'':<38} {events} events, {len(parser.files)} files, {len(parser.commands)} command(s)\n")
+
+    # Re-parsing everything received so far is quadratic; keep the sample small
+    sample = chunks[:len(chunks) // 50]
+    sample_size = sum(len(chunk) for chunk in sample)
+
+    def reparse_each_chunk():
+        received = ""
+        for chunk in sample:
+            received += chunk
+            parse_response(received)
+
+    def incremental_sample():
+        parser = ResponseParser()
+        for chunk in sample:
+            parser.feed(chunk)
+        parser.close()
+
+    timed(f"re-parse per chunk ({len(sample)} chunks)", sample_size, reparse_each_chunk)
+    timed(f"incremental ({len(sample)} chunks)", sample_size, incremental_sample)
+
+
+if __name__ == "__main__":
+    main()
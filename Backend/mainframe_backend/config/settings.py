@@ -2,6 +2,7 @@ import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Dict
 
 load_dotenv()
 
@@ -24,9 +25,86 @@ class Settings(BaseSettings):
     ZOSMF_BASE_URL: str = "https://zosmf.example.com"
     ZOSMF_USER: str = ""
     ZOSMF_PASS: str = ""
-    
+    ZOSMF_POOL_SIZE: int = 20  # Max open connections per (host, port, user)
+    ZOSMF_MAX_SESSIONS: int = 64  # Pooled sessions kept; idle ones beyond this are closed
+    ZOSMF_SESSION_IDLE_TTL: float = 900.0  # Seconds an unused session is kept
+    ZOSMF_KEEPALIVE_TIMEOUT: float = 60.0
+    ZOSMF_REQUEST_TIMEOUT: float = 30.0
+    ZOSMF_CSRF_TTL: float = 300.0  # Seconds a cached X-CSRF-ZOSMF-TOKEN is reused
+    ZOSMF_INFO_TTL: float = 3600.0  # Seconds GET /zosmf/info is cached per host
+    ZOSMF_INFO_CACHE_SIZE: int = 256
+    ZOSMF_LIST_CONCURRENCY: int = 4  # Parallel DSLEVEL listings per request
+    ZOSMF_PAGE_SIZE: int = 500  # Items per z/OSMF page when streaming listings
+    DATASET_ATTR_CACHE_SIZE: int = 10000
+    DATASET_ATTR_CACHE_TTL: float = 600.0
+    MEMBER_CACHE_SIZE: int = 1000
+    MEMBER_CACHE_TTL: float = 3600.0  # Entries are revalidated with If-None-Match on every read
+    MEMBER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # JES job polling
+    JOB_POLL_INITIAL_DELAY: float = 0.25
+    JOB_POLL_MAX_DELAY: float = 5.0
+    JOB_WAIT_TIMEOUT: float = 60.0
+    JOB_TRACK_TIMEOUT: float = 3600.0  # Give up following a submitted job after this
+    JOB_TRACK_RETENTION: float = 3600.0  # Keep finished job states this long
+    JOB_TRACK_MAX_JOBS: int = 5000
+    JOB_EVENT_QUEUE_SIZE: int = 100
+    JOB_EVENT_KEEPALIVE: float = 15.0
+
+    # Spool retrieval
+    SPOOL_FETCH_CONCURRENCY: int = 6
+    SPOOL_INLINE_MAX_BYTES: int = 1024 * 1024  # Larger files are streamed instead of inlined
+    SPOOL_RANGE_RECORDS: int = 5000  # Records per X-IBM-Record-Range window when streaming
+    SPOOL_AI_MAX_RECORDS: int = 2000  # Head and tail records of each spool file sent to the analyzer
+    JOB_TAIL_MIN_INTERVAL: float = 1.0
+    JOB_TAIL_MAX_INTERVAL: float = 5.0
+
+    # Zowe CLI execution
+    CLI_MAX_CONCURRENCY: int = 4
+    CLI_TIMEOUT: float = 60.0
+    ZOWE_DAEMON_ENABLED: bool = True
+    ZOWE_DAEMON_COMMAND: str = "zowe --daemon"
+    ZOWE_DAEMON_DIR: str = ""  # Defaults to ~/.zowe/daemon
+    ZOWE_DAEMON_HEALTH_INTERVAL: float = 10.0
+    ZOWE_DAEMON_MAX_FAILED_PROBES: int = 3  # Unanswered probes before a running daemon is restarted
+    ZOWE_DAEMON_MAX_BACKOFF: float = 300.0
+
+    # Terminal
+    TERMINAL_CHUNK_SIZE: int = 4096  # Bytes read from a command's pipe at a time
+    TERMINAL_QUEUE_CHUNKS: int = 16  # Chunks buffered before the command is paused
+    TERMINAL_MAX_OUTPUT_BYTES: int = 10 * 1024 * 1024  # Per command in a session
+    TERMINAL_MAX_COMMANDS_PER_USER: int = 4  # Concurrent commands across a user's sockets
+
     # AI Settings
     GROQ_URL: str = "https://api.groq.com/openai/v1/chat/completions"
+    GROQ_CONTEXT_WINDOW: int = 8192  # Prompt + completion tokens the model accepts
+    GROQ_MAX_OUTPUT_TOKENS: int = 4000
+    GROQ_MIN_OUTPUT_TOKENS: int = 1024  # Kept free for the answer when packing attachments
+    GROQ_HTTP2: bool = True  # Needs the h2 package (httpx[http2])
+    GROQ_MAX_CONNECTIONS: int = 20
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GROQ_KEEPALIVE_EXPIRY: float = 60.0
+    GROQ_CONNECT_TIMEOUT: float = 10.0
+    GROQ_READ_TIMEOUT: float = 120.0  # Long completions take a while
+    GROQ_RPM_LIMIT: int = 30  # Provider requests per minute; 0 disables
+    GROQ_TPM_LIMIT: int = 6000  # Provider tokens per minute; 0 disables
+    GROQ_MAX_CONCURRENCY: int = 8  # In-flight completions; halved on 429/503, regrown on success
+    GROQ_MIN_CONCURRENCY: int = 1
+    GROQ_MAX_RETRIES: int = 4
+    GROQ_RETRY_BASE_DELAY: float = 0.5
+    GROQ_RETRY_MAX_DELAY: float = 30.0
+    AI_BATCH_MAX_PROMPTS: int = 50
+    AI_BATCH_CONCURRENCY: int = 5
+    AI_CACHE_SIZE: int = 1000
+    AI_CACHE_DEFAULT_TTL: float = 86400.0
+    AI_CACHE_TTLS: Dict[str, float] = {"chat": 86400.0, "actions": 3600.0, "analysis": 86400.0}  # Per mode; 0 or absent disables
+    AI_CACHE_DB: str = ""  # SQLite file to persist the cache; empty keeps it in memory only
+    AI_ANALYSIS_REFRESH_INTERVAL: float = 3600.0  # Age at which a z/OS analysis is refreshed in the background; 0 never refreshes
+    AI_ANALYSIS_CACHE_SIZE: int = 256  # Users (and pattern sets) whose analysis is kept
+    AI_ANALYSIS_CACHE_TTL: float = 86400.0
+    ZOS_INVENTORY_MAX_DATASETS: int = 10000  # Per DSLEVEL pattern
+    ZOS_INVENTORY_MAX_JOBS: int = 200
+    ZOS_INVENTORY_TOP: int = 8  # Entries per breakdown in the inventory digest
     AI_API_KEY: str = ""
 
     model_config = SettingsConfigDict(env_file=".env")
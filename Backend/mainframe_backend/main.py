@@ -1,6 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import auth, datasets,terminal, jobs, ai_router, groq_router
+from .services.zosmf_client import zosmf_client
+from .services.job_tracker import job_tracker
+from .services.job_waiter import job_waiter
+from .services.cli_executor import cli_executor
+from .services.zowe_daemon import zowe_daemon
+from .services.groq_service import groq_service
 
 app = FastAPI(title="Mainframe Platform API")
 
@@ -21,6 +27,32 @@ app.include_router(jobs.router)  # Prefix is defined in the router
 app.include_router(ai_router.router)  # Prefix is defined in the router
 app.include_router(groq_router.router)  # Prefix is defined in the router
 
+@app.on_event("startup")
+async def startup():
+    await zosmf_client.start()
+    await zowe_daemon.start()
+    await groq_service.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_tracker.close()
+    await zowe_daemon.close()
+    await groq_service.close()
+    await zosmf_client.close()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Mainframe Platform API"}
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "cli": cli_executor.metrics(),
+        "zowe_daemon": zowe_daemon.metrics(),
+        "ai_cache": groq_service.cache.stats(),
+        "ai_rate_limit": groq_service.limiter.stats(),
+        "ai_scheduler": groq_service.scheduler.metrics(),
+        "zosmf_sessions": zosmf_client.session_stats(),
+        "zosmf_info_cache": zosmf_client.info_stats(),
+        "jobs": {"tracked": job_tracker.in_flight(), "polls": job_waiter.in_flight()}
+    }
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from .credentials import Credentials
+from ..services.context_builder import Attachment
+
+
+class AnalysisResponse(BaseModel):
+    analysis: str
+    recommendations: List[str]
+    inventory: Optional[Dict[str, Any]] = None  # The digest the analysis is based on
+
+class StructureAnalysisRequest(BaseModel):
+    credentials: Credentials
+    patterns: Optional[List[str]] = None  # DSLEVEL patterns, defaults to '<user>.*'
+
+class ContextAttachment(BaseModel):
+    name: str  # e.g. the member or DD name
+    content: str
+    kind: str = "text"  # "sysout", "member", "dataset" or "text"
+
+def to_attachments(attachments: List[ContextAttachment]) -> List[Attachment]:
+    return [Attachment(attachment.name, attachment.content, attachment.kind) for attachment in attachments]
@@ -1,29 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from ..auth.jwt import get_current_user
-from ..services.groq_service import GroqService
-import subprocess
+from ..services.groq_service import groq_service
+from ..services.response_cache import normalize_prompt
+from ..services.response_parser import parse_response
+from ..services.llm_scheduler import PRIORITY_BATCH
+from ..services.zosmf_client import ZosmfError
+from ..config.settings import settings
+from ..services.cli_executor import cli_executor, CLITimeoutError
 import json
+import asyncio
 import os
 import logging
-import re
 from ..models.credentials import Credentials
+from ..models.ai import AnalysisResponse, ContextAttachment, StructureAnalysisRequest, to_attachments
+from ..utils.sse import event_stream_response
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/ai", tags=["AI"])
-groq_service = GroqService()
-
-class AnalysisResponse(BaseModel):
-    analysis: str
-    recommendations: List[str]
 
 class GenerateRequest(BaseModel):
     prompt: str
     mode: str = "chat"  # Default to chat mode
+    cache: bool = True  # False forces a fresh answer
+    attachments: List[ContextAttachment] = []  # Trimmed to fit the model's context window
+
+class BatchGenerateRequest(BaseModel):
+    prompts: List[str]
+    mode: str = "chat"
+    cache: bool = True
 
 class GenerateResponse(BaseModel):
     files: List[dict]
@@ -34,43 +43,107 @@ class CommandRequest(BaseModel):
 
 def extract_command_from_response(response_text: str) -> str:
     """Extract the actual command from the AI response."""
-    try:
-        # Try to find JSON in the response
-        json_match = re.search(r'```json\n([\s\S]*?)\n```', response_text)
-        if json_match:
-            json_str = json_match.group(1)
-            data = json.loads(json_str)
-            if isinstance(data, dict) and "commands" in data and data["commands"]:
-                return data["commands"][0]["command"]
-        
-        # If no JSON found, try to find a command line
-        command_match = re.search(r'zowe\s+[\w-]+\s+[\w-]+.*?(?=\n|$)', response_text)
-        if command_match:
-            return command_match.group(0).strip()
-        
-        raise ValueError("No valid command found in response")
-    except Exception as e:
-        logger.error(f"Error extracting command: {str(e)}")
-        raise ValueError(f"Failed to extract command: {str(e)}")
+    commands = parse_response(response_text).commands
+    if not commands:
+        logger.error("Error extracting command: no valid command found in response")
+        raise ValueError("Failed to extract command: No valid command found in response")
+    return commands[0]["command"]
 
-@router.get("/analyze", response_model=AnalysisResponse)
-async def analyze_system(current_user: dict = Depends(get_current_user)):
-    """Analyze the current z/OS system state and provide recommendations."""
+@router.post("/analyze", response_model=AnalysisResponse)
+async def analyze_system(
+    request: StructureAnalysisRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Analyze the user's datasets and recent jobs and provide recommendations."""
     try:
-        result = await groq_service.analyze_zos_structure()
+        result = await groq_service.analyze_zos_structure(request.credentials, request.patterns, current_user)
         return result
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/analyze", response_model=AnalysisResponse, deprecated=True)
+async def analyze_system_query(
+    credentials: Credentials = Depends(),
+    patterns: Optional[List[str]] = Query(None, description="DSLEVEL patterns, defaults to '<user>.*'"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Deprecated: puts the password in the URL. Use POST /api/ai/analyze with a JSON body."""
+    logger.warning("GET /api/ai/analyze is deprecated, use POST /api/ai/analyze")
+    return await analyze_system(StructureAnalysisRequest(credentials=credentials, patterns=patterns), current_user)
+
 @router.post("/generate")
 async def generate_code(request: GenerateRequest, current_user: dict = Depends(get_current_user)):
     """Generate code or commands based on the user's prompt."""
     try:
-        response = await groq_service.generate_code(request.prompt, request.mode)
+        response = await groq_service.generate_code(
+            request.prompt,
+            request.mode,
+            use_cache=request.cache,
+            attachments=to_attachments(request.attachments)
+        )
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/stream")
+async def generate_code_stream(request: GenerateRequest, current_user: dict = Depends(get_current_user)):
+    """Stream a generation token by token; files are sent as soon as they are complete."""
+    return event_stream_response(groq_service.stream_code(
+        request.prompt,
+        request.mode,
+        use_cache=request.cache,
+        attachments=to_attachments(request.attachments)
+    ))
+
+@router.post("/generate/batch")
+async def generate_batch(request: BatchGenerateRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Generate answers for several prompts at once.
+
+    Up to AI_BATCH_CONCURRENCY prompts run in parallel, all under the
+    service's RPM/TPM limiter; prompts that normalize to the same text share
+    one generation. Results come back in request order, each with either a
+    `result` or an `error`.
+    """
+    if not request.prompts:
+        raise HTTPException(status_code=400, detail="No prompts given")
+    if len(request.prompts) > settings.AI_BATCH_MAX_PROMPTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.AI_BATCH_MAX_PROMPTS} prompts per batch"
+        )
+
+    semaphore = asyncio.Semaphore(settings.AI_BATCH_CONCURRENCY)
+
+    async def generate_one(prompt: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"result": await groq_service.generate_code(
+                    prompt,
+                    request.mode,
+                    use_cache=request.cache,
+                    priority=PRIORITY_BATCH
+                )}
+            except Exception as e:
+                logger.error(f"Batch prompt failed: {str(e)}")
+                return {"error": str(e)}
+
+    generations: Dict[str, asyncio.Task] = {}
+    for prompt in request.prompts:
+        key = normalize_prompt(prompt)
+        if key not in generations:
+            generations[key] = asyncio.ensure_future(generate_one(prompt))
+    await asyncio.gather(*generations.values())
+
+    results = [
+        {"index": index, "prompt": prompt, **generations[normalize_prompt(prompt)].result()}
+        for index, prompt in enumerate(request.prompts)
+    ]
+    failed = sum(1 for item in results if "error" in item)
+    return {"results": results, "succeeded": len(results) - failed, "failed": failed}
+
 @router.post("/execute")
 async def execute_command(request: CommandRequest, current_user: dict = Depends(get_current_user)):
     """Execute a z/OS command using Zowe CLI."""
@@ -108,19 +181,17 @@ async def execute_command(request: CommandRequest, current_user: dict = Depends(
         
         logger.info(f"Full command: {' '.join(full_command)}")
         
-        # Execute the command using subprocess
-        process = subprocess.Popen(
-            full_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        stdout, stderr = process.communicate()
+        # Execute the command on the shared executor (non-blocking, bounded, timed out)
+        try:
+            result = await cli_executor.run(full_command)
+        except CLITimeoutError as e:
+            raise HTTPException(status_code=504, detail=f"Command execution failed: {str(e)}")
+
+        stdout, stderr = result.stdout, result.stderr
         logger.info(f"Command stdout: {stdout[:200]}...")  # Log first 200 chars
         logger.info(f"Command stderr: {stderr}")
         
-        if process.returncode != 0:
+        if result.returncode != 0:
             error_msg = stderr if stderr else "Command execution failed"
             logger.error(f"Command failed: {error_msg}")
             raise HTTPException(
@@ -134,14 +205,14 @@ async def execute_command(request: CommandRequest, current_user: dict = Depends(
             return {
                 "output": output,
                 "error": stderr,
-                "return_code": process.returncode
+                "return_code": result.returncode
             }
         except json.JSONDecodeError:
             # If not JSON, return as plain text
             return {
                 "output": stdout,
                 "error": stderr,
-                "return_code": process.returncode
+                "return_code": result.returncode
             }
     except HTTPException as he:
         raise he
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
-import subprocess
 import json
+import os
 from ..auth.jwt import create_access_token, verify_token
+from ..services.cli_executor import cli_executor, CLITimeoutError
+from ..services.zosmf_client import zosmf_client, ZosmfError
+import asyncio
 from typing import Optional
-import os
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -27,48 +29,48 @@ class LoginRequest(BaseModel):
     host: str
     port: str
 
-def run_zowe_command(command: list) -> dict:
+def powershell_command(command: list) -> list:
+    """Wrap a command for PowerShell, which finds the zowe.cmd shim on Windows; every argument is quoted literally."""
+    quoted = " ".join("'" + str(part).replace("'", "''") + "'" for part in command)
+    return ['powershell', '-Command', f"& {quoted}"]
+
+async def run_zowe_command(command: list) -> dict:
+    if os.name == 'nt':  # Windows
+        command = powershell_command(command)
+    try:
+        # Runs on the shared executor so a slow CLI start never blocks the event loop
+        result = await cli_executor.run(command)
+    except CLITimeoutError as e:
+        raise HTTPException(status_code=504, detail=f"Zowe CLI error: {str(e)}")
+
+    if result.returncode != 0:
+        print("Zowe CLI error:", result.stderr)
+        print("Zowe CLI stdout:", result.stdout)
+        raise HTTPException(status_code=401, detail=f"Zowe CLI error: {result.stderr}")
+
     try:
-        # For Windows, we need to use PowerShell to execute the command
-        if os.name == 'nt':  # Windows
-            # Convert the command list to a single string
-            command_str = ' '.join(command)
-            # Use PowerShell to execute the command
-            result = subprocess.run(
-                ['powershell', '-Command', command_str],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-        else:  # Unix-like systems
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-        
         return json.loads(result.stdout)
-    except subprocess.CalledProcessError as e:
-        print("Zowe CLI error:", e.stderr)
-        print("Zowe CLI stdout:", e.stdout)
-        raise HTTPException(status_code=401, detail=f"Zowe CLI error: {e.stderr}")
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="Invalid response from Zowe CLI")
 
+async def verify_zosmf_login(credentials: LoginRequest) -> dict:
+    """
+    Check the password against z/OSMF and return the host's system info.
+
+    Both calls go over the pooled keep-alive session; the info document is
+    cached per host, so repeat logins to the same LPAR only pay for the
+    credential check.
+    """
+    system_info, _ = await asyncio.gather(
+        zosmf_client.system_info(credentials),
+        zosmf_client.authenticate(credentials)
+    )
+    return system_info
+
 @router.post("/login")
 async def login(data: LoginRequest):
     try:
-        # Test connection by getting system info
-        system_info = run_zowe_command([
-            "zowe", "zosmf", "check", "status",
-            "--host", data.host,
-            "--port", str(data.port),
-            "--user", data.username,
-            "--password", data.password,
-            "--reject-unauthorized", "false",
-            "--rfj"
-        ])
+        system_info = await verify_zosmf_login(data)
         
         # If connection successful, create a token
         access_token = create_access_token(data={
@@ -87,6 +89,8 @@ async def login(data: LoginRequest):
             },
             "system_info": system_info
         }
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
 
@@ -121,7 +125,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 async def test_connection(token: str):
     try:
         # Test connection using the profile
-        system_info = run_zowe_command([
+        system_info = await run_zowe_command([
             "zowe", "zosmf", "check", "status",
             "--rfj",
             "--zosmf-p", token
@@ -137,15 +141,12 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         host = "1"  # You may receive this another way
         port = "443"            # Or accept as form_data.client_id etc.
 
-        system_info = run_zowe_command([
-            "zowe", "zosmf", "check", "status",
-            "--host", host,
-            "--port", str(port),
-            "--user", form_data.username,
-            "--password", form_data.password,
-            "--reject-unauthorized", "false",
-            "--rfj"
-        ])
+        await verify_zosmf_login(LoginRequest(
+            username=form_data.username,
+            password=form_data.password,
+            host=host,
+            port=port
+        ))
 
         token_data = {
             "sub": form_data.username,
@@ -159,5 +160,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             "access_token": access_token,
             "token_type": "bearer",
         }
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=f"Login failed: {e.detail}")
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Login failed: {str(e)}")
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Union
 from ..auth.jwt import get_current_user
+from ..config.settings import settings
+from ..services.zosmf_client import zosmf_client, ZosmfError
+from ..services.cache import TTLCache
+from ..services.job_waiter import job_waiter
+from ..services.spool import job_path, spool_items, iter_spool_records
+from urllib.parse import quote
 import aiohttp
 import json
 import base64
-import ssl
 import asyncio
+import time
 
 router = APIRouter(prefix="/api/datasets", tags=["Datasets"])
 
@@ -19,75 +26,44 @@ class Credentials(BaseModel):
 class FileContent(BaseModel):
     content: str
 
-async def make_zowe_request(credentials: Credentials, endpoint: str, method: str = "GET", data: dict = None, headers: dict = None):
+async def make_zowe_request(credentials: Credentials, endpoint: str, method: str = "GET", data: Union[dict, str] = None, headers: dict = None):
     try:
         print(f"\n=== Making Zowe Request ===")
         print(f"Endpoint: {endpoint}")
         print(f"Method: {method}")
-        
-        base_url = f"https://{credentials.host}:{credentials.port}/zosmf/restfiles"
-        auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
-
-        request_headers = {
-            "Authorization": f"Basic {auth}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "X-CSRF-ZOSMF-HEADER": "*"
-        }
 
-        # Merge custom headers if provided
-        if headers:
-            request_headers.update(headers)
-
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-
-        async with aiohttp.ClientSession(connector=connector) as session:
-            # Pre-flight to get CSRF token
-            print("Getting CSRF token...")
-            async with session.get(
-                f"https://{credentials.host}:{credentials.port}/zosmf/",
-                headers={"Authorization": f"Basic {auth}"},
-                ssl=ssl_context
-            ) as csrf_response:
-                if csrf_response.status != 200:
-                    error_text = await csrf_response.text()
-                    print(f"CSRF token request failed: {error_text}")
-                    raise HTTPException(status_code=401, detail=f"CSRF token request failed: {error_text}")
-
-                csrf_token = csrf_response.headers.get("X-CSRF-ZOSMF-TOKEN")
-                if csrf_token:
-                    request_headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
-                    print("CSRF token obtained successfully")
-                else:
-                    print("No CSRF token in response")
-
-            # Make the main request
-            print(f"Making main request to: {base_url}/{endpoint}")
-            print(f"Request headers: {request_headers}")
-            async with session.request(
-                method,
-                f"{base_url}/{endpoint}",
-                headers=request_headers,
-                json=data,
-                timeout=30
-            ) as response:
-                response_text = await response.text()
-                print(f"Response status: {response.status}")
-                print(f"Response headers: {response.headers}")
-                print(f"Response text: {response_text[:500]}...")  # Print first 500 chars of response
-                
-                if response.status == 200:
-                    try:
-                        return json.loads(response_text)
-                    except json.JSONDecodeError:
-                        # If response is not JSON, return it as a string
-                        return response_text
-                else:
-                    error_detail = f"Zowe API error: {response_text}" if response_text else "Zowe API error"
-                    raise HTTPException(status_code=response.status, detail=error_detail)
+        # Text bodies (member content) go out as-is, anything else as JSON
+        body = {"data": data} if isinstance(data, str) else {"json": data}
+
+        # Make the main request over the pooled z/OSMF session
+        print(f"Making main request to: restfiles/{endpoint}")
+        async with zosmf_client.request(
+            credentials,
+            method,
+            f"restfiles/{endpoint}",
+            headers=headers,
+            **body
+        ) as response:
+            response_text = await response.text()
+            print(f"Response status: {response.status}")
+            print(f"Response headers: {response.headers}")
+            print(f"Response text: {response_text[:500]}...")  # Print first 500 chars of response
+
+            # Reads answer 200; writes 201 or 204
+            if 200 <= response.status < 300:
+                try:
+                    return json.loads(response_text)
+                except json.JSONDecodeError:
+                    # If response is not JSON, return it as a string
+                    return response_text
+            else:
+                error_detail = f"Zowe API error: {response_text}" if response_text else "Zowe API error"
+                raise HTTPException(status_code=response.status, detail=error_detail)
+    except HTTPException:
+        raise
+    except ZosmfError as e:
+        print(f"z/OSMF error: {e.detail}")
+        raise HTTPException(status_code=e.status, detail=e.detail)
     except aiohttp.ClientError as e:
         print(f"Connection error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Connection error: {str(e)}")
@@ -103,6 +79,152 @@ async def make_zowe_request(credentials: Credentials, endpoint: str, method: str
 
 
 
+# (host, port, user, dataset) -> attribute dict from z/OSMF
+dataset_attributes = TTLCache(settings.DATASET_ATTR_CACHE_SIZE, settings.DATASET_ATTR_CACHE_TTL)
+
+# z/OSMF names block size and device type blksz and dev
+ATTRIBUTE_FIELDS = ('dsname', 'dsorg', 'recfm', 'lrecl', 'blksz', 'blksize', 'vol', 'dev', 'device')
+
+
+def attribute_key(credentials: Credentials, dataset_name: str):
+    return (*zosmf_client.key(credentials), dataset_name.upper())
+
+
+def remember_dataset_attributes(credentials: Credentials, item: dict):
+    """Cache the attributes of a dataset list item (only when z/OSMF sent them)."""
+    if item.get('dsname') and item.get('dsorg'):
+        attributes = {field: item.get(field) for field in ATTRIBUTE_FIELDS}
+        dataset_attributes.set(attribute_key(credentials, item['dsname']), attributes)
+
+
+def invalidate_dataset_attributes(credentials: Credentials, dataset_name: str):
+    """Forget the dataset's attributes for every user on this host after a write."""
+    host, port, _, name = attribute_key(credentials, dataset_name)
+    dataset_attributes.invalidate(lambda key: key[0] == host and key[1] == port and key[3] == name)
+
+
+async def get_dataset_attributes(credentials: Credentials, dataset_name: str):
+    """Return dataset attributes (dsorg, recfm, ...), served from cache when fresh."""
+    key = attribute_key(credentials, dataset_name)
+    attributes = dataset_attributes.get(key)
+    if attributes is not None:
+        print(f"Dataset attributes for {dataset_name} served from cache")
+        return attributes
+
+    attributes = await make_zowe_request(
+        credentials,
+        f"ds/{dataset_name}",
+        headers={"Accept": "application/json"}
+    )
+    if isinstance(attributes, dict) and attributes.get('dsorg'):
+        dataset_attributes.set(key, attributes)
+    return attributes
+
+
+# (host, port, user, "DSN(MEMBER)") -> (etag, content)
+member_contents = TTLCache(
+    settings.MEMBER_CACHE_SIZE,
+    settings.MEMBER_CACHE_TTL,
+    max_bytes=settings.MEMBER_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[1].encode())
+)
+
+
+def member_key(credentials: Credentials, dataset_name: str, member_name: str):
+    return (*zosmf_client.key(credentials), f"{dataset_name}({member_name})".upper())
+
+
+def invalidate_member_content(credentials: Credentials, dataset_name: str, member_name: str):
+    """Forget the member's cached text for every user on this host after a write."""
+    host, port, _, name = member_key(credentials, dataset_name, member_name)
+    member_contents.invalidate(lambda key: key[0] == host and key[1] == port and key[3] == name)
+
+
+async def fetch_member_text(credentials: Credentials, dataset_name: str, member_name: str) -> str:
+    """
+    Read a member as text, revalidating a cached copy with If-None-Match so
+    an unchanged member costs a 304 instead of a full download.
+    """
+    key = member_key(credentials, dataset_name, member_name)
+    cached = member_contents.get(key)
+    headers = {"Accept": "text/plain"}
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    try:
+        async with zosmf_client.request(
+            credentials,
+            "GET",
+            f"restfiles/ds/{dataset_name}({member_name})",
+            headers=headers
+        ) as response:
+            if response.status == 304 and cached:
+                print(f"{dataset_name}({member_name}) not modified, served from cache")
+                return cached[1]
+
+            response_text = await response.text()
+            if response.status != 200:
+                error_detail = f"Zowe API error: {response_text}" if response_text else "Zowe API error"
+                raise HTTPException(status_code=response.status, detail=error_detail)
+
+            etag = response.headers.get("ETag")
+            if etag:
+                member_contents.set(key, (etag, response_text))
+            else:
+                member_contents.pop(key)
+            return response_text
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
+
+
+async def find_spool_file(credentials: Credentials, job_name: str, job_id: str, ddname: str) -> Optional[dict]:
+    """Return the first spool file of the job with the given DD name, if any."""
+    async with zosmf_client.request(
+        credentials,
+        "GET",
+        f"restjobs/{job_path(job_id, job_name)}/files"
+    ) as files_response:
+        if files_response.status != 200:
+            raise HTTPException(status_code=files_response.status, detail="Failed to get job files")
+        files_data = await files_response.json()
+
+    return next((file for file in spool_items(files_data) if file.get("ddname") == ddname), None)
+
+
+async def stream_spool_content(credentials: Credentials, job_name: str, job_id: str, ddname: str) -> StreamingResponse:
+    """
+    Return a job's DD as the usual {"content": "..."} body, streamed one
+    X-IBM-Record-Range window at a time instead of joined in memory.
+    """
+    spool_file = await find_spool_file(credentials, job_name, job_id, ddname)
+    if spool_file is None:
+        raise HTTPException(status_code=404, detail="No output content found in job result")
+
+    pages = iter_spool_records(credentials, job_path(job_id, job_name), spool_file.get("id"))
+    try:
+        first = await pages.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail="Failed to get job output records")
+    if not first:
+        raise HTTPException(status_code=404, detail="No output content found in job result")
+
+    async def body():
+        try:
+            yield '{"content": "'
+            # Records are newline-joined: each window's trailing newline is
+            # written ahead of the next window so the body has none at the end
+            yield json.dumps(first[:-1])[1:-1]
+            async for page in pages:
+                yield json.dumps("\n" + page[:-1])[1:-1]
+            yield '"}'
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
 @router.post("/content/{dataset_name}")
 async def get_dataset_content(dataset_name: str, credentials: Credentials, current_user: dict = Depends(get_current_user)):
     """
@@ -114,11 +236,7 @@ async def get_dataset_content(dataset_name: str, credentials: Credentials, curre
         print(f"Checking if dataset {dataset_name} is partitioned...")
 
         # Get dataset info
-        dataset_info = await make_zowe_request(
-            credentials,
-            f"ds/{dataset_name}",
-            headers={"Accept": "application/json"}
-        )
+        dataset_info = await get_dataset_attributes(credentials, dataset_name)
 
         if isinstance(dataset_info, dict):
             dsorg = dataset_info.get('dsorg', '')
@@ -143,89 +261,274 @@ async def get_dataset_content(dataset_name: str, credentials: Credentials, curre
 
 
 
-@router.post("/")
-async def get_datasets(credentials: Credentials, current_user: dict = Depends(get_current_user)):
+def encode_cursor(state: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+def decode_cursor(cursor: str) -> dict:
     try:
-        # Get user datasets
-        user_pattern = f"{credentials.username}.*"
-        user_response = await make_zowe_request(
-            credentials,
-            f"ds?dslevel={user_pattern}"
-        )
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(state, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return state
 
-        # Get public datasets
-        public_pattern = "PUBLIC.*"
-        public_response = await make_zowe_request(
-            credentials,
-            f"ds?dslevel={public_pattern}"
-        )
 
-        datasets = []
-        
-        # Process user datasets
-        if isinstance(user_response, dict) and 'items' in user_response:
-            for item in user_response['items']:
-                datasets.append({
-                    "name": item.get('dsname'),
-                    "type": "dataset",
-                    "volume": item.get('vol'),
-                    "device": item.get('device'),
-                    "dsorg": item.get('dsorg'),
-                    "recfm": item.get('recfm'),
-                    "lrecl": item.get('lrecl'),
-                    "blksize": item.get('blksize'),
-                    "isPublic": False
-                })
-
-        # Process public datasets
-        if isinstance(public_response, dict) and 'items' in public_response:
-            for item in public_response['items']:
-                datasets.append({
-                    "name": item.get('dsname'),
-                    "type": "dataset",
-                    "volume": item.get('vol'),
-                    "device": item.get('device'),
-                    "dsorg": item.get('dsorg'),
-                    "recfm": item.get('recfm'),
-                    "lrecl": item.get('lrecl'),
-                    "blksize": item.get('blksize'),
-                    "isPublic": True
-                })
-
-        return {"datasets": datasets}
+async def fetch_page(credentials: Credentials, endpoint: str, name_key: str, start: Optional[str] = None, limit: Optional[int] = None, headers: Optional[dict] = None):
+    """
+    Fetch one page of a z/OSMF list using X-IBM-Max-Items and `start`.
+
+    One extra item is requested so the next page's first name can be
+    returned as the continuation point; it is None on the last page.
+    """
+    headers = dict(headers or {})
+    if limit:
+        headers["X-IBM-Max-Items"] = str(limit + 1)
+    if start:
+        endpoint += ("&" if "?" in endpoint else "?") + f"start={quote(start)}"
+
+    response = await make_zowe_request(credentials, endpoint, headers=headers)
+    items = response.get('items', []) if isinstance(response, dict) else []
+
+    next_start = None
+    if limit and len(items) > limit:
+        next_start = items[limit].get(name_key)
+        items = items[:limit]
+    return items, next_start
+
+
+class DatasetInfo(BaseModel):
+    name: Optional[str]
+    type: str = "dataset"
+    volume: Optional[str] = None
+    device: Optional[str] = None
+    dsorg: Optional[str] = None
+    recfm: Optional[str] = None
+    lrecl: Optional[Union[int, str]] = None
+    blksize: Optional[Union[int, str]] = None
+    isPublic: bool = False
+
+class PatternResult(BaseModel):
+    pattern: str
+    count: int = 0
+    elapsed_ms: float
+    error: Optional[str] = None
+
+class DatasetListResponse(BaseModel):
+    datasets: List[DatasetInfo]
+    patterns: List[PatternResult]
+    next_cursor: Optional[str] = None
+
+
+def dataset_info_from_item(item: dict, username: str) -> DatasetInfo:
+    """Map a z/OSMF dataset list item onto the explorer's dataset shape."""
+    name = item.get('dsname')
+    return DatasetInfo(
+        name=name,
+        volume=item.get('vol'),
+        device=item.get('device'),
+        dsorg=item.get('dsorg'),
+        recfm=item.get('recfm'),
+        lrecl=item.get('lrecl'),
+        blksize=item.get('blksize'),
+        isPublic=not (name or "").upper().startswith(f"{username.upper()}.")
+    )
+
+
+async def list_pattern(credentials: Credentials, pattern: str, semaphore: asyncio.Semaphore, start: Optional[str] = None, limit: Optional[int] = None):
+    """List one DSLEVEL pattern, returning (items, next_start, PatternResult) without raising."""
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            items, next_start = await fetch_page(credentials, f"ds?dslevel={pattern}", 'dsname', start, limit, {"X-IBM-Attributes": "base"})
+            for item in items:
+                remember_dataset_attributes(credentials, item)
+            error = None
+        except HTTPException as e:
+            print(f"Listing {pattern} failed: {e.detail}")
+            items, next_start, error = [], None, str(e.detail)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    return items, next_start, PatternResult(pattern=pattern, count=len(items), elapsed_ms=elapsed_ms, error=error)
+
+
+def resolve_patterns(credentials: Credentials, patterns: Optional[List[str]]) -> List[str]:
+    if not patterns:
+        patterns = [f"{credentials.username}.*", "PUBLIC.*"]
+    return list(dict.fromkeys(p.strip().upper() for p in patterns if p.strip()))
+
+
+@router.post("/", response_model=DatasetListResponse)
+async def get_datasets(
+    credentials: Credentials,
+    patterns: Optional[List[str]] = Query(None, description="DSLEVEL patterns, defaults to '<user>.*' and 'PUBLIC.*'"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size per pattern; omit for the full listing"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    List datasets for several DSLEVEL patterns concurrently.
+
+    Results are merged in pattern order and de-duplicated by name; a failing
+    pattern is reported in `patterns` instead of failing the whole response.
+    With `limit`, each pattern returns at most that many datasets and
+    `next_cursor` resumes the patterns that still have more.
+    """
+    if cursor:
+        # pattern -> first dataset name of the next page
+        starts = decode_cursor(cursor)
+    else:
+        starts = {p: None for p in resolve_patterns(credentials, patterns)}
+
+    try:
+        semaphore = asyncio.Semaphore(settings.ZOSMF_LIST_CONCURRENCY)
+        results = await asyncio.gather(*(
+            list_pattern(credentials, p, semaphore, start, limit) for p, start in starts.items()
+        ))
+
+        datasets = {}
+        for items, _, _ in results:
+            for item in items:
+                name = item.get('dsname')
+                if name not in datasets:
+                    datasets[name] = dataset_info_from_item(item, credentials.username)
+
+        pattern_results = [result for _, _, result in results]
+        if pattern_results and all(r.error for r in pattern_results):
+            raise HTTPException(status_code=502, detail=f"All dataset listings failed: {pattern_results[0].error}")
+
+        remaining = {r.pattern: next_start for _, next_start, r in results if next_start}
+        return DatasetListResponse(
+            datasets=list(datasets.values()),
+            patterns=pattern_results,
+            next_cursor=encode_cursor(remaining) if remaining else None
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching datasets: {str(e)}")
 
+
+@router.post("/stream")
+async def stream_datasets(
+    credentials: Credentials,
+    patterns: Optional[List[str]] = Query(None, description="DSLEVEL patterns, defaults to '<user>.*' and 'PUBLIC.*'"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    NDJSON variant of get_datasets.
+
+    Each pattern is paged through concurrently and every dataset is written
+    as its own line as soon as its page arrives; the last line is a
+    `{"type": "summary", ...}` record with the per-pattern results. The
+    first pages are fetched before the stream starts, so when every pattern
+    fails the answer is a 502, as from get_datasets.
+    """
+    patterns = resolve_patterns(credentials, patterns)
+    page_size = settings.ZOSMF_PAGE_SIZE
+    semaphore = asyncio.Semaphore(settings.ZOSMF_LIST_CONCURRENCY)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=len(patterns) * 2)
+
+    first_pages = await asyncio.gather(*(
+        list_pattern(credentials, p, semaphore, None, page_size) for p in patterns
+    ))
+    if first_pages and all(result.error for _, _, result in first_pages):
+        raise HTTPException(status_code=502, detail=f"All dataset listings failed: {first_pages[0][2].error}")
+
+    async def produce(pattern: str, first_page):
+        items, start, result = first_page
+        count, elapsed_ms, error = 0, 0.0, None
+        try:
+            while True:
+                count += result.count
+                elapsed_ms += result.elapsed_ms
+                error = result.error
+                await queue.put(items)
+                if error or not start:
+                    break
+                items, start, result = await list_pattern(credentials, pattern, semaphore, start, page_size)
+        except Exception as e:
+            error = str(e)
+        await queue.put(PatternResult(pattern=pattern, count=count, elapsed_ms=round(elapsed_ms, 1), error=error))
+
+    async def lines():
+        producers = [asyncio.create_task(produce(p, page)) for p, page in zip(patterns, first_pages)]
+        seen = set()
+        summaries = []
+        try:
+            while len(summaries) < len(producers):
+                page = await queue.get()
+                if isinstance(page, PatternResult):
+                    summaries.append(page)
+                    continue
+                for item in page:
+                    name = item.get('dsname')
+                    if name in seen:
+                        continue
+                    seen.add(name)
+                    yield dataset_info_from_item(item, credentials.username).model_dump_json() + "\n"
+            summaries.sort(key=lambda r: patterns.index(r.pattern))
+            summary = {"type": "summary", "patterns": [r.model_dump() for r in summaries]}
+            yield json.dumps(summary) + "\n"
+        finally:
+            for task in producers:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def member_info_from_item(item: dict) -> dict:
+    return {
+        "name": item.get('member'),
+        "type": "member",
+        "id": item.get('id'),
+        "version": item.get('version'),
+        "modified": item.get('modified')
+    }
+
+
 @router.post("/{dataset_name}/members")
-async def get_dataset_members(dataset_name: str, credentials: Credentials, current_user: dict = Depends(get_current_user)):
+async def get_dataset_members(
+    dataset_name: str,
+    credentials: Credentials,
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size; omit for the full listing"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    start = decode_cursor(cursor).get("start") if cursor else None
     try:
         print(f"Fetching members for: {dataset_name}")
-        print(f"Credentials: {credentials}")
-        
-        response = await make_zowe_request(
-            credentials,
-            f"ds/{dataset_name}/member"
-        )
 
-        print(f"Raw Zowe response: {response}")
+        items, next_start = await fetch_page(credentials, f"ds/{dataset_name}/member", 'member', start, limit)
 
-        members = []
-        if isinstance(response, dict) and 'items' in response:
-            for item in response['items']:
-                members.append({
-                    "name": item.get('member'),
-                    "type": "member",
-                    "id": item.get('id'),
-                    "version": item.get('version'),
-                    "modified": item.get('modified')
-                })
-
-        return {"members": members}
+        members = [member_info_from_item(item) for item in items]
+        return {
+            "members": members,
+            "next_cursor": encode_cursor({"start": next_start}) if next_start else None
+        }
     except Exception as e:
         print(f"❌ Error fetching dataset members: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching dataset members: {str(e)}")
 
 
+@router.post("/{dataset_name}/members/stream")
+async def stream_dataset_members(dataset_name: str, credentials: Credentials, current_user: dict = Depends(get_current_user)):
+    """
+    NDJSON variant of get_dataset_members, one member per line, fetched a
+    page at a time so memory stays bounded for very large PDSes.
+    """
+    # Fetch the first page eagerly so z/OSMF errors still map to a status code
+    items, start = await fetch_page(credentials, f"ds/{dataset_name}/member", 'member', None, settings.ZOSMF_PAGE_SIZE)
+
+    async def lines(items, start):
+        while True:
+            for item in items:
+                yield json.dumps(member_info_from_item(item)) + "\n"
+            if not start:
+                break
+            items, start = await fetch_page(credentials, f"ds/{dataset_name}/member", 'member', start, settings.ZOSMF_PAGE_SIZE)
+
+    return StreamingResponse(lines(items, start), media_type="application/x-ndjson")
+
+
 @router.post("/{dataset_name}/members/{member_name}")
 async def get_member_content(
     dataset_name: str,
@@ -238,24 +541,16 @@ async def get_member_content(
 
         # First try direct text/plain request for PDS member
         try:
-            response = await make_zowe_request(
-                credentials,
-                f"ds/{dataset_name}({member_name})",
-                headers={"Accept": "text/plain"}
-            )
-            if isinstance(response, str):
-                return {"content": response}
+            response = await fetch_member_text(credentials, dataset_name, member_name)
+            return {"content": response}
         except Exception as e:
             print(f"Direct text/plain request failed: {str(e)}")
 
         # If direct request fails, try getting dataset info
         try:
-            dataset_info = await make_zowe_request(
-                credentials,
-                f"ds/{dataset_name}",
-                headers={"Accept": "application/json"}
-            )
-            
+            dataset_info = await get_dataset_attributes(credentials, dataset_name)
+
+
             if not isinstance(dataset_info, dict):
                 raise HTTPException(status_code=400, detail="Invalid dataset response")
                 
@@ -272,96 +567,29 @@ async def get_member_content(
 //"""
 
                 # Submit the job
-                auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
-                headers = {
-                    "Authorization": f"Basic {auth}",
-                    "Content-Type": "application/json",
-                    "X-CSRF-ZOSMF-HEADER": "*"
-                }
-
-                ssl_context = ssl.create_default_context()
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-
-                async with aiohttp.ClientSession() as session:
-                    # Get CSRF token
-                    async with session.get(
-                        f"https://{credentials.host}:{credentials.port}/zosmf/",
-                        headers={"Authorization": f"Basic {auth}"},
-                        ssl=ssl_context
-                    ) as csrf_response:
-                        if csrf_response.status == 200:
-                            csrf_token = csrf_response.headers.get("X-CSRF-ZOSMF-TOKEN")
-                            if csrf_token:
-                                headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
-
-                    # Submit the job
-                    submit_url = f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs"
-                    async with session.post(
-                        submit_url,
-                        headers=headers,
-                        json={"file": "inline", "jcl": jcl_code},
-                        ssl=ssl_context
-                    ) as submit_response:
-                        if submit_response.status != 201:
-                            raise HTTPException(status_code=submit_response.status, detail="Failed to submit job")
-                        
-                        job_info = await submit_response.json()
-                        job_name = job_info.get('jobname')
-                        job_id = job_info.get('jobid')
-
-                    # Wait for job completion
-                    max_retries = 10
-                    retry_count = 0
-                    while retry_count < max_retries:
-                        async with session.get(
-                            f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}",
-                            headers=headers,
-                            ssl=ssl_context
-                        ) as status_response:
-                            if status_response.status != 200:
-                                raise HTTPException(status_code=status_response.status, detail="Failed to get job status")
-                            
-                            status_data = await status_response.json()
-                            if status_data.get('status') == 'OUTPUT':
-                                break
-                            
-                            await asyncio.sleep(1)
-                            retry_count += 1
-
-                    if retry_count >= max_retries:
-                        raise HTTPException(status_code=504, detail="Job did not complete in time")
-
-                    # Get job output
-                    async with session.get(
-                        f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}/files",
-                        headers=headers,
-                        ssl=ssl_context
-                    ) as files_response:
-                        if files_response.status != 200:
-                            raise HTTPException(status_code=files_response.status, detail="Failed to get job files")
-                        
-                        files_data = await files_response.json()
-
-                    output = ""
-                    for file in files_data.get("items", []):
-                        if file.get("ddname") == "SYSUT2":
-                            file_id = file.get("id")
-                            async with session.get(
-                                f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}/files/{file_id}/records",
-                                headers=headers,
-                                ssl=ssl_context
-                            ) as record_response:
-                                if record_response.status != 200:
-                                    raise HTTPException(status_code=record_response.status, detail="Failed to get job output records")
-                                
-                                record_data = await record_response.json()
-                                output = "\n".join(record_data.get("records", []))
-
-                    if not output:
-                        raise HTTPException(status_code=404, detail="No output content found in job result")
-
-                    return {"content": output}
+                async with zosmf_client.request(
+                    credentials,
+                    "POST",
+                    "restjobs/jobs",
+                    json={"file": "inline", "jcl": jcl_code}
+                ) as submit_response:
+                    if submit_response.status != 201:
+                        raise HTTPException(status_code=submit_response.status, detail="Failed to submit job")
+
+                    job_info = await submit_response.json()
+                    job_name = job_info.get('jobname')
+                    job_id = job_info.get('jobid')
+
+                # Wait for job completion
+                try:
+                    await job_waiter.wait(credentials, job_name, job_id)
+                except asyncio.TimeoutError:
+                    raise HTTPException(status_code=504, detail="Job did not complete in time")
+                except ZosmfError as e:
+                    raise HTTPException(status_code=e.status, detail="Failed to get job status")
+
+                # Stream SYSUT2 back without holding the whole member in memory
+                return await stream_spool_content(credentials, job_name, job_id, "SYSUT2")
 
             # If it's a sequential dataset, try direct text/plain request
             elif 'PS' in dsorg:
@@ -393,8 +621,6 @@ async def view_member_via_jes(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        import time
-
         print(f"Submitting view job for: {dataset_name}({member_name})")
 
         jcl_code = f"""//VIEWJOB  JOB (ACCT),'VIEWMEMBER',CLASS=A,MSGCLASS=A,MSGLEVEL=(1,1)
@@ -405,80 +631,31 @@ async def view_member_via_jes(
 //SYSIN    DD DUMMY
 """
 
-        auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
-        headers = {
-            "Authorization": f"Basic {auth}",
-            "Content-Type": "application/json",
-            "X-CSRF-ZOSMF-HEADER": "*"
-        }
-
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
-        # Get CSRF token
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"https://{credentials.host}:{credentials.port}/zosmf/",
-                headers={"Authorization": f"Basic {auth}"},
-                ssl=ssl_context
-            ) as csrf_response:
-                if csrf_response.status == 200:
-                    csrf_token = csrf_response.headers.get("X-CSRF-ZOSMF-TOKEN")
-                    if csrf_token:
-                        headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
-                else:
-                    raise HTTPException(status_code=401, detail="Failed to retrieve CSRF token")
-
-            # Submit the job
-            async with session.post(
-                f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs",
-                headers=headers,
-                json={"job": jcl_code},
-                ssl=ssl_context
-            ) as submit_response:
-                if submit_response.status != 201:
-                    text = await submit_response.text()
-                    raise HTTPException(status_code=submit_response.status, detail=f"Failed to submit job: {text}")
-
-                job_info = await submit_response.json()
-                job_id = job_info.get("jobid")
-                job_name = job_info.get("jobname")
+        # Submit the job
+        async with zosmf_client.request(
+            credentials,
+            "POST",
+            "restjobs/jobs",
+            json={"job": jcl_code}
+        ) as submit_response:
+            if submit_response.status != 201:
+                text = await submit_response.text()
+                raise HTTPException(status_code=submit_response.status, detail=f"Failed to submit job: {text}")
+
+            job_info = await submit_response.json()
+            job_id = job_info.get("jobid")
+            job_name = job_info.get("jobname")
 
         print(f"Submitted job {job_name} ({job_id})")
 
-        # Wait a moment to ensure the job is completed
-        await asyncio.sleep(2)
-
-        # Fetch job output
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}/files",
-                headers=headers,
-                ssl=ssl_context
-            ) as files_response:
-                if files_response.status != 200:
-                    raise HTTPException(status_code=files_response.status, detail="Failed to get job files")
-                files_data = await files_response.json()
-
-            output = ""
-            for file in files_data.get("items", []):
-                if file.get("ddname") == "SYSUT2":  # Output of the file
-                    file_id = file.get("id")
-                    async with session.get(
-                        f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}/files/{file_id}/records",
-                        headers=headers,
-                        ssl=ssl_context
-                    ) as record_response:
-                        if record_response.status != 200:
-                            raise HTTPException(status_code=record_response.status, detail="Failed to get job output records")
-                        record_data = await record_response.json()
-                        output = "\n".join(record_data.get("records", []))
-
-        if not output:
-            raise HTTPException(status_code=404, detail="No output content found in job result")
-
-        return {"content": output}
+        # Wait for the job to reach OUTPUT before reading its spool
+        try:
+            await job_waiter.wait(credentials, job_name, job_id)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="View job did not complete in time")
+
+        # Stream SYSUT2 back without holding the whole member in memory
+        return await stream_spool_content(credentials, job_name, job_id, "SYSUT2")
 
     except Exception as e:
         print(f"Exception: {str(e)}")
@@ -512,16 +689,14 @@ async def update_member_content(
                 headers={"Content-Type": "text/plain"},
                 data=content
             )
+            invalidate_dataset_attributes(credentials, dataset_name)
+            invalidate_member_content(credentials, dataset_name, member_name)
             return {"message": "Member updated successfully (Direct PUT)"}
         except HTTPException as he:
             print(f"Direct PUT failed: {he.status_code} - {he.detail}")
 
         # Fallback: determine dataset type
-        ds_info = await make_zowe_request(
-            credentials,
-            f"ds/{dataset_name}",
-            method="GET"
-        )
+        ds_info = await get_dataset_attributes(credentials, dataset_name)
 
         dsorg = ds_info.get("dsorg", "").strip().upper()
         is_pds = dsorg == "PO"
@@ -547,80 +722,37 @@ async def update_member_content(
 //SYSIN    DD DUMMY
 //"""
 
-        # Prepare headers
-        auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
-        headers = {
-            "Authorization": f"Basic {auth}",
-            "Content-Type": "application/json",
-            "X-CSRF-ZOSMF-HEADER": "*"
-        }
+        # Submit JCL
+        async with zosmf_client.request(
+            credentials,
+            "POST",
+            "restjobs/jobs",
+            json={"file": "inline", "jcl": jcl_code}
+        ) as submit_response:
+            if submit_response.status != 201:
+                error_text = await submit_response.text()
+                raise HTTPException(status_code=submit_response.status, detail=f"Job submission failed: {error_text}")
+
+            job_info = await submit_response.json()
+            job_name = job_info.get("jobname")
+            job_id = job_info.get("jobid")
+
+        # Wait for job completion
+        try:
+            await job_waiter.wait(credentials, job_name, job_id)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Update job did not complete in time")
 
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
-        async with aiohttp.ClientSession() as session:
-            # CSRF Token
-            async with session.get(
-                f"https://{credentials.host}:{credentials.port}/zosmf/",
-                headers={"Authorization": f"Basic {auth}"},
-                ssl=ssl_context
-            ) as csrf_response:
-                csrf_token = csrf_response.headers.get("X-CSRF-ZOSMF-TOKEN")
-                if csrf_token:
-                    headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
-
-            # Submit JCL
-            async with session.post(
-                f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs",
-                headers=headers,
-                json={"file": "inline", "jcl": jcl_code},
-                ssl=ssl_context
-            ) as submit_response:
-                if submit_response.status != 201:
-                    error_text = await submit_response.text()
-                    raise HTTPException(status_code=submit_response.status, detail=f"Job submission failed: {error_text}")
-
-                job_info = await submit_response.json()
-                job_name = job_info.get("jobname")
-                job_id = job_info.get("jobid")
-
-            # Poll job status
-            for _ in range(10):
-                await asyncio.sleep(1)
-                async with session.get(
-                    f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}",
-                    headers=headers,
-                    ssl=ssl_context
-                ) as status_response:
-                    job_status = await status_response.json()
-                    if job_status.get("status") == "OUTPUT":
-                        break
-            else:
-                raise HTTPException(status_code=504, detail="Update job did not complete in time")
-
-            # Fetch SYSPRINT
-            async with session.get(
-                f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}/files",
-                headers=headers,
-                ssl=ssl_context
-            ) as files_response:
-                files = await files_response.json()
-
-            for file in files.get("items", []):
-                if file.get("ddname") == "SYSPRINT":
-                    file_id = file.get("id")
-                    async with session.get(
-                        f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs/{job_name}/{job_id}/files/{file_id}/records",
-                        headers=headers,
-                        ssl=ssl_context
-                    ) as record_response:
-                        records = await record_response.json()
-                        output = "\n".join(records.get("records", []))
-                        if "ERROR" in output or "FAILED" in output:
-                            raise HTTPException(status_code=500, detail=f"Update failed:\n{output}")
-
-            return {"message": "Member updated successfully via JCL"}
+        # Scan SYSPRINT one record window at a time
+        sysprint = await find_spool_file(credentials, job_name, job_id, "SYSPRINT")
+        if sysprint:
+            async for page in iter_spool_records(credentials, job_path(job_id, job_name), sysprint.get("id")):
+                if "ERROR" in page or "FAILED" in page:
+                    raise HTTPException(status_code=500, detail=f"Update failed:\n{page}")
+
+        invalidate_dataset_attributes(credentials, dataset_name)
+        invalidate_member_content(credentials, dataset_name, member_name)
+        return {"message": "Member updated successfully via JCL"}
 
     except Exception as e:
         print(f"❌ Unhandled error: {str(e)}")
@@ -647,50 +779,22 @@ async def execute_member(
             raise HTTPException(status_code=404, detail="Member content not found")
 
         # Submit the job using the JES REST API
-        jes_url = f"https://{credentials.host}:{credentials.port}/zosmf/restjobs/jobs"
-        auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
-
-        headers = {
-            "Authorization": f"Basic {auth}",
-            "Content-Type": "application/json",
-            "X-CSRF-ZOSMF-HEADER": "*"
-        }
-
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
-        async with aiohttp.ClientSession() as session:
-            # Get CSRF token
-            async with session.get(
-                f"https://{credentials.host}:{credentials.port}/zosmf/",
-                headers={"Authorization": f"Basic {auth}"},
-                ssl=ssl_context
-            ) as csrf_response:
-                if csrf_response.status != 200:
-                    raise HTTPException(status_code=401, detail="CSRF token request failed")
-
-                csrf_token = csrf_response.headers.get("X-CSRF-ZOSMF-TOKEN")
-                if csrf_token:
-                    headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
-
-            # Submit the job
-            async with session.post(
-                jes_url,
-                headers=headers,
-                json={"file": f"//'{dataset_name}({member_name})'"},
-                ssl=ssl_context
-            ) as response:
-                if response.status != 201:
-                    response_text = await response.text()
-                    raise HTTPException(status_code=response.status, detail=f"Failed to submit job: {response_text}")
-
-                job_info = await response.json()
-                return {
-                    "message": "Job submitted successfully",
-                    "jobId": job_info.get("jobid"),
-                    "jobName": job_info.get("jobname")
-                }
+        async with zosmf_client.request(
+            credentials,
+            "POST",
+            "restjobs/jobs",
+            json={"file": f"//'{dataset_name}({member_name})'"}
+        ) as response:
+            if response.status != 201:
+                response_text = await response.text()
+                raise HTTPException(status_code=response.status, detail=f"Failed to submit job: {response_text}")
+
+            job_info = await response.json()
+            return {
+                "message": "Job submitted successfully",
+                "jobId": job_info.get("jobid"),
+                "jobName": job_info.get("jobname")
+            }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error executing member: {str(e)}")
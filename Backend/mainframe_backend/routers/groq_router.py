@@ -1,11 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from ..services.groq_service import GroqService
+from typing import List, Dict, Any, Optional
+from ..services.groq_service import groq_service
+from ..services.spool import job_output_attachments
+from ..services.zosmf_client import ZosmfError
+from ..models.credentials import Credentials
 from ..auth import get_current_user
+from ..models.ai import ContextAttachment, StructureAnalysisRequest, to_attachments
+from ..utils.sse import event_stream_response
 
 router = APIRouter(prefix="/groq", tags=["Groq AI"])
-groq_service = GroqService()
 
 class PromptRequest(BaseModel):
     prompt: str
@@ -14,13 +18,22 @@ class AnalysisResponse(BaseModel):
     analysis: str
     recommendations: List[str]
 
+class AnalyzeRequest(BaseModel):
+    attachments: List[ContextAttachment] = []
+    # Attach a job's output, read from z/OSMF
+    credentials: Optional[Credentials] = None
+    job_id: Optional[str] = None
+    job_name: Optional[str] = None
+    ddnames: Optional[List[str]] = None  # All spool files when omitted
+
 @router.post("/generate")
 async def generate_code(
     prompt: str,
+    cache: bool = True,
     current_user: str = Depends(get_current_user)
 ) -> Dict[str, Any]:
     try:
-        response = await groq_service.generate_code(prompt)
+        response = await groq_service.generate_code(prompt, use_cache=cache)
         # Return the content directly in the format expected by the frontend
         return {
             "content": response.get("response", ""),
@@ -30,21 +43,57 @@ async def generate_code(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/analyze")
-async def analyze_structure(current_user: dict = Depends(get_current_user)):
+@router.post("/generate/stream")
+async def generate_code_stream(
+    prompt: str,
+    cache: bool = True,
+    current_user: str = Depends(get_current_user)
+):
+    return event_stream_response(groq_service.stream_code(prompt, use_cache=cache))
+
+@router.post("/analyze/structure")
+async def analyze_structure(
+    request: StructureAnalysisRequest,
+    current_user: dict = Depends(get_current_user)
+):
     try:
-        result = await groq_service.analyze_zos_structure()
+        result = await groq_service.analyze_zos_structure(request.credentials, request.patterns, current_user)
         return result
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/analyze", deprecated=True)
+async def analyze_structure_query(
+    credentials: Credentials = Depends(),
+    patterns: Optional[List[str]] = Query(None, description="DSLEVEL patterns, defaults to '<user>.*'"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Deprecated: puts the password in the URL. Use POST /groq/analyze/structure with a JSON body."""
+    print("GET /groq/analyze is deprecated, use POST /groq/analyze/structure")
+    return await analyze_structure(StructureAnalysisRequest(credentials=credentials, patterns=patterns), current_user)
+
 @router.post("/analyze")
 async def analyze_system(
     system_info: str,
+    request: Optional[AnalyzeRequest] = None,
     current_user: str = Depends(get_current_user)
 ) -> Dict[str, Any]:
+    request = request or AnalyzeRequest()
+    attachments = to_attachments(request.attachments)
+    if request.job_id:
+        if request.credentials is None:
+            raise HTTPException(status_code=400, detail="credentials are required to attach job output")
+        try:
+            attachments += await job_output_attachments(
+                request.credentials, request.job_id, request.job_name, request.ddnames
+            )
+        except ZosmfError as e:
+            raise HTTPException(status_code=e.status, detail=e.detail)
     try:
-        response = await groq_service.analyze_system(system_info)
+        response = await groq_service.analyze_system(system_info, attachments)
         return {"response": response}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+ 
\ No newline at end of file
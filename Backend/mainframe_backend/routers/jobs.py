@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from ..auth.jwt import get_current_user
+from ..auth.jwt import get_current_user, verify_token
+from ..config.settings import settings
+from ..services.zosmf_client import zosmf_client, ZosmfError
+from ..services.job_tracker import job_tracker
+from ..services.spool import job_path, spool_items, spool_text, iter_spool_records
 import aiohttp
-import base64
-import ssl
 import asyncio
 import json
+import re
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
 
+class Credentials(BaseModel):
+    host: str
+    port: str
+    username: str
+    password: str
+
 class JobSubmitRequest(BaseModel):
     code: str
     job_name: Optional[str] = "JOB1"
+    credentials: Credentials
 
 class JobResponse(BaseModel):
     job_id: str
@@ -22,71 +33,39 @@ class JobResponse(BaseModel):
     return_code: Optional[str]
     output: Optional[str]
 
-class Credentials(BaseModel):
-    host: str
-    port: str
-    username: str
-    password: str
-
 
 async def make_zowe_request(credentials: Credentials, endpoint: str, method: str = "GET", data: dict = None):
     """Make a request to the Zowe REST API with detailed error logging."""
-    base_url = f"https://{credentials.host}:{credentials.port}/zosmf/restjobs"
-    auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
-
-    headers = {
-        "Authorization": f"Basic {auth}",
-        "Content-Type": "application/json",
-        "X-CSRF-ZOSMF-HEADER": "*",
-        "Accept": "application/json"
-    }
-
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
+    try:
+        # Main API request over the pooled z/OSMF session
+        print(f"Making request to: restjobs/{endpoint}")  # Debug log
 
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+        async with zosmf_client.request(credentials, method, f"restjobs/{endpoint}", json=data) as response:
+            response_text = await response.text()
+            print(f"Response status: {response.status}")  # Debug log
+            print(f"Response text: {response_text[:200]}...")  # Debug log first 200 chars
 
-    try:
-        async with aiohttp.ClientSession(connector=connector) as session:
-            # CSRF token step
-            csrf_url = f"https://{credentials.host}:{credentials.port}/zosmf/"
-            async with session.get(csrf_url, headers={"Authorization": f"Basic {auth}"}, ssl=ssl_context) as response:
-                csrf_text = await response.text()
-                if response.status == 200:
-                    csrf_token = response.headers.get("X-CSRF-ZOSMF-TOKEN")
-                    if csrf_token:
-                        headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
-                else:
-                    print(f"[CSRF ERROR] Status: {response.status} | Body: {csrf_text}")
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail=f"Failed to authenticate with z/OS: {csrf_text}"
-                    )
-
-            # Main API request
-            url = f"{base_url}/{endpoint}"
-            print(f"Making request to: {url}")  # Debug log
-            print(f"With headers: {headers}")   # Debug log
-            
-            async with session.request(method, url, headers=headers, json=data, timeout=30) as response:
-                response_text = await response.text()
-                print(f"Response status: {response.status}")  # Debug log
-                print(f"Response text: {response_text[:200]}...")  # Debug log first 200 chars
-                
-                if response.status == 200:
-                    try:
-                        return json.loads(response_text)
-                    except Exception as json_err:
-                        print(f"[JSON ERROR] Could not parse response from {endpoint}: {response_text}")
-                        raise HTTPException(status_code=500, detail="Invalid JSON returned from Zowe API.")
-                else:
-                    print(f"[ZOWE API ERROR] Endpoint: {endpoint} | Status: {response.status} | Response: {response_text}")
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail=f"Zowe API error ({response.status}): {response_text}"
-                    )
+            if response.status == 200:
+                try:
+                    return json.loads(response_text)
+                except Exception as json_err:
+                    print(f"[JSON ERROR] Could not parse response from {endpoint}: {response_text}")
+                    raise HTTPException(status_code=500, detail="Invalid JSON returned from Zowe API.")
+            else:
+                print(f"[ZOWE API ERROR] Endpoint: {endpoint} | Status: {response.status} | Response: {response_text}")
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"Zowe API error ({response.status}): {response_text}"
+                )
 
+    except HTTPException:
+        raise
+    except ZosmfError as e:
+        print(f"[CSRF ERROR] Status: {e.status} | Body: {e.detail}")
+        raise HTTPException(
+            status_code=e.status,
+            detail=f"Failed to authenticate with z/OS: {e.detail}"
+        )
     except aiohttp.ClientError as e:
         print(f"[CLIENT ERROR] {str(e)}")
         raise HTTPException(status_code=500, detail=f"Connection error: {str(e)}")
@@ -121,6 +100,87 @@ async def get_jobs(
         raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
 
+@router.post("/submit")
+async def submit_job(
+    request: JobSubmitRequest,
+    current_user: str = Depends(get_current_user)
+):
+    """Submit inline JCL and track it in the background; returns immediately."""
+    credentials = request.credentials
+    jcl = request.code.rstrip()
+    if not re.match(r"//\S+\s+JOB\b", jcl.lstrip()):
+        # No job card: supply one using the requested job name
+        job_name = (request.job_name or "JOB1").upper()[:8]
+        job_card = f"//{job_name} JOB (ACCT),'{job_name}',CLASS=A,MSGCLASS=A,MSGLEVEL=(1,1)"
+        jcl = f"{job_card}\n{jcl}"
+
+    try:
+        async with zosmf_client.request(
+            credentials,
+            "PUT",
+            "restjobs/jobs",
+            headers={
+                "Content-Type": "text/plain",
+                "X-IBM-Intrdr-Class": "A",
+                "X-IBM-Intrdr-Recfm": "F",
+                "X-IBM-Intrdr-Lrecl": "80",
+                "X-IBM-Intrdr-Mode": "TEXT"
+            },
+            data=jcl
+        ) as response:
+            if response.status != 201:
+                response_text = await response.text()
+                print(f"[SUBMIT ERROR] Status: {response.status} | Response: {response_text}")
+                raise HTTPException(status_code=response.status, detail=f"Failed to submit job: {response_text}")
+            job_info = await response.json()
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
+    except aiohttp.ClientError as e:
+        raise HTTPException(status_code=500, detail=f"Connection error: {str(e)}")
+
+    return job_tracker.track(current_user, credentials, job_info.get("jobname"), job_info.get("jobid"))
+
+
+def event_stream_user(token: str = Query(..., description="Access token; EventSource cannot send an Authorization header")) -> str:
+    """The user an event stream belongs to, from its `token` query parameter."""
+    user = verify_token(token).get("sub")
+    if not user:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return user
+
+
+@router.get("/events")
+async def job_events(current_user: str = Depends(event_stream_user)):
+    """
+    Server-sent events for the caller's submitted jobs.
+
+    Sends the current state of every tracked job on connect, then one
+    `job` event per state change (SUBMITTED, INPUT, ACTIVE, OUTPUT, ...).
+    Browsers connect with `new EventSource("/api/jobs/events?token=...")`.
+    """
+    queue = job_tracker.subscribe(current_user)
+
+    async def events():
+        try:
+            for state in job_tracker.jobs_for(current_user):
+                yield f"event: job\ndata: {json.dumps(state)}\n\n"
+            while True:
+                try:
+                    state = await asyncio.wait_for(queue.get(), settings.JOB_EVENT_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: job\ndata: {json.dumps(state)}\n\n"
+        finally:
+            job_tracker.unsubscribe(current_user, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{job_id}")
 async def get_job_status(
     job_id: str,
@@ -136,32 +196,221 @@ async def get_job_status(
         raise HTTPException(status_code=500, detail=f"Error fetching job status: {str(e)}")
 
 
+async def fetch_spool_file(credentials: Credentials, job_id: str, job_name: Optional[str], item: dict, semaphore: asyncio.Semaphore) -> dict:
+    """Read one spool file's records; errors are reported in the result, not raised."""
+    file_info = {
+        "id": item.get('id'),
+        "ddname": item.get('ddname'),
+        "stepname": item.get('stepname'),
+        "procstep": item.get('procstep'),
+        "records": item.get('record-count'),
+        "bytes": item.get('byte-count')
+    }
+    byte_count = item.get('byte-count') or 0
+    if byte_count > settings.SPOOL_INLINE_MAX_BYTES:
+        # Too large to inline; the client streams it from the records route
+        file_info["content"] = None
+        file_info["truncated"] = True
+        file_info["stream_url"] = f"/api/jobs/{job_id}/files/{item.get('id')}/records" + (f"?job_name={job_name}" if job_name else "")
+        return file_info
+
+    async with semaphore:
+        try:
+            async with zosmf_client.request(
+                credentials,
+                "GET",
+                f"restjobs/{job_path(job_id, job_name)}/files/{item.get('id')}/records",
+                headers={"Accept": "text/plain"}
+            ) as response:
+                response_text = await response.text()
+                if response.status != 200:
+                    raise HTTPException(status_code=response.status, detail=f"Zowe API error ({response.status}): {response_text}")
+        except Exception as e:
+            print(f"[ERROR FETCHING FILE OUTPUT] File ID: {item.get('id')} | {str(e)}")
+            file_info["content"] = None
+            file_info["error"] = str(e)
+            return file_info
+
+    content = spool_text(response_text)
+    file_info["content"] = content
+    file_info["bytes"] = len(content.encode())
+    return file_info
+
+
 @router.post("/{job_id}/output")
 async def get_job_output(
     job_id: str,
     credentials: Credentials = Body(...),
+    job_name: Optional[str] = Query(None, description="Job name; required by z/OSMF for most job ids"),
+    ddnames: Optional[List[str]] = Query(None, description="DD names to fetch, '*' for all; defaults to JESMSGLG"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get output of a specific job."""
+    """
+    Get output of a specific job.
+
+    The requested spool files are fetched concurrently (bounded by
+    SPOOL_FETCH_CONCURRENCY) and returned keyed by DD name, or by
+    STEP.DD when a DD name occurs in several steps. Files larger than
+    SPOOL_INLINE_MAX_BYTES are not inlined; their `stream_url` serves them as
+    chunked text. `output` keeps the JESMSGLG text for existing callers.
+    """
     try:
-        response = await make_zowe_request(credentials, f"jobs/{job_id}/files")
+        response = await make_zowe_request(credentials, f"{job_path(job_id, job_name)}/files")
 
-        output = ""
-        if isinstance(response, dict) and 'items' in response:
-            for item in response['items']:
-                if item.get('ddname') == 'JESMSGLG':
-                    try:
-                        file_response = await make_zowe_request(
-                            credentials,
-                            f"jobs/{job_id}/files/{item.get('id')}/records"
-                        )
-                        if isinstance(file_response, dict) and 'records' in file_response:
-                            output += "\n".join(file_response['records'])
-                    except Exception as nested_e:
-                        print(f"[ERROR FETCHING FILE OUTPUT] File ID: {item.get('id')} | {str(nested_e)}")
-                        raise HTTPException(status_code=500, detail=f"Error fetching file output: {str(nested_e)}")
-
-        return {"output": output}
+        wanted = {dd.upper() for dd in (ddnames or ["JESMSGLG"])}
+        items = [
+            item for item in spool_items(response)
+            if "*" in wanted or (item.get('ddname') or '').upper() in wanted
+        ]
+
+        semaphore = asyncio.Semaphore(settings.SPOOL_FETCH_CONCURRENCY)
+        results = await asyncio.gather(*(
+            fetch_spool_file(credentials, job_id, job_name, item, semaphore) for item in items
+        ))
+
+        ddname_counts = {}
+        for result in results:
+            ddname_counts[result["ddname"]] = ddname_counts.get(result["ddname"], 0) + 1
+
+        files = {}
+        for result in results:
+            key = result["ddname"]
+            if ddname_counts[key] > 1:
+                key = f"{result['stepname']}.{key}"
+            files[key] = result
+
+        output = "\n".join(
+            result["content"] for result in results
+            if result["ddname"] == "JESMSGLG" and result.get("content")
+        )
+        return {
+            "output": output,
+            "files": files,
+            "total_bytes": sum(result["bytes"] or 0 for result in results)
+        }
     except Exception as e:
         print(f"[ERROR FETCHING JOB OUTPUT] Job ID: {job_id} | {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching job output: {str(e)}")
+
+
+@router.post("/{job_id}/files/{file_id}/records")
+async def stream_spool_file(
+    job_id: str,
+    file_id: str,
+    credentials: Credentials = Body(...),
+    job_name: Optional[str] = Query(None, description="Job name; required by z/OSMF for most job ids"),
+    start: int = Query(0, ge=0, description="Zero-based first record"),
+    count: Optional[int] = Query(None, ge=1, description="Number of records; omit to read to the end"),
+    tail: Optional[int] = Query(None, ge=1, description="Return only the last N records"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream a spool file (or a window of it) as chunked text.
+
+    Records are read with X-IBM-Record-Range a window at a time, so memory
+    stays flat regardless of SYSOUT size. `tail=N` starts N records before
+    the end, letting the viewer show the end of a long log first.
+    """
+    path = job_path(job_id, job_name)
+    if tail:
+        files = await make_zowe_request(credentials, f"{path}/files")
+        item = next((f for f in spool_items(files) if str(f.get('id')) == str(file_id)), None)
+        if item is None:
+            raise HTTPException(status_code=404, detail=f"Spool file {file_id} not found")
+        total = item.get('record-count') or 0
+        start, count = max(0, total - tail), tail
+
+    pages = iter_spool_records(credentials, path, file_id, start, count)
+    try:
+        # Read the first window eagerly so z/OSMF errors still map to a status code
+        first = await pages.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except ZosmfError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
+    except aiohttp.ClientError as e:
+        raise HTTPException(status_code=500, detail=f"Connection error: {str(e)}")
+
+    async def chunks():
+        try:
+            if first:
+                yield first
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@router.websocket("/{job_id}/tail")
+async def tail_job_output(websocket: WebSocket, job_id: str):
+    """
+    Follow a job's spool files over a WebSocket.
+
+    The client first sends {"token", "credentials", "job_name", "ddnames"?}.
+    Only records appended since the last read are fetched and sent as
+    {"type": "records", "ddname", "id", "start", "text"}; once the job
+    reaches OUTPUT the remaining records are drained, a
+    {"type": "complete", "return_code"} message is sent and the socket closes.
+    """
+    await websocket.accept()
+    try:
+        request = await websocket.receive_json()
+        try:
+            verify_token(request.get("token", ""))
+        except HTTPException:
+            await websocket.send_json({"type": "error", "detail": "Could not validate credentials"})
+            await websocket.close(code=1008)
+            return
+
+        credentials = Credentials(**request["credentials"])
+        path = job_path(job_id, request.get("job_name"))
+        wanted = {dd.upper() for dd in (request.get("ddnames") or ["*"])}
+        offsets = {}  # spool file id -> records already sent
+        interval = settings.JOB_TAIL_MIN_INTERVAL
+
+        while True:
+            # Read status before the file list so a job seen in OUTPUT is drained completely
+            status = await make_zowe_request(credentials, path)
+            files = await make_zowe_request(credentials, f"{path}/files")
+
+            sent = False
+            for item in spool_items(files):
+                if "*" not in wanted and (item.get('ddname') or '').upper() not in wanted:
+                    continue
+                file_id = item.get('id')
+                offset = offsets.get(file_id, 0)
+                record_count = item.get('record-count')
+                if record_count is not None and record_count <= offset:
+                    continue
+                async for page in iter_spool_records(credentials, path, file_id, start=offset):
+                    await websocket.send_json({
+                        "type": "records",
+                        "ddname": item.get('ddname'),
+                        "id": file_id,
+                        "start": offset,
+                        "text": page
+                    })
+                    offset += page.count("\n")
+                    sent = True
+                offsets[file_id] = offset
+
+            if status.get('status') == 'OUTPUT':
+                await websocket.send_json({"type": "complete", "return_code": status.get('retcode')})
+                await websocket.close()
+                return
+
+            # Poll quickly while output is flowing, back off while the job is quiet
+            interval = settings.JOB_TAIL_MIN_INTERVAL if sent else min(interval * 2, settings.JOB_TAIL_MAX_INTERVAL)
+            await asyncio.sleep(interval)
+
+    except WebSocketDisconnect:
+        print(f"🔌 Tail of job {job_id} disconnected")
+    except Exception as e:
+        print(f"[ERROR TAILING JOB] Job ID: {job_id} | {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
@@ -1,37 +1,247 @@
 # terminal_router.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from typing import Awaitable, Callable, Dict, Optional, Tuple
 import asyncio
+import codecs
+import itertools
+import json
+import os
+import signal
+from ..auth.jwt import verify_token
+from ..config.settings import settings
+from ..services.zowe_daemon import zowe_daemon
 
 router = APIRouter(prefix="/api/terminal", tags=["Terminal"])
 
+# Client -> server: a plain-text command, or JSON
+#   {"type": "run", "command": ..., "id": optional}
+#   {"type": "cancel", "id": optional; omitted cancels every command}
+# Server -> client: JSON messages, tagged with the command id
+#   {"type": "started", "id": ..., "command": ...}
+#   {"type": "output", "id": ..., "stream": "stdout"|"stderr", "data": ...}
+#   {"type": "exit", "id": ..., "code": ..., "cancelled": bool, "truncated": bool}
+#   {"type": "error", "id": ..., "message": ...}
+#
+# Several commands may run at once on one socket; each user may have at most
+# TERMINAL_MAX_COMMANDS_PER_USER running across all of their sockets.
+
+Send = Callable[[dict], Awaitable[None]]
+
+# user -> number of commands currently running
+running_per_user: Dict[str, int] = {}
+
+
+def parse_message(message: str) -> dict:
+    try:
+        data = json.loads(message)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and "type" in data:
+        return data
+    return {"type": "run", "command": message}
+
+
+def kill_process(process: asyncio.subprocess.Process):
+    """
+    Kill the shell and everything it started (the zowe client, node, ...).
+    """
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == 'nt':
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def pump_stream(stream: asyncio.StreamReader, name: str, output: asyncio.Queue):
+    """
+    Forward a pipe chunk by chunk. The queue is bounded, so when the client
+    reads slowly this stops reading and the command blocks on its pipe.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = await stream.read(settings.TERMINAL_CHUNK_SIZE)
+        if not chunk:
+            break
+        text = decoder.decode(chunk)
+        if text:
+            await output.put((name, text))
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        await output.put((name, tail))
+
+
+async def run_command(send: Send, command: str, cancelled: asyncio.Event):
+    """
+    Run one command and stream its output to the client as it is produced.
+    `send` delivers a message tagged with this command's id.
+
+    Output past TERMINAL_MAX_OUTPUT_BYTES is dropped and the command killed;
+    setting `cancelled` kills it as well.
+    """
+    # Execute the Zowe CLI command (through the warm daemon when it is up)
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=zowe_daemon.env(),
+        start_new_session=os.name != 'nt',
+    )
+
+    output = asyncio.Queue(maxsize=settings.TERMINAL_QUEUE_CHUNKS)
+    pumps = asyncio.gather(
+        pump_stream(process.stdout, "stdout", output),
+        pump_stream(process.stderr, "stderr", output)
+    )
+    cancel_wait = asyncio.create_task(cancelled.wait())
+    sent = 0
+    truncated = False
+
+    async def forward(name: str, text: str):
+        nonlocal sent, truncated
+        if truncated:
+            return
+        size = len(text.encode())
+        if sent + size > settings.TERMINAL_MAX_OUTPUT_BYTES:
+            truncated = True
+            kill_process(process)
+            await send({
+                "type": "error",
+                "message": f"Output limit of {settings.TERMINAL_MAX_OUTPUT_BYTES} bytes reached, command stopped"
+            })
+            return
+        sent += size
+        # Awaiting the send is the backpressure: nothing more is read
+        # while a slow client catches up
+        await send({"type": "output", "stream": name, "data": text})
+
+    try:
+        while True:
+            next_chunk = asyncio.create_task(output.get())
+            waiting = {next_chunk, pumps}
+            if cancel_wait:
+                waiting.add(cancel_wait)
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if next_chunk in done:
+                await forward(*next_chunk.result())
+                continue
+            next_chunk.cancel()
+            if cancel_wait in done:
+                kill_process(process)
+                cancel_wait = None
+                continue
+            # Both pipes are at EOF; flush what is still queued
+            while not output.empty():
+                await forward(*output.get_nowait())
+            break
+
+        await process.wait()
+        await send({
+            "type": "exit",
+            "code": process.returncode,
+            "cancelled": cancelled.is_set(),
+            "truncated": truncated
+        })
+    except Exception as e:
+        # Typically the socket went away mid-stream
+        print(f"Terminal command failed: {str(e)}")
+    finally:
+        if cancel_wait:
+            cancel_wait.cancel()
+        kill_process(process)
+        pumps.cancel()
+
+
+def terminal_user(websocket: WebSocket) -> Optional[str]:
+    """
+    The user a terminal socket belongs to: the `token` query parameter's
+    subject, or the client address for unauthenticated sockets. None when
+    the token is invalid.
+    """
+    token = websocket.query_params.get("token")
+    if not token:
+        return f"anonymous@{websocket.client.host if websocket.client else 'unknown'}"
+    try:
+        return verify_token(token).get("sub")
+    except HTTPException:
+        return None
+
+
 @router.websocket("/ws")
 async def terminal_websocket(websocket: WebSocket):
+    user = terminal_user(websocket)
+    if user is None:
+        await websocket.close(code=1008)
+        return
     await websocket.accept()
+
+    send_lock = asyncio.Lock()
+    # id -> (task, cancel event)
+    commands: Dict[str, Tuple[asyncio.Task, asyncio.Event]] = {}
+    ids = itertools.count(1)
+
+    def sender(command_id: str) -> Send:
+        async def send(message: dict):
+            # One frame at a time: concurrent commands share the socket
+            async with send_lock:
+                await websocket.send_text(json.dumps({**message, "id": command_id}))
+        return send
+
+    async def supervise(command_id: str, command: str, cancelled: asyncio.Event):
+        try:
+            await run_command(sender(command_id), command, cancelled)
+        finally:
+            commands.pop(command_id, None)
+            running_per_user[user] -= 1
+            if not running_per_user[user]:
+                del running_per_user[user]
+
     try:
         while True:
-            # Receive the command from the frontend
-            command = await websocket.receive_text()
+            # Keep reading while commands run so they can be cancelled
+            message = parse_message(await websocket.receive_text())
 
-            # Prefix the command with 'zowe ' to ensure it's sent to z/OS
-            full_command = f"{command}"
+            if message["type"] == "cancel":
+                targets = [message["id"]] if message.get("id") else list(commands)
+                for command_id in targets:
+                    if command_id in commands:
+                        commands[command_id][1].set()
+                continue
 
-            # Execute the Zowe CLI command
-            process = await asyncio.create_subprocess_shell(
-                full_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, stderr = await process.communicate()
+            command = str(message.get("command", "")).strip()
+            if not command:
+                continue
+            command_id = str(message.get("id") or next(ids))
+            send = sender(command_id)
+            if command_id in commands:
+                await send({"type": "error", "message": f"Command {command_id} is already running"})
+                continue
+            if running_per_user.get(user, 0) >= settings.TERMINAL_MAX_COMMANDS_PER_USER:
+                await send({
+                    "type": "error",
+                    "message": f"Limit of {settings.TERMINAL_MAX_COMMANDS_PER_USER} concurrent commands reached"
+                })
+                continue
 
-            # Send stdout and stderr back to the client
-            if stdout:
-                await websocket.send_text(stdout.decode())
-            if stderr:
-                await websocket.send_text(stderr.decode())
+            running_per_user[user] = running_per_user.get(user, 0) + 1
+            cancelled = asyncio.Event()
+            await send({"type": "started", "command": command})
+            commands[command_id] = (
+                asyncio.create_task(supervise(command_id, command, cancelled)),
+                cancelled
+            )
 
     except WebSocketDisconnect:
         print("🔌 WebSocket disconnected")
 
     except Exception as e:
-        await websocket.send_text(f"❌ Error: {str(e)}")
+        await websocket.send_text(json.dumps({"type": "error", "message": f"❌ Error: {str(e)}"}))
+
+    finally:
+        tasks = [task for task, _ in commands.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,93 @@
+from typing import Any, Callable, Hashable, List, Optional
+from collections import OrderedDict
+import time
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries also expire after `ttl` seconds.
+
+    When `max_bytes` is set, `sizeof(value)` is charged per entry and the
+    least recently used entries are evicted to stay within the budget.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store a value; returns False if it alone exceeds the byte budget.
+        """
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.pop(key)
+            return False
+        self.pop(key)
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl), size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._entries:
+            return default
+        return self._remove(key)
+
+    def _remove(self, key: Hashable) -> Any:
+        value, _, size = self._entries.pop(key)
+        self.bytes -= size
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches the predicate; returns how many.
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def values(self) -> List[Any]:
+        """
+        Unexpired values, least recently used first (does not touch LRU order).
+        """
+        now = time.monotonic()
+        return [value for value, expires_at, _ in self._entries.values() if expires_at > now]
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
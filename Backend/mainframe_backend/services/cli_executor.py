@@ -0,0 +1,87 @@
+from typing import List, NamedTuple, Optional
+import asyncio
+import logging
+from ..config.settings import settings
+from .zowe_daemon import zowe_daemon
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CommandResult(NamedTuple):
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class CLITimeoutError(Exception):
+    """
+    The command exceeded its timeout and was killed.
+    """
+
+
+class CLIExecutor:
+    """
+    Runs CLI commands (mostly the Node-based Zowe CLI) as asyncio
+    subprocesses so they never block the event loop.
+
+    At most `max_concurrency` commands run at once; the rest wait in line
+    and are counted in `metrics()`. A command that outlives its timeout is
+    killed. Processes get the Zowe daemon environment, so `zowe` commands
+    reach the warm daemon whenever it is healthy. Commands are argument
+    lists, started directly without a shell.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_concurrency = max_concurrency or settings.CLI_MAX_CONCURRENCY
+        self.timeout = timeout or settings.CLI_TIMEOUT
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.timed_out = 0
+
+    async def run(self, command: List[str], timeout: Optional[float] = None) -> CommandResult:
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=zowe_daemon.env()
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout or self.timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                process.kill()
+                await process.wait()
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                self.timed_out += 1
+                logger.error(f"Backend: Command {command[0]} killed after {timeout or self.timeout}s")
+                raise CLITimeoutError(f"Command timed out after {timeout or self.timeout}s")
+
+            self.completed += 1
+            return CommandResult(process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace"))
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def metrics(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "timed_out": self.timed_out
+        }
+
+
+cli_executor = CLIExecutor()
@@ -0,0 +1,262 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern
+import re
+import logging
+from ..config.settings import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    try:
+        # Llama 3's vocabulary extends cl100k, so its counts are close
+        _ENCODING = tiktoken.get_encoding("cl100k_base")
+    except Exception:  # the encoding file is downloaded on first use
+        _ENCODING = None
+except ImportError:
+    _ENCODING = None
+
+# Chat formatting around every message, and the reply header
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+# Below this, an attachment is more noise than context and is left out
+MIN_ATTACHMENT_TOKENS = 128
+
+# Words cost about a token per 4 characters; punctuation, line breaks and
+# runs of spaces (column-aligned JCL and COBOL) about one each
+_PIECE = re.compile(r"\n|\w+|[^\w\s]| {2,}")
+
+# Job log lines worth keeping when the middle of a SYSOUT has to go
+SYSOUT_ALERTS = re.compile(
+    r"ABEND|JCL ERROR|NOT CATLGD|(?:COND|CONDITION|RETURN) CODE (?:WAS )?0*[1-9]|MAXCC\s*=\s*0*[1-9]|\bRC\s*=\s*0*[1-9]|"
+    r"\b(?:IEF|IEC|IGD|IEW|IGY|CEE|IKJ|IDC|IEA|ICH)[A-Z]{0,2}\d{3,5}-?[EWS]\b"
+)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of `text`: exact with tiktoken installed, otherwise a
+    slightly generous estimate.
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return sum((len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1 for piece in _PIECE.findall(text))
+
+
+def count_tokens_upto(text: str, limit: int) -> int:
+    """
+    count_tokens(text), but stops counting soon after passing `limit`, so
+    sizing a multi-megabyte attachment against a small budget stays cheap.
+    """
+    total = start = 0
+    while start < len(text) and total <= limit:
+        end = text.find("\n", start + 65536)
+        end = len(text) if end == -1 else end
+        total += count_tokens(text[start:end])
+        start = end
+    return total
+
+
+def message_tokens(messages: Iterable[Dict]) -> int:
+    """
+    Prompt size of a chat request.
+    """
+    return sum(MESSAGE_OVERHEAD + count_tokens(message["content"]) for message in messages) + REPLY_OVERHEAD
+
+
+def _omitted(lines: int) -> str:
+    return f"... [{lines} line{'s' if lines != 1 else ''} omitted] ..."
+
+
+def trim_text(text: str, max_tokens: int, important: Optional[Pattern] = None) -> str:
+    """
+    Cut `text` down to about `max_tokens`, keeping its head and tail.
+
+    Whole lines are kept and each gap is marked with the number of lines
+    left out. Lines matching `important` (errors in a job log, say) are kept
+    from the middle first, with up to a third of the budget. Text without
+    usable line breaks is cut by characters.
+    """
+    if len(text) <= max_tokens or count_tokens_upto(text, max_tokens) <= max_tokens:
+        return text
+
+    marker = count_tokens(_omitted(10000)) + 1
+    lines = text.split("\n")
+    keep = [False] * len(lines)
+    budget = max_tokens - marker
+    spent = kept = 0
+    # Only lines that may be kept are counted
+    costs: Dict[int, int] = {}
+
+    def cost(index: int) -> int:
+        if index not in costs:
+            costs[index] = count_tokens(lines[index]) + 1
+        return costs[index]
+
+    if important is not None:
+        for index, line in enumerate(lines):
+            if important.search(line) and spent + cost(index) + marker <= budget // 3:
+                keep[index] = True
+                spent += cost(index) + marker
+                kept += 1
+
+    head_budget = spent + (budget - spent) // 2
+    head = 0
+    while head < len(lines) and (keep[head] or spent + cost(head) <= head_budget):
+        if not keep[head]:
+            keep[head] = True
+            spent += cost(head)
+            kept += 1
+        head += 1
+    tail = len(lines) - 1
+    while tail > head and (keep[tail] or spent + cost(tail) <= budget):
+        if not keep[tail]:
+            keep[tail] = True
+            spent += cost(tail)
+            kept += 1
+        tail -= 1
+
+    if not kept:
+        # One huge line: keep slices of characters, sized by the text's density
+        sample = text[:65536]
+        chars = max(0, budget * len(sample) // max(1, count_tokens(sample)))
+        return text[:chars // 2] + "\n... [trimmed] ...\n" + text[len(text) - chars // 2:]
+
+    trimmed = []
+    gap = 0
+    for index, line in enumerate(lines):
+        if keep[index]:
+            if gap:
+                trimmed.append(_omitted(gap))
+                gap = 0
+            trimmed.append(line)
+        else:
+            gap += 1
+    if gap:
+        trimmed.append(_omitted(gap))
+    return "\n".join(trimmed)
+
+
+class Attachment(NamedTuple):
+    name: str
+    content: str
+    kind: str = "text"  # "sysout", "member", "dataset" or "text"
+
+
+class PackedContext(NamedTuple):
+    messages: List[Dict]
+    max_tokens: int
+    prompt_tokens: int
+    trimmed: List[str]
+    dropped: List[str]
+
+
+class ContextBuilder:
+    """
+    Packs a system prompt, a user prompt and optional attachments (member
+    or dataset content, job output) into the model's context window.
+
+    Tokens are counted locally. The prompts are sent whole; attachments
+    share what is left after reserving `min_output` tokens for the answer.
+    Attachments whose name the prompt mentions are packed first, then job
+    output, then the rest in the order given. Small ones go in whole, large
+    ones are trimmed to an equal share (SYSOUT keeps its head, tail and
+    error lines; other text its head and tail), and when the shares get too
+    small the least relevant are left out. `max_tokens` is then sized to
+    the room that remains, capped at `max_output`.
+    """
+
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        max_output: Optional[int] = None,
+        min_output: Optional[int] = None
+    ):
+        self.window = window or settings.GROQ_CONTEXT_WINDOW
+        self.max_output = max_output or settings.GROQ_MAX_OUTPUT_TOKENS
+        self.min_output = min_output or settings.GROQ_MIN_OUTPUT_TOKENS
+
+    def build(
+        self,
+        system_prompt: str,
+        prompt: str,
+        attachments: Iterable[Attachment] = (),
+        max_output: Optional[int] = None
+    ) -> PackedContext:
+        max_output = min(max_output or self.max_output, self.max_output)
+        min_output = min(self.min_output, max_output)
+        attachments = self._rank(prompt, list(attachments))
+
+        fixed = message_tokens([{"content": system_prompt}, {"content": prompt}])
+        if fixed + min_output > self.window:
+            raise ValueError(
+                f"Prompt too long: about {fixed} tokens, the model's window is {self.window} "
+                f"with {min_output} kept for the answer"
+            )
+        available = self.window - fixed - min_output
+
+        # Fence and spacing around each attachment
+        framed = [(attachment, count_tokens(self._frame(attachment, "")) + 2) for attachment in attachments]
+        sizes = {id(attachment): count_tokens_upto(attachment.content, self.window) for attachment in attachments}
+        dropped: List[Attachment] = []
+        while framed:
+            room = available - sum(frame for _, frame in framed)
+            if sum(sizes[id(attachment)] for attachment, _ in framed) <= room or room // len(framed) >= MIN_ATTACHMENT_TOKENS:
+                break
+            attachment, _ = framed.pop()
+            dropped.insert(0, attachment)
+            available -= count_tokens(self._dropped(attachment)) + 2
+
+        # Water-filling: smallest first, so what a small attachment leaves goes to the large ones
+        remaining = available - sum(frame for _, frame in framed)
+        budgets = {}
+        for position, (attachment, _) in enumerate(sorted(framed, key=lambda item: sizes[id(item[0])])):
+            budgets[id(attachment)] = min(sizes[id(attachment)], remaining // (len(framed) - position))
+            remaining -= budgets[id(attachment)]
+
+        parts, trimmed = [], []
+        for attachment, _ in framed:
+            content = attachment.content
+            if budgets[id(attachment)] < sizes[id(attachment)]:
+                important = SYSOUT_ALERTS if attachment.kind == "sysout" else None
+                content = trim_text(content, budgets[id(attachment)], important)
+                trimmed.append(attachment.name)
+            parts.append(self._frame(attachment, content))
+        parts.extend(self._dropped(attachment) for attachment in dropped)
+        parts.append(prompt)
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "\n\n".join(parts)}
+        ]
+        prompt_tokens = message_tokens(messages)
+        dropped_names = [attachment.name for attachment in dropped]
+        max_tokens = max(min_output, min(max_output, self.window - prompt_tokens))
+        if trimmed or dropped_names:
+            logger.info(
+                f"Backend: Packed ~{prompt_tokens} prompt tokens (trimmed: {trimmed or 'none'}, "
+                f"left out: {dropped_names or 'none'}), max_tokens {max_tokens}"
+            )
+        return PackedContext(messages, max_tokens, prompt_tokens, trimmed, dropped_names)
+
+    @staticmethod
+    def _rank(prompt: str, attachments: List[Attachment]) -> List[Attachment]:
+        mentioned = prompt.upper()
+
+        def rank(attachment: Attachment) -> int:
+            if attachment.name and attachment.name.upper() in mentioned:
+                return 0
+            return 1 if attachment.kind == "sysout" else 2
+
+        return sorted(attachments, key=rank)
+
+    @staticmethod
+    def _frame(attachment: Attachment, content: str) -> str:
+        return f"--- {attachment.kind} {attachment.name} ---\n{content}\n--- end of {attachment.name} ---"
+
+    @staticmethod
+    def _dropped(attachment: Attachment) -> str:
+        return f"--- {attachment.kind} {attachment.name} left out: too large for the context window ---"
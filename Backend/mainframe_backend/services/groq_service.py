@@ -1,18 +1,44 @@
-from typing import List, Dict
+from typing import AsyncIterator, Iterable, List, Dict, Optional, Tuple
 import httpx
+import asyncio
+import time
 import logging
 import json
 from ..config.settings import settings
+from .response_parser import ResponseParser, parse_response
+from .response_cache import ResponseCache
+from .rate_limiter import TokenBucketLimiter
+from .context_builder import Attachment, ContextBuilder, message_tokens
+from .cache import TTLCache
+from .zosmf_client import zosmf_client
+from .zos_inventory import collect_inventory, build_digest, format_digest
+from .llm_scheduler import LLMScheduler, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 class GroqService:
     def __init__(self):
         self.api_key = settings.GROQ_API_KEY
-        self.base_url = "https://api.groq.com/openai/v1"
+        self.url = settings.GROQ_URL
         self.model = "llama3-70b-8192"
+        self.http2 = False
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = ResponseCache()
+        # Shared by every completion, so batches and interactive calls together stay within the provider's limits
+        self.limiter = TokenBucketLimiter(settings.GROQ_RPM_LIMIT, settings.GROQ_TPM_LIMIT)
+        self.scheduler = LLMScheduler(self.limiter)
+        self.context = ContextBuilder()
+        # (app user, host, port, user, patterns) -> (analysis, computed_at) of the z/OS structure analysis
+        self._analyses = TTLCache(settings.AI_ANALYSIS_CACHE_SIZE, settings.AI_ANALYSIS_CACHE_TTL)
+        self._analysis_refreshes: Dict[Tuple, asyncio.Task] = {}
         logger.info(f"Backend: Initializing GroqService with model: {self.model}")
         self.system_prompt = """You are an expert z/OS and mainframe development assistant with deep knowledge of:
 1. z/OS system operations and administration
@@ -65,89 +91,285 @@ Example command format:
     ]
 }"""
 
-    async def generate_code(self, prompt: str, mode: str = "chat") -> Dict:
+        self.analysis_system_prompt = self.system_prompt + "\nFocus on analyzing z/OS structure and providing specific recommendations for:\n1. Dataset organization and naming conventions\n2. Job scheduling and resource utilization\n3. Security and access control\n4. Performance optimization\n5. Best practices for mainframe development"
+
+    async def start(self):
         """
-        Generate code or commands based on the user's prompt using Groq.
+        Open the shared HTTP client and the response cache (application startup).
         """
-        logger.info(f"Backend: Received request to generate {mode} for prompt: {prompt}")
-        try:
-            async with httpx.AsyncClient() as client:
-                logger.info("Backend: Making request to Groq API")
-                request_data = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": self.actions_system_prompt if mode == "actions" else self.system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 4000
-                }
-                logger.info(f"Backend: Request data: {json.dumps(request_data, indent=2)}")
-                
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json=request_data
-                )
-                
+        self.client
+        await self.cache.open()
+        logger.info(f"Backend: GroqService client ready for {self.url} (HTTP/2: {self.http2})")
+
+    async def close(self):
+        """
+        Close the shared HTTP client and its connections (application shutdown).
+        """
+        tasks = list(self._analysis_refreshes.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.cache.close()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        One long-lived client for every LLM call, so DNS, TCP and TLS set-up
+        happen once per connection instead of once per request.
+        """
+        if self._client is None or self._client.is_closed:
+            self.http2 = settings.GROQ_HTTP2 and HTTP2_AVAILABLE
+            if settings.GROQ_HTTP2 and not HTTP2_AVAILABLE:
+                logger.warning("Backend: h2 is not installed, GroqService falls back to HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=settings.GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.GROQ_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(settings.GROQ_READ_TIMEOUT, connect=settings.GROQ_CONNECT_TIMEOUT)
+            )
+        return self._client
+
+    def _chat_request(
+        self,
+        system_prompt: str,
+        prompt: str,
+        attachments: Iterable[Attachment] = (),
+        max_output: Optional[int] = None
+    ) -> Dict:
+        """
+        Chat completion body packed into the model's context window, with
+        max_tokens sized to the room left for the answer.
+        """
+        packed = self.context.build(system_prompt, prompt, attachments, max_output)
+        return {
+            "model": self.model,
+            "messages": packed.messages,
+            "temperature": 0.7,
+            "max_tokens": packed.max_tokens
+        }
+
+    def _generation_request(self, prompt: str, mode: str, attachments: Iterable[Attachment] = ()) -> Dict:
+        system_prompt = self.actions_system_prompt if mode == "actions" else self.system_prompt
+        return self._chat_request(system_prompt, prompt, attachments)
+
+    def _cache_key(self, request_data: Dict, mode: str, prompt: str) -> str:
+        # The packed user message is the attachments (as trimmed) followed by the prompt
+        system_prompt, user_message = (message["content"] for message in request_data["messages"])
+        attachments = user_message[:-len(prompt)] if prompt and user_message.endswith(prompt) else user_message
+        return self.cache.key(self.model, mode, system_prompt, prompt, attachments)
+
+    def _cache_ttl(self, mode: str) -> float:
+        return settings.AI_CACHE_TTLS.get(mode, 0)
+
+    @staticmethod
+    def _estimate_tokens(request_data: Dict) -> int:
+        """
+        Prompt size plus the completion budget, which is what the provider
+        reserves against TPM.
+        """
+        return message_tokens(request_data["messages"]) + request_data.get("max_tokens", 0)
+
+    async def _complete(self, request_data: Dict, priority: int = PRIORITY_INTERACTIVE) -> Dict:
+        """
+        POST a (non-streaming) chat completion through the scheduler, which
+        queues, rate-limits and retries it.
+        """
+        async with self.scheduler.request(
+            lambda: self.client.post(self.url, headers=self._headers(), json=request_data),
+            priority,
+            self._estimate_tokens(request_data)
+        ) as (response, reserved):
+            # A failed request is settled as using no tokens
+            used = 0
+            try:
                 logger.info(f"Backend: Groq API response status: {response.status_code}")
                 if response.status_code != 200:
                     logger.error(f"Backend: Groq API error: {response.text}")
                     raise Exception(f"Groq API error: {response.text}")
 
                 result = response.json()
-                content = result['choices'][0]['message']['content']
-                logger.info(f"Backend: Received content from Groq API: {content[:200]}...")
+                used = (result.get("usage") or {}).get("total_tokens", reserved)
+                return result
+            finally:
+                self.limiter.settle(reserved, used)
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _commands_result(self, content: str, parser: Optional[ResponseParser] = None) -> Dict:
+        """
+        Parse commands from an actions-mode response.
+        """
+        try:
+            commands = json.loads(content)
+            if isinstance(commands, dict) and "commands" in commands:
+                return commands
+        except json.JSONDecodeError:
+            pass
+        # Fenced JSON or zowe lines inside a prose answer
+        parser = parser or parse_response(content)
+        if parser.commands:
+            return {"commands": parser.commands}
+        # If the response is not in the expected format, return it as a single command
+        return {
+            "commands": [{
+                "command": content,
+                "description": "Generated command"
+            }]
+        }
+
+    def _chat_result(self, content: str, parsed: Dict) -> Dict:
+        if '```' in content:
+            return parsed
+        # Plain text answer
+        return {
+            "response": content,
+            "explanation": content
+        }
+
+    async def generate_code(
+        self,
+        prompt: str,
+        mode: str = "chat",
+        use_cache: bool = True,
+        priority: int = PRIORITY_INTERACTIVE,
+        attachments: Iterable[Attachment] = ()
+    ) -> Dict:
+        """
+        Generate code or commands based on the user's prompt using Groq.
+
+        Answers are cached per mode (AI_CACHE_TTLS); `use_cache=False`
+        skips the lookup and refreshes the cached answer. `priority` orders
+        the call in the LLM scheduler's queue. `attachments` (member
+        content, job output) are packed into the prompt as far as the
+        context window allows.
+        """
+        logger.info(f"Backend: Received request to generate {mode} for prompt: {prompt}")
+        request_data = self._generation_request(prompt, mode, attachments)
+        cache_key = self._cache_key(request_data, mode, prompt)
+        ttl = self._cache_ttl(mode)
+        if ttl and use_cache:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Backend: Serving {mode} answer from cache")
+                return cached
+
+        result = await self._generate_code(request_data, mode, priority)
+        if ttl:
+            await self.cache.set(cache_key, result, ttl)
+        return result
+
+    async def _generate_code(self, request_data: Dict, mode: str, priority: int) -> Dict:
+        try:
+            logger.info("Backend: Making request to Groq API")
+            logger.info(f"Backend: Request: ~{self._estimate_tokens(request_data)} tokens incl. max_tokens")
+
+            result = await self._complete(request_data, priority)
+            content = result['choices'][0]['message']['content']
+            logger.info(f"Backend: Received content from Groq API: {content[:200]}...")
                 
-                if mode == "actions":
-                    # Parse commands from the response
-                    try:
-                        commands = json.loads(content)
-                        if isinstance(commands, dict) and "commands" in commands:
-                            return commands
-                        else:
-                            # If the response is not in the expected format, wrap it
-                            return {
-                                "commands": [{
-                                    "command": content,
-                                    "description": "Generated command"
-                                }]
-                            }
-                    except json.JSONDecodeError:
-                        # If parsing fails, return the content as a single command
-                        return {
-                            "commands": [{
-                                "command": content,
-                                "description": "Generated command"
-                            }]
-                        }
-                else:
-                    # Handle regular chat response
-                    if '```' in content:
-                        logger.info("Backend: Response contains code blocks, parsing response")
-                        parsed_response = self._parse_response(result)
-                        logger.info(f"Backend: Parsed response: {json.dumps(parsed_response, indent=2)}")
-                        return parsed_response
-                    else:
-                        logger.info("Backend: Response is plain text, returning as simple response")
-                        return {
-                            "response": content,
-                            "explanation": content
-                        }
+            if mode == "actions":
+                return self._commands_result(content)
+            if '```' in content:
+                logger.info("Backend: Response contains code blocks, parsing response")
+                return self._parse_response(result)
+            logger.info("Backend: Response is plain text, returning as simple response")
+            return self._chat_result(content, {})
 
         except Exception as e:
             logger.error(f"Backend: Error generating code: {str(e)}", exc_info=True)
             raise Exception(f"Error generating code: {str(e)}")
 
+    async def stream_code(
+        self,
+        prompt: str,
+        mode: str = "chat",
+        use_cache: bool = True,
+        attachments: Iterable[Attachment] = ()
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream a generation as events, using the API's `stream: true` mode.
+
+        Yields {"type": "token", "content": ...} for every delta,
+        {"type": "file", "file": ...} as soon as a code block's closing fence
+        arrives, and finally {"type": "done", ...} carrying the same result
+        generate_code would return. Cached answers are replayed at once.
+        """
+        logger.info(f"Backend: Received request to stream {mode} for prompt: {prompt}")
+        request_data = {**self._generation_request(prompt, mode, attachments), "stream": True}
+        cache_key = self._cache_key(request_data, mode, prompt)
+        ttl = self._cache_ttl(mode)
+        if ttl and use_cache:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Backend: Serving streamed {mode} answer from cache")
+                if cached.get("response"):
+                    yield {"type": "token", "content": cached["response"]}
+                for file in cached.get("files", []):
+                    yield {"type": "file", "file": file}
+                yield {"type": "done", **cached}
+                return
+
+        parser = ResponseParser()
+        send = lambda: self.client.send(
+            self.client.build_request("POST", self.url, headers=self._headers(), json=request_data),
+            stream=True
+        )
+        async with self.scheduler.request(
+            send,
+            PRIORITY_INTERACTIVE,
+            self._estimate_tokens(request_data)
+        ) as (response, reserved):
+            # Streams carry no usage block; settle on an estimate of what was
+            # generated, also when the stream fails or the client goes away
+            generated = 0
+            try:
+                if response.status_code != 200:
+                    error_text = (await response.aread()).decode(errors="replace")
+                    logger.error(f"Backend: Groq API error: {error_text}")
+                    raise Exception(f"Groq API error: {error_text}")
+
+                async for line in response.aiter_lines():
+                    # Server-sent events: "data: {chunk}" lines, ending with "data: [DONE]"
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if not delta:
+                        continue
+                    generated += len(delta)
+                    yield {"type": "token", "content": delta}
+                    # file / command / explanation events as soon as they complete
+                    for event in parser.feed(delta):
+                        yield event
+            finally:
+                prompt_tokens = self._estimate_tokens(request_data) - request_data["max_tokens"]
+                self.limiter.settle(reserved, prompt_tokens + generated // 4 if response.status_code == 200 else 0)
+
+        for event in parser.close():
+            yield event
+        parsed = parser.result()
+        content = parsed["response"]
+        if mode == "actions":
+            result = self._commands_result(content, parser)
+        else:
+            result = self._chat_result(content, parsed)
+        if ttl:
+            await self.cache.set(cache_key, result, ttl)
+        yield {"type": "done", **result}
+
     def _parse_response(self, response: Dict) -> Dict:
         """
         Parse the Groq API response into a structured format.
@@ -156,129 +378,124 @@ Example command format:
         try:
             content = response['choices'][0]['message']['content']
             logger.info(f"Backend: Content to parse: {content[:200]}...")  # Log first 200 chars
-            
+
             # Split the content into files based on markdown code blocks
-            files = []
-            current_file = None
-            current_content = []
-            explanation = []
-            in_code_block = False
-            
-            for line in content.split('\n'):
-                if line.startswith('```'):
-                    if in_code_block and current_file:
-                        logger.info(f"Backend: Found end of code block for file: {current_file}")
-                        files.append({
-                            "name": current_file,
-                            "type": "file",
-                            "path": f"src/{current_file}",
-                            "content": '\n'.join(current_content),
-                            "language": self._get_language(current_file)
-                        })
-                        current_file = None
-                        current_content = []
-                    else:
-                        # Extract filename from the code block header
-                        current_file = line.replace('```', '').strip()
-                        logger.info(f"Backend: Found start of code block for file: {current_file}")
-                    in_code_block = not in_code_block
-                elif in_code_block and current_file:
-                    current_content.append(line)
-                else:
-                    explanation.append(line)
-            
-            parsed_result = {
-                "files": files,
-                "response": content,
-                "explanation": '\n'.join(explanation).strip()
-            }
-            logger.info(f"Backend: Parsed result: {json.dumps(parsed_result, indent=2)}")
+            parsed_result = parse_response(content).result()
+            logger.info(f"Backend: Parsed {len(parsed_result['files'])} file(s)")
             return parsed_result
             
         except Exception as e:
             logger.error(f"Backend: Error parsing response: {str(e)}", exc_info=True)
             raise Exception(f"Error parsing response: {str(e)}")
 
-    def _get_language(self, filename: str) -> str:
-        """
-        Determine the programming language based on file extension.
+    async def analyze_zos_structure(
+        self,
+        credentials,
+        patterns: Optional[List[str]] = None,
+        current_user: Optional[str] = None
+    ) -> Dict:
         """
-        ext = filename.split('.')[-1].lower()
-        language_map = {
-            'cbl': 'cobol',
-            'jcl': 'jcl',
-            'cpy': 'cobol',
-            'txt': 'text',
-            'md': 'markdown'
-        }
-        language = language_map.get(ext, 'text')
-        logger.info(f"Backend: Determined language {language} for file {filename}")
-        return language
+        Analyze the user's z/OS datasets and jobs and provide recommendations.
 
-    def _extract_explanation(self, content: str) -> str:
+        The analysis is grounded in a live inventory (see zos_inventory):
+        only its compact digest is sent to the model, returned alongside as
+        `inventory`. Per user and pattern set, an analysis older than
+        AI_ANALYSIS_REFRESH_INTERVAL is still returned immediately while a
+        background refresh replaces it (stale-while-revalidate); only the
+        first call waits. Analyses are kept per app user too, and the z/OSMF
+        password is checked before a cached or in-flight one is shared.
         """
-        Extract the explanation section from the response.
-        """
-        try:
-            # Look for explanation before the first code block
-            parts = content.split('```')
-            if len(parts) > 0:
-                return parts[0].strip()
-            return ""
-        except:
-            return ""
-
-    async def analyze_zos_structure(self) -> Dict:
+        key = (current_user, *zosmf_client.key(credentials), tuple(patterns or ()))
+        # The key leaves out the password, so only verified credentials may reuse its entry
+        await zosmf_client.authenticate(credentials)
+        cached = self._analyses.get(key)
+        if cached is not None:
+            analysis, computed_at = cached
+            interval = settings.AI_ANALYSIS_REFRESH_INTERVAL
+            if interval and time.monotonic() - computed_at > interval:
+                self._refresh_analysis(key, credentials, patterns, PRIORITY_BACKGROUND)
+            return analysis
+        # Someone is waiting on this one, so it queues as interactive
+        return await asyncio.shield(self._refresh_analysis(key, credentials, patterns, PRIORITY_INTERACTIVE))
+
+    def _refresh_analysis(self, key: Tuple, credentials, patterns: Optional[List[str]], priority: int) -> asyncio.Task:
         """
-        Analyze the z/OS structure and provide recommendations.
+        Start (or join) the single in-flight analysis refresh for this key.
         """
-        logger.info("Backend: Analyzing z/OS structure")
+        task = self._analysis_refreshes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_analysis(key, credentials, patterns, priority))
+            self._analysis_refreshes[key] = task
+            task.add_done_callback(lambda task: self._analysis_refreshed(key, task))
+        return task
+
+    async def _compute_analysis(self, key: Tuple, credentials, patterns: Optional[List[str]], priority: int) -> Dict:
+        digest = build_digest(await collect_inventory(credentials, patterns))
+        analysis = await self._analyze_zos_structure(digest, priority)
+        self._analyses.set(key, (analysis, time.monotonic()))
+        return analysis
+
+    def _analysis_refreshed(self, key: Tuple, task: asyncio.Task):
+        self._analysis_refreshes.pop(key, None)
+        if not task.cancelled() and task.exception() is not None and self._analyses.get(key) is not None:
+            # A failed background refresh keeps serving the previous answer
+            logger.error(f"Backend: Background z/OS analysis refresh failed: {task.exception()}")
+
+    async def _analyze_zos_structure(self, digest: Dict, priority: int = PRIORITY_BACKGROUND) -> Dict:
+        logger.info(f"Backend: Analyzing z/OS structure of {digest['datasets']} datasets and {digest['jobs']} jobs")
         try:
-            async with httpx.AsyncClient() as client:
-                logger.info("Backend: Making request to Groq API for z/OS analysis")
-                request_data = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": self.system_prompt + "\nFocus on analyzing z/OS structure and providing specific recommendations for:\n1. Dataset organization and naming conventions\n2. Job scheduling and resource utilization\n3. Security and access control\n4. Performance optimization\n5. Best practices for mainframe development"
-                        },
-                        {
-                            "role": "user",
-                            "content": "Analyze the current z/OS structure and provide detailed recommendations for organization and best practices."
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 2000
-                }
-                logger.info(f"Backend: Request data: {json.dumps(request_data, indent=2)}")
-                
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json=request_data
-                )
-                
-                logger.info(f"Backend: Groq API response status: {response.status_code}")
-                if response.status_code != 200:
-                    logger.error(f"Backend: Groq API error: {response.text}")
-                    raise Exception(f"Groq API error: {response.text}")
+            prompt = (
+                "Here is a statistical digest of the user's z/OS datasets and recent jobs:\n\n"
+                f"{format_digest(digest)}\n\n"
+                "Analyze this structure and provide specific recommendations for its organization, "
+                "space usage and failing jobs. Base every finding on the figures above."
+            )
+            # An unchanged inventory gets the same answer without another LLM call
+            cache_key = self.cache.key(self.model, "analysis", self.analysis_system_prompt, prompt)
+            ttl = self._cache_ttl("analysis")
+            cached = await self.cache.get(cache_key) if ttl else None
+            if cached is not None:
+                logger.info("Backend: Inventory unchanged, serving z/OS analysis from cache")
+                return {**cached, "inventory": digest}
 
-                result = response.json()
-                analysis_result = {
-                    "analysis": result['choices'][0]['message']['content'],
-                    "recommendations": self._extract_recommendations(result['choices'][0]['message']['content'])
-                }
-                logger.info(f"Backend: Analysis result: {json.dumps(analysis_result, indent=2)}")
-                return analysis_result
+            logger.info("Backend: Making request to Groq API for z/OS analysis")
+            request_data = self._chat_request(self.analysis_system_prompt, prompt, max_output=2000)
+            logger.info(f"Backend: Request: ~{self._estimate_tokens(request_data)} tokens incl. max_tokens")
+
+            result = await self._complete(request_data, priority)
+            analysis_result = {
+                "analysis": result['choices'][0]['message']['content'],
+                "recommendations": self._extract_recommendations(result['choices'][0]['message']['content'])
+            }
+            logger.info(
+                f"Backend: Analysis of {len(analysis_result['analysis'])} chars, "
+                f"{len(analysis_result['recommendations'])} recommendation(s)"
+            )
+            if ttl:
+                await self.cache.set(cache_key, analysis_result, ttl)
+            return {**analysis_result, "inventory": digest}
 
         except Exception as e:
             logger.error(f"Backend: Error analyzing z/OS structure: {str(e)}", exc_info=True)
             raise Exception(f"Error analyzing z/OS structure: {str(e)}")
 
+    async def analyze_system(self, system_info: str, attachments: Iterable[Attachment] = ()) -> str:
+        """
+        Analyze a described system or problem, with optional attachments
+        (job output, members) packed into the context window. Returns the
+        model's answer as text.
+        """
+        attachments = list(attachments)
+        logger.info(f"Backend: Analyzing system info ({len(system_info)} chars, {len(attachments)} attachment(s))")
+        try:
+            request_data = self._chat_request(self.analysis_system_prompt, system_info, attachments)
+            logger.info(f"Backend: Request: ~{self._estimate_tokens(request_data)} tokens incl. max_tokens")
+            result = await self._complete(request_data)
+            return result['choices'][0]['message']['content']
+        except Exception as e:
+            logger.error(f"Backend: Error analyzing system: {str(e)}", exc_info=True)
+            raise Exception(f"Error analyzing system: {str(e)}")
+
     def _extract_recommendations(self, content: str) -> List[str]:
         """
         Extract specific recommendations from the analysis.
@@ -293,4 +510,7 @@ Example command format:
             return recommendations
         except Exception as e:
             logger.error(f"Backend: Error extracting recommendations: {str(e)}", exc_info=True)
-            return [] 
\ No newline at end of file
+            return [] 
+
+
+groq_service = GroqService()
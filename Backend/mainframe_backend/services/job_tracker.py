@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional, Set
+import asyncio
+import logging
+from ..config.settings import settings
+from .cache import TTLCache
+from .job_waiter import job_waiter
+from .zosmf_client import ZosmfError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class JobTracker:
+    """
+    Follows submitted jobs in background tasks and pushes every state change
+    to the owner's subscribers (the /api/jobs/events stream).
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout or settings.JOB_TRACK_TIMEOUT
+        # job_id -> state dict; finished jobs age out after the retention TTL
+        self._jobs = TTLCache(settings.JOB_TRACK_MAX_JOBS, settings.JOB_TRACK_RETENTION)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def track(self, owner: str, credentials, job_name: str, job_id: str) -> Dict:
+        """
+        Start following a submitted job; returns its initial state.
+        """
+        state = {
+            "job_id": job_id,
+            "job_name": job_name,
+            "owner": owner,
+            "status": "SUBMITTED",
+            "return_code": None
+        }
+        self._publish(state)
+        task = asyncio.create_task(self._follow(state, credentials))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda done: self._tasks.pop(job_id, None))
+        return state
+
+    def jobs_for(self, owner: str) -> List[Dict]:
+        return [state for state in self._jobs.values() if state["owner"] == owner]
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def subscribe(self, owner: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.JOB_EVENT_QUEUE_SIZE)
+        self._subscribers.setdefault(owner, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, owner: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(owner)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[owner]
+
+    async def close(self):
+        """
+        Cancel every background follower (application shutdown).
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _follow(self, state: Dict, credentials):
+        def on_status(status: Dict):
+            if status.get("status") and status.get("status") != "OUTPUT":
+                self._publish({**state, "status": status.get("status")})
+
+        try:
+            status = await job_waiter.wait(
+                credentials,
+                state["job_name"],
+                state["job_id"],
+                timeout=self.timeout,
+                on_status=on_status
+            )
+            self._publish({**state, "status": "OUTPUT", "return_code": status.get("retcode")})
+        except asyncio.TimeoutError:
+            self._publish({**state, "status": "TIMEOUT"})
+        except ZosmfError as e:
+            self._publish({**state, "status": "ERROR", "error": e.detail})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Backend: Error tracking job {state['job_id']}: {str(e)}", exc_info=True)
+            self._publish({**state, "status": "ERROR", "error": str(e)})
+
+    def _publish(self, state: Dict):
+        self._jobs.set(state["job_id"], state)
+        for queue in list(self._subscribers.get(state["owner"], ())):
+            if queue.full():
+                # Slow subscriber: drop its oldest event rather than block tracking
+                queue.get_nowait()
+            queue.put_nowait(state)
+
+
+job_tracker = JobTracker()
@@ -0,0 +1,116 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import random
+import logging
+from ..config.settings import settings
+from .zosmf_client import zosmf_client, ZosmfError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JobKey = Tuple[str, str, str, str]
+
+
+class JobWaiter:
+    """
+    Waits for JES jobs to reach OUTPUT status.
+
+    Polls with exponential backoff and jitter, so quick jobs are seen almost
+    immediately while slow ones cost few status calls. Concurrent waiters on
+    the same job share one poll loop, which is cancelled once the last
+    waiter times out or goes away.
+    """
+
+    def __init__(
+        self,
+        initial_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        timeout: Optional[float] = None
+    ):
+        self.initial_delay = initial_delay or settings.JOB_POLL_INITIAL_DELAY
+        self.max_delay = max_delay or settings.JOB_POLL_MAX_DELAY
+        self.timeout = timeout or settings.JOB_WAIT_TIMEOUT
+        self._polls: Dict[JobKey, asyncio.Task] = {}
+        self._waiters: Dict[JobKey, int] = {}
+        self._listeners: Dict[JobKey, List[Callable[[Dict], None]]] = {}
+
+    async def wait(
+        self,
+        credentials,
+        job_name: str,
+        job_id: str,
+        timeout: Optional[float] = None,
+        on_status: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Return the job's status document once it is in OUTPUT.
+
+        `on_status` is called with the status document whenever the polled
+        status changes. Raises asyncio.TimeoutError when `timeout` (default
+        JOB_WAIT_TIMEOUT) elapses first, and ZosmfError if z/OSMF rejects a
+        status call.
+        """
+        key = (*zosmf_client.key(credentials), job_id)
+        task = self._polls.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._poll(key, credentials, job_name, job_id))
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self._polls[key] = task
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        if on_status:
+            self._listeners.setdefault(key, []).append(on_status)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout or self.timeout)
+        finally:
+            if on_status:
+                self._listeners[key].remove(on_status)
+                if not self._listeners[key]:
+                    del self._listeners[key]
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                if not task.done():
+                    task.cancel()
+
+    def in_flight(self) -> int:
+        return len(self._polls)
+
+    def _forget(self, key: JobKey, task: asyncio.Task):
+        if self._polls.get(key) is task:
+            del self._polls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved; waiters already received it
+
+    async def _poll(self, key: JobKey, credentials, job_name: str, job_id: str) -> Dict:
+        delay = self.initial_delay
+        polls = 0
+        last_status = None
+        while True:
+            polls += 1
+            async with zosmf_client.request(
+                credentials,
+                "GET",
+                f"restjobs/jobs/{job_name}/{job_id}"
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise ZosmfError(response.status, f"Failed to get job status: {error_text}")
+                status = await response.json()
+
+            if status.get("status") != last_status:
+                last_status = status.get("status")
+                for listener in list(self._listeners.get(key, [])):
+                    listener(status)
+
+            if status.get("status") == "OUTPUT":
+                logger.info(f"Backend: Job {job_name}({job_id}) reached OUTPUT after {polls} poll(s)")
+                return status
+
+            # Equal jitter: sleep between half and all of the current delay
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.max_delay)
+
+
+job_waiter = JobWaiter()
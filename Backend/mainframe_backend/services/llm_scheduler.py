@@ -0,0 +1,227 @@
+from typing import Awaitable, Callable, List, Mapping, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import time
+import logging
+import httpx
+from ..config.settings import settings
+from .rate_limiter import TokenBucketLimiter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds from a retry-after ("7") or x-ratelimit-reset-* ("1m2.5s", "250ms") value.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class LLMScheduler:
+    """
+    Central queue for LLM provider calls.
+
+    Callers wait for a slot in priority order (interactive chat ahead of
+    batches, batches ahead of background analysis). A slot is granted only
+    together with the caller's rate limit reservation, and while the
+    waiter at the head of the queue waits for the token bucket nobody
+    behind it is served, so a queue of background calls cannot hold
+    capacity an interactive call is waiting for. The number of slots
+    adapts: a 429 or 503 halves it and pauses dispatch for the provider's
+    retry-after, an exhausted x-ratelimit-remaining-* header pauses until
+    the matching reset, and a run of successes grows it back by one.
+    Retryable failures are retried with exponential backoff and jitter.
+    """
+
+    def __init__(self, limiter: TokenBucketLimiter, max_concurrency: Optional[int] = None):
+        self.limiter = limiter
+        self.max_concurrency = max_concurrency or settings.GROQ_MAX_CONCURRENCY
+        self.concurrency = self.max_concurrency
+        self.active = 0
+        self.retries = 0
+        self.throttled = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._resume: Optional[asyncio.TimerHandle] = None
+        # (priority, arrival, tokens, future) of callers waiting for a slot
+        self._waiting: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @asynccontextmanager
+    async def request(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        priority: int = PRIORITY_INTERACTIVE,
+        tokens: int = 0
+    ):
+        """
+        Run `send` in a slot, retrying retryable failures, and yield
+        (response, reserved_tokens). The slot is held until the block exits,
+        so streamed responses count against concurrency while they are read.
+        The caller settles the reservation of the response it is handed;
+        failed and retried attempts are settled here, as using no tokens.
+        """
+        attempt = 0
+        while True:
+            reserved = await self._acquire(priority, tokens)
+            response = None
+            handed_over = False
+            try:
+                try:
+                    response = await send()
+                except httpx.TransportError as e:
+                    if attempt >= settings.GROQ_MAX_RETRIES:
+                        raise
+                    logger.warning(f"Backend: LLM request failed ({str(e) or type(e).__name__}), retrying")
+                    delay = self._backoff(attempt)
+                else:
+                    self._observe(response)
+                    if response.status_code not in RETRYABLE_STATUSES or attempt >= settings.GROQ_MAX_RETRIES:
+                        handed_over = True
+                        try:
+                            yield response, reserved
+                        finally:
+                            await response.aclose()
+                        return
+                    delay = parse_duration(response.headers.get("retry-after")) or self._backoff(attempt)
+                    logger.warning(
+                        f"Backend: LLM provider returned {response.status_code}, "
+                        f"retry {attempt + 1} in {delay:.2f}s"
+                    )
+                    await response.aclose()
+            finally:
+                if not handed_over:
+                    self.limiter.settle(reserved, 0)
+                self._release()
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def metrics(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": len(self._waiting),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "retries": self.retries,
+            "throttled": self.throttled
+        }
+
+    async def _acquire(self, priority: int, tokens: int) -> int:
+        """
+        Wait for a slot and the rate limit reservation; returns the tokens reserved.
+        """
+        if not self._waiting and self._has_slot() and self.limiter.wait_time(tokens) <= 0:
+            self.active += 1
+            return self.limiter.reserve(tokens)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._arrivals), tokens, future))
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot and tokens on
+                self.limiter.settle(future.result(), 0)
+                self._release()
+            raise
+
+    def _release(self):
+        self.active -= 1
+        self._dispatch()
+
+    def _has_slot(self) -> bool:
+        return self.active < self.concurrency and time.monotonic() >= self._paused_until
+
+    def _dispatch(self):
+        wait = 0.0
+        while self._waiting and self._has_slot():
+            _, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue  # waiter gave up
+            wait = self.limiter.wait_time(tokens)
+            if wait > 0:
+                # The head waits for the bucket; nobody overtakes it
+                break
+            heapq.heappop(self._waiting)
+            self.active += 1
+            future.set_result(self.limiter.reserve(tokens))
+        wait = max(wait, self._paused_until - time.monotonic())
+        if self._waiting and wait > 0:
+            self._resume_in(wait)
+
+    def _resume_in(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._resume is not None:
+            if self._resume.when() <= loop.time() + delay:
+                return
+            self._resume.cancel()
+
+        def resume():
+            self._resume = None
+            self._dispatch()
+        self._resume = loop.call_later(delay, resume)
+
+    def _observe(self, response: httpx.Response):
+        """
+        Adapt concurrency and pauses to the provider's answer.
+        """
+        headers: Mapping[str, str] = response.headers
+        if response.status_code in (429, 503):
+            self.throttled += 1
+            self._successes = 0
+            self.concurrency = max(settings.GROQ_MIN_CONCURRENCY, self.concurrency // 2)
+            self._pause(parse_duration(headers.get("retry-after")) or self._backoff(0))
+            return
+        if response.status_code != 200:
+            return
+
+        for kind in ("requests", "tokens"):
+            if headers.get(f"x-ratelimit-remaining-{kind}") == "0":
+                self._pause(parse_duration(headers.get(f"x-ratelimit-reset-{kind}")) or self._backoff(0))
+
+        self._successes += 1
+        if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self._successes = 0
+            self._dispatch()
+
+    def _pause(self, seconds: float):
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            logger.info(f"Backend: Pausing LLM requests for {seconds:.2f}s (concurrency {self.concurrency})")
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        delay = min(settings.GROQ_RETRY_MAX_DELAY, settings.GROQ_RETRY_BASE_DELAY * 2 ** attempt)
+        # Equal jitter so synchronized clients spread out
+        return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,79 @@
+from typing import Optional
+import time
+
+
+class TokenBucketLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter for an LLM provider.
+
+    Two token buckets refill continuously at limit/60 per second.
+    `wait_time` says how long until one request and the estimated tokens
+    fit and `reserve` takes them; the caller's own queue (LLMScheduler)
+    decides who goes first. `settle` refunds the difference once the real
+    usage is known. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+
+    def wait_time(self, tokens: int) -> float:
+        """
+        Seconds until one request and `tokens` fit; 0 when they fit now.
+        """
+        self._refill()
+        return max(self._wait(self._requests, 1, self.rpm), self._wait(self._tokens, self._capped(tokens), self.tpm))
+
+    def reserve(self, tokens: int) -> int:
+        """
+        Take one request and `tokens` from the buckets, right after
+        wait_time returned 0; returns the tokens reserved.
+        """
+        tokens = self._capped(tokens)
+        self._refill()
+        if self.rpm:
+            self._requests -= 1
+        if self.tpm:
+            self._tokens -= tokens
+        return tokens
+
+    def settle(self, reserved: int, used: Optional[int]):
+        """
+        Return unused reserved tokens (or charge the overrun) once the
+        response reports its real usage.
+        """
+        if not self.tpm or used is None:
+            return
+        self._refill()
+        self._tokens = min(self.tpm, self._tokens + reserved - used)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _capped(self, tokens: int) -> int:
+        # A request larger than the whole bucket would never fit
+        return min(tokens, self.tpm) if self.tpm else tokens
+
+    @staticmethod
+    def _wait(available: float, needed: float, limit: int) -> float:
+        if not limit or available >= needed:
+            return 0
+        return (needed - available) * 60 / limit
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "requests_available": round(self._requests, 2),
+            "tokens_available": round(self._tokens)
+        }
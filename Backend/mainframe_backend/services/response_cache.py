@@ -0,0 +1,114 @@
+from typing import Any, Optional
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import logging
+from ..config.settings import settings
+from .cache import TTLCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Prompts that differ only in case or spacing share a cache entry.
+    """
+    return " ".join(prompt.split()).casefold()
+
+
+class ResponseCache:
+    """
+    Exact-match cache for LLM answers, keyed on (model, mode, system prompt,
+    normalized prompt, attachments). Only the prompt is normalized; packed
+    attachments (member text, job output) are hashed exactly as sent.
+
+    Entries live in an in-memory TTL/LRU cache. When `db_path` is set they
+    are also written to SQLite, so answers survive restarts; a memory miss
+    falls back to the database.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, db_path: Optional[str] = None):
+        self._memory = TTLCache(max_entries or settings.AI_CACHE_SIZE, settings.AI_CACHE_DEFAULT_TTL)
+        self.db_path = db_path if db_path is not None else settings.AI_CACHE_DB
+        self.disk_hits = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, mode: str, system_prompt: str, prompt: str, attachments: str = "") -> str:
+        system_hash = hashlib.sha256(system_prompt.encode()).hexdigest()
+        attachments_hash = hashlib.sha256(attachments.encode()).hexdigest()
+        raw = json.dumps([model, mode, system_hash, normalize_prompt(prompt), attachments_hash])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def open(self):
+        """
+        Open the SQLite store (if configured) and drop expired rows.
+        """
+        if not self.db_path or self._db is not None:
+            return
+        await asyncio.to_thread(self._open_db)
+        logger.info(f"Backend: AI response cache persisted to {self.db_path}")
+
+    async def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._memory.get(key)
+        if value is not None or self._db is None:
+            return value
+        row = await asyncio.to_thread(self._db_get, key)
+        if row is None:
+            return None
+        value, expires_at = row
+        self.disk_hits += 1
+        self._memory.set(key, value, ttl=expires_at - time.time())
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._memory.set(key, value, ttl=ttl)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, key, value, time.time() + ttl)
+
+    def stats(self) -> dict:
+        return {**self._memory.stats(), "disk_hits": self.disk_hits, "persistent": self._db is not None}
+
+    def _open_db(self):
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS ai_responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        db.execute("DELETE FROM ai_responses WHERE expires_at <= ?", (time.time(),))
+        db.commit()
+        self._db = db
+
+    def _db_get(self, key: str):
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, expires_at FROM ai_responses WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _db_set(self, key: str, value: Any, expires_at: float):
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO ai_responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._db.commit()
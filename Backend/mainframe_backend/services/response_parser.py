@@ -0,0 +1,198 @@
+from typing import Dict, List, Optional
+import json
+import re
+
+
+def get_language(filename: str) -> str:
+    """
+    Determine the programming language based on file extension.
+    """
+    ext = filename.split('.')[-1].lower()
+    language_map = {
+        'cbl': 'cobol',
+        'jcl': 'jcl',
+        'cpy': 'cobol',
+        'txt': 'text',
+        'md': 'markdown'
+    }
+    return language_map.get(ext, 'text')
+
+
+# Fence labels that mark a snippet rather than a file to create
+JSON_LABELS = {"json"}
+SHELL_LABELS = {"bash", "sh", "shell", "console", "powershell", "ps", "cmd"}
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$")
+_ZOWE_COMMAND = re.compile(r"(?:^|[\s`$>])(zowe\s+[\w-]+\s+[\w-]+[^`\n]*)")
+
+
+class ResponseParser:
+    """
+    Incremental parser for LLM answers.
+
+    Text is fed in arbitrary pieces (streamed tokens or a whole response).
+    Each piece is scanned once for line breaks, and each completed line is
+    handled once, so the total work is linear in the response length.
+    `feed` and `close` return the events completed so far:
+
+      {"type": "file", "file": {...}}        a named fenced block (```NAME)
+      {"type": "command", "command": {...}}  a zowe command, from a ```json
+                                             {"commands": [...]} block or a
+                                             `zowe ...` line outside files
+      {"type": "explanation", "text": ...}   prose between code blocks
+
+    Fences follow CommonMark: a block opened with N backticks (or tildes)
+    closes only on a bare fence of at least N of the same character, so
+    files may contain shorter fences of their own. Unlabeled blocks are kept
+    in the explanation, as before.
+    """
+
+    def __init__(self):
+        self.files: List[Dict] = []
+        self.json_commands: List[Dict] = []
+        self.line_commands: List[Dict] = []
+        self._chunks: List[str] = []
+        self._pieces: List[str] = []  # the current, unterminated line
+        self._explanation: List[str] = []
+        self._pending_text: List[str] = []  # prose not yet emitted as an event
+        self._events: List[Dict] = []
+        # open fence: (marker, label) and the block's lines
+        self._fence: Optional[tuple] = None
+        self._block: List[str] = []
+
+    @property
+    def commands(self) -> List[Dict]:
+        # Structured JSON commands win over ones spotted in prose
+        return self.json_commands or self.line_commands
+
+    def feed(self, text: str) -> List[Dict]:
+        """
+        Consume more text; returns the events it completed.
+        """
+        self._chunks.append(text)
+        start = 0
+        end = text.find("\n")
+        while end != -1:
+            self._pieces.append(text[start:end])
+            line = "".join(self._pieces)
+            self._pieces = []
+            self._line(line)
+            start = end + 1
+            end = text.find("\n", start)
+        if start < len(text):
+            self._pieces.append(text[start:])
+        return self._take_events()
+
+    def close(self) -> List[Dict]:
+        """
+        Flush the last line and any unterminated block; returns the final events.
+        """
+        self._line("".join(self._pieces))
+        self._pieces = []
+        if self._fence is not None:
+            # Unterminated fence: close it as the model evidently meant to
+            self._close_block()
+        self._flush_text()
+        return self._take_events()
+
+    def result(self) -> Dict:
+        """
+        Files, full response and explanation, in the shape the AI endpoints return.
+        """
+        return {
+            "files": self.files,
+            "response": "".join(self._chunks),
+            "explanation": "\n".join(self._explanation).strip()
+        }
+
+    def _take_events(self) -> List[Dict]:
+        events, self._events = self._events, []
+        return events
+
+    def _line(self, line: str):
+        fence = _FENCE.match(line)
+        if self._fence is None:
+            if fence:
+                self._flush_text()
+                self._fence = (fence.group(1), fence.group(2).strip())
+                self._block = []
+            else:
+                self._text(line)
+            return
+
+        marker, _ = self._fence
+        if (
+            fence
+            and not fence.group(2).strip()
+            and fence.group(1)[0] == marker[0]
+            and len(fence.group(1)) >= len(marker)
+        ):
+            self._close_block()
+        else:
+            self._block.append(line)
+
+    def _close_block(self):
+        _, label = self._fence
+        lines, self._block, self._fence = self._block, [], None
+        kind = label.lower()
+
+        if kind in JSON_LABELS:
+            if not self._json_commands("\n".join(lines)):
+                self._explanation.extend(lines)
+            return
+        if not label or kind in SHELL_LABELS:
+            # Snippets stay part of the explanation; zowe lines in them are commands
+            for line in lines:
+                self._text(line)
+            self._flush_text()
+            return
+
+        file = {
+            "name": label,
+            "type": "file",
+            "path": f"src/{label}",
+            "content": "\n".join(lines),
+            "language": get_language(label)
+        }
+        self.files.append(file)
+        self._events.append({"type": "file", "file": file})
+
+    def _json_commands(self, block: str) -> bool:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            return False
+        if not (isinstance(data, dict) and isinstance(data.get("commands"), list)):
+            return False
+        for command in data["commands"]:
+            if isinstance(command, dict) and command.get("command"):
+                entry = {"command": command["command"], "description": command.get("description", "")}
+                self.json_commands.append(entry)
+                self._events.append({"type": "command", "command": entry})
+        return True
+
+    def _text(self, line: str):
+        self._explanation.append(line)
+        self._pending_text.append(line)
+        if "zowe" in line:
+            match = _ZOWE_COMMAND.search(line)
+            if match:
+                entry = {"command": match.group(1).strip(), "description": ""}
+                self.line_commands.append(entry)
+                self._events.append({"type": "command", "command": entry})
+
+    def _flush_text(self):
+        text = "\n".join(self._pending_text).strip()
+        self._pending_text = []
+        if text:
+            self._events.append({"type": "explanation", "text": text})
+
+
+def parse_response(content: str) -> ResponseParser:
+    """
+    Parse a complete response in one go.
+    """
+    parser = ResponseParser()
+    parser.feed(content)
+    parser.close()
+    return parser
@@ -0,0 +1,130 @@
+from typing import AsyncIterator, List, Optional
+import asyncio
+import json
+from ..config.settings import settings
+from .zosmf_client import zosmf_client, ZosmfError
+from .context_builder import Attachment
+
+
+def job_path(job_id: str, job_name: Optional[str] = None) -> str:
+    """
+    z/OSMF addresses a job as jobs/{jobname}/{jobid}; fall back to the bare id.
+    """
+    return f"jobs/{job_name}/{job_id}" if job_name else f"jobs/{job_id}"
+
+
+def spool_items(response) -> List[dict]:
+    """
+    The spool file list is a JSON array; older callers wrapped it in 'items'.
+    """
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        return response.get('items', [])
+    return []
+
+
+def spool_text(response_text: str) -> str:
+    """
+    Records come back as plain text, or as {"records": [...]} from some gateways.
+    """
+    try:
+        data = json.loads(response_text)
+    except ValueError:
+        return response_text
+    if isinstance(data, dict) and 'records' in data:
+        return "\n".join(data['records'])
+    return response_text
+
+
+async def iter_spool_records(
+    credentials,
+    path: str,
+    file_id,
+    start: int = 0,
+    count: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Yield a spool file's text one X-IBM-Record-Range window at a time.
+
+    `start` is the zero-based first record and `count` caps how many records
+    are read (None reads to the end). At most SPOOL_RANGE_RECORDS records
+    are held in memory at once, whatever the size of the file.
+    """
+    window = settings.SPOOL_RANGE_RECORDS
+    remaining = count
+    while remaining is None or remaining > 0:
+        size = window if remaining is None else min(window, remaining)
+        async with zosmf_client.request(
+            credentials,
+            "GET",
+            f"restjobs/{path}/files/{file_id}/records",
+            headers={"Accept": "text/plain", "X-IBM-Record-Range": f"{start},{size}"}
+        ) as response:
+            response_text = await response.text()
+            if response.status != 200:
+                raise ZosmfError(response.status, f"Zowe API error ({response.status}): {response_text}")
+
+        text = spool_text(response_text)
+        if not text:
+            break
+        if not text.endswith("\n"):
+            text += "\n"
+        yield text
+
+        received = text.count("\n")
+        start += received
+        if remaining is not None:
+            remaining -= received
+        if received < size:
+            break
+
+
+async def read_spool_excerpt(credentials, path: str, item: dict, max_records: Optional[int] = None) -> str:
+    """
+    A spool file's text, or its first and last records when it has more
+    than `max_records`, so a huge SYSOUT is never downloaded in full.
+    """
+    max_records = max_records or settings.SPOOL_AI_MAX_RECORDS
+    total = item.get('record-count') or 0
+    if not total or total <= max_records:
+        return "".join([page async for page in iter_spool_records(credentials, path, item.get('id'))])
+
+    half = max_records // 2
+    head = "".join([page async for page in iter_spool_records(credentials, path, item.get('id'), 0, half)])
+    tail = "".join([
+        page async for page in iter_spool_records(credentials, path, item.get('id'), total - half, half)
+    ])
+    return f"{head}... [{total - 2 * half} records omitted] ...\n{tail}"
+
+
+async def job_output_attachments(
+    credentials,
+    job_id: str,
+    job_name: Optional[str] = None,
+    ddnames: Optional[List[str]] = None
+) -> List[Attachment]:
+    """
+    The job's spool files (all of them, or those with the given DD names)
+    as SYSOUT attachments for the LLM context builder, read concurrently.
+    """
+    path = job_path(job_id, job_name)
+    async with zosmf_client.request(credentials, "GET", f"restjobs/{path}/files") as response:
+        response_text = await response.text()
+        if response.status != 200:
+            raise ZosmfError(response.status, f"Zowe API error ({response.status}): {response_text}")
+    wanted = {dd.upper() for dd in ddnames} if ddnames else None
+    items = [
+        item for item in spool_items(json.loads(response_text))
+        if wanted is None or (item.get('ddname') or '').upper() in wanted
+    ]
+
+    semaphore = asyncio.Semaphore(settings.SPOOL_FETCH_CONCURRENCY)
+
+    async def read(item: dict) -> Attachment:
+        async with semaphore:
+            text = await read_spool_excerpt(credentials, path, item)
+        name = ".".join(part for part in (item.get('stepname'), item.get('ddname')) if part)
+        return Attachment(f"{job_name or job_id} {name}", text, "sysout")
+
+    return list(await asyncio.gather(*(read(item) for item in items)))
@@ -0,0 +1,259 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from urllib.parse import quote
+import asyncio
+import json
+import time
+import logging
+from ..config.settings import settings
+from .zosmf_client import zosmf_client, ZosmfError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes per 3390 track and tracks per cylinder
+TRACK_BYTES = 56664
+CYLINDER_TRACKS = 15
+
+
+def default_patterns(credentials) -> List[str]:
+    return [f"{credentials.username.upper()}.*"]
+
+
+async def list_datasets(credentials, pattern: str) -> Tuple[List[Dict], bool]:
+    """
+    Datasets matching a DSLEVEL pattern with their base attributes, capped
+    at ZOS_INVENTORY_MAX_DATASETS; returns (items, more_rows).
+    """
+    async with zosmf_client.request(
+        credentials,
+        "GET",
+        f"restfiles/ds?dslevel={quote(pattern)}",
+        headers={"X-IBM-Attributes": "base", "X-IBM-Max-Items": str(settings.ZOS_INVENTORY_MAX_DATASETS)}
+    ) as response:
+        response_text = await response.text()
+        if response.status != 200:
+            raise ZosmfError(response.status, f"Listing {pattern} failed ({response.status}): {response_text}")
+    data = json.loads(response_text)
+    items = data.get('items', [])
+    return items, bool(data.get('moreRows')) or len(items) >= settings.ZOS_INVENTORY_MAX_DATASETS
+
+
+async def list_jobs(credentials, owner: Optional[str] = None) -> List[Dict]:
+    """
+    The owner's most recent jobs (up to ZOS_INVENTORY_MAX_JOBS) with their return codes.
+    """
+    owner = (owner or credentials.username).upper()
+    async with zosmf_client.request(
+        credentials,
+        "GET",
+        f"restjobs/jobs?owner={quote(owner)}&prefix=*&max-jobs={settings.ZOS_INVENTORY_MAX_JOBS}"
+    ) as response:
+        response_text = await response.text()
+        if response.status != 200:
+            raise ZosmfError(response.status, f"Listing jobs of {owner} failed ({response.status}): {response_text}")
+    data = json.loads(response_text)
+    return data if isinstance(data, list) else data.get('items', [])
+
+
+async def collect_inventory(credentials, patterns: Optional[List[str]] = None) -> Dict:
+    """
+    Dataset listings for every pattern and the recent job list, fetched
+    concurrently. A failed listing is reported in `errors` instead of
+    failing the whole inventory; only when every call fails is the first
+    error raised.
+    """
+    patterns = patterns or default_patterns(credentials)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(list_datasets(credentials, pattern) for pattern in patterns),
+        list_jobs(credentials),
+        return_exceptions=True
+    )
+
+    datasets: Dict[str, Dict] = {}
+    capped, errors = [], []
+    for pattern, result in zip(patterns, results):
+        if isinstance(result, Exception):
+            errors.append(f"{pattern}: {getattr(result, 'detail', None) or str(result)}")
+            continue
+        items, more = result
+        for item in items:
+            if item.get('dsname'):
+                datasets[item['dsname']] = item  # overlapping patterns list a dataset once
+        if more:
+            capped.append(pattern)
+
+    if all(isinstance(result, Exception) for result in results):
+        raise results[0]
+    jobs = results[-1]
+    if isinstance(jobs, Exception):
+        errors.append(f"jobs: {getattr(jobs, 'detail', None) or str(jobs)}")
+        jobs = []
+
+    logger.info(
+        f"Backend: Collected z/OS inventory ({len(datasets)} datasets, {len(jobs)} jobs) "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return {
+        "patterns": patterns,
+        "datasets": list(datasets.values()),
+        "jobs": jobs,
+        "capped": capped,
+        "errors": errors
+    }
+
+
+def allocated_tracks(item: Dict) -> Optional[float]:
+    """
+    Primary allocation of a dataset in tracks, from sizex/spacu.
+    """
+    try:
+        size = float(item.get('sizex') or 0)
+    except ValueError:
+        return None
+    unit = (item.get('spacu') or 'TRACKS').upper()
+    if unit.startswith('CYL'):
+        return size * CYLINDER_TRACKS
+    if unit.startswith('BLK') or unit.startswith('BLOCK'):
+        try:
+            return size * float(item.get('blksz') or item.get('blksize') or 0) / TRACK_BYTES
+        except ValueError:
+            return None
+    return size
+
+
+def job_outcome(job: Dict) -> str:
+    """
+    Bucket a job's retcode: CC 0000, CC 0004, CC 0008+, ABEND, JCL ERROR, ...
+    """
+    retcode = (job.get('retcode') or '').upper()
+    if not retcode:
+        return "ACTIVE/QUEUED" if job.get('status') in ("INPUT", "ACTIVE") else "NO RC"
+    if retcode.startswith("CC "):
+        try:
+            code = int(retcode[3:])
+        except ValueError:
+            return retcode
+        return "CC 0000" if code == 0 else "CC 0004" if code <= 4 else "CC 0008+"
+    if retcode.startswith("ABEND"):
+        return "ABEND"
+    return retcode
+
+
+def build_digest(inventory: Dict) -> Dict:
+    """
+    Reduce an inventory to counts and a handful of examples, so its size
+    does not grow with the number of datasets or jobs.
+    """
+    top = settings.ZOS_INVENTORY_TOP
+    datasets = inventory["datasets"]
+    jobs = inventory["jobs"]
+
+    hlqs, second, last, dsorgs, recfms = Counter(), Counter(), Counter(), Counter(), Counter()
+    sizes = []
+    migrated = near_full = multi_extent = 0
+    for item in datasets:
+        qualifiers = item['dsname'].split('.')
+        hlqs[qualifiers[0]] += 1
+        if len(qualifiers) > 1:
+            second[".".join(qualifiers[:2])] += 1
+        last[qualifiers[-1] if len(qualifiers) > 1 else "(single)"] += 1
+        if (item.get('migr') or '').upper() == 'YES' or (item.get('vol') or '').upper() == 'MIGRAT':
+            migrated += 1
+            continue
+        dsorgs[item.get('dsorg') or "?"] += 1
+        recfms[item.get('recfm') or "?"] += 1
+        tracks = allocated_tracks(item)
+        if tracks:
+            sizes.append((tracks, item['dsname']))
+        try:
+            if int(item.get('used') or 0) >= 90:
+                near_full += 1
+        except ValueError:
+            pass
+        try:
+            if int(item.get('extx') or 0) >= 5:
+                multi_extent += 1
+        except ValueError:
+            pass
+
+    outcomes = Counter(job_outcome(job) for job in jobs)
+    failures = Counter()
+    failure_codes: Dict[str, Counter] = {}
+    for job in jobs:
+        outcome = job_outcome(job)
+        if outcome in ("CC 0000", "CC 0004", "ACTIVE/QUEUED", "NO RC"):
+            continue
+        name = job.get('jobname') or "?"
+        failures[name] += 1
+        failure_codes.setdefault(name, Counter())[job.get('retcode') or outcome] += 1
+
+    total_tracks = sum(tracks for tracks, _ in sizes)
+    return {
+        "patterns": inventory["patterns"],
+        "datasets": len(datasets),
+        "capped": inventory["capped"],
+        "errors": inventory["errors"],
+        "by_hlq": dict(hlqs.most_common(top)),
+        "by_second_level": dict(second.most_common(top)),
+        "distinct_second_level": len(second),
+        "by_last_qualifier": dict(last.most_common(top)),
+        "distinct_last_qualifiers": len(last),
+        "by_dsorg": dict(dsorgs.most_common(top)),
+        "by_recfm": dict(recfms.most_common(top)),
+        "migrated": migrated,
+        "space": {
+            "allocated_tracks": round(total_tracks),
+            "allocated_mb": round(total_tracks * TRACK_BYTES / 1e6, 1),
+            "near_full": near_full,
+            "multi_extent": multi_extent,
+            "largest": [
+                {"dsname": dsname, "tracks": round(tracks)}
+                for tracks, dsname in sorted(sizes, reverse=True)[:min(top, 5)]
+            ]
+        },
+        "jobs": len(jobs),
+        "job_outcomes": dict(outcomes.most_common()),
+        "failing_jobs": [
+            {
+                "jobname": name,
+                "failures": count,
+                "retcodes": dict(failure_codes[name].most_common(3))
+            }
+            for name, count in failures.most_common(min(top, 5))
+        ]
+    }
+
+
+def _counts(counts: Dict[str, int]) -> str:
+    return ", ".join(f"{name} {count}" for name, count in counts.items()) or "none"
+
+
+def format_digest(digest: Dict) -> str:
+    """
+    The digest as the few dozen lines sent to the model.
+    """
+    space = digest["space"]
+    lines = [
+        f"Datasets: {digest['datasets']} matching {', '.join(digest['patterns'])}"
+        + (f" (listing capped for {', '.join(digest['capped'])})" if digest["capped"] else ""),
+        f"By HLQ: {_counts(digest['by_hlq'])}",
+        f"By first two qualifiers ({digest['distinct_second_level']} distinct): {_counts(digest['by_second_level'])}",
+        f"By last qualifier ({digest['distinct_last_qualifiers']} distinct): {_counts(digest['by_last_qualifier'])}",
+        f"By DSORG: {_counts(digest['by_dsorg'])}",
+        f"By RECFM: {_counts(digest['by_recfm'])}",
+        f"Migrated: {digest['migrated']}",
+        f"Primary space allocated: {space['allocated_tracks']} tracks (~{space['allocated_mb']} MB); "
+        f"{space['near_full']} datasets at least 90% used; {space['multi_extent']} with 5+ extents",
+        "Largest: " + (", ".join(f"{entry['dsname']} {entry['tracks']} trk" for entry in space["largest"]) or "none"),
+        f"Recent jobs: {digest['jobs']}; results: {_counts(digest['job_outcomes'])}",
+        "Failing most often: " + (", ".join(
+            f"{entry['jobname']} x{entry['failures']} ({_counts(entry['retcodes'])})"
+            for entry in digest["failing_jobs"]
+        ) or "none")
+    ]
+    if digest["errors"]:
+        lines.append(f"Not collected: {'; '.join(digest['errors'])}")
+    return "\n".join(lines)
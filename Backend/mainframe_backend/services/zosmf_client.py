@@ -0,0 +1,332 @@
+from typing import Dict, Optional, Set, Tuple
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import aiohttp
+import asyncio
+import time
+import base64
+import ssl
+import logging
+from ..config.settings import settings
+from .cache import TTLCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SessionKey = Tuple[str, str, str]
+HostKey = Tuple[str, str]
+
+
+class ZosmfError(Exception):
+    """
+    Non-success answer from z/OSMF, carrying the HTTP status to surface.
+    """
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def _create_ssl_context() -> ssl.SSLContext:
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+class ZosmfClient:
+    """
+    Application-lifetime z/OSMF REST client.
+
+    Keeps one keep-alive connection pool per (host, port, user) so repeated
+    dataset and job calls reuse the TCP/TLS connection instead of opening a
+    new one for every request. Sessions keep no cookies, so each request is
+    authenticated by the password it carries. At most ZOSMF_MAX_SESSIONS
+    sessions are kept: opening another one closes those unused for
+    ZOSMF_SESSION_IDLE_TTL seconds, then the least recently used ones that
+    cannot have a request in flight.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        request_timeout: Optional[float] = None,
+        csrf_ttl: Optional[float] = None
+    ):
+        self.pool_size = pool_size or settings.ZOSMF_POOL_SIZE
+        self.keepalive_timeout = keepalive_timeout or settings.ZOSMF_KEEPALIVE_TIMEOUT
+        self.request_timeout = request_timeout or settings.ZOSMF_REQUEST_TIMEOUT
+        self.csrf_ttl = csrf_ttl or settings.ZOSMF_CSRF_TTL
+        self.max_sessions = settings.ZOSMF_MAX_SESSIONS
+        self.session_idle_ttl = settings.ZOSMF_SESSION_IDLE_TTL
+        # key -> (session, last_used), least recently used first
+        self._sessions: "OrderedDict[SessionKey, Tuple[aiohttp.ClientSession, float]]" = OrderedDict()
+        self._closing: Set[asyncio.Task] = set()
+        # key -> (token,); a None token means z/OSMF sent none
+        self._csrf_tokens = TTLCache(self.max_sessions, self.csrf_ttl)
+        self._csrf_refreshes: Dict[SessionKey, asyncio.Task] = {}
+        # (host, port) -> GET /zosmf/info document; it does not vary by user
+        self._system_info = TTLCache(settings.ZOSMF_INFO_CACHE_SIZE, settings.ZOSMF_INFO_TTL)
+        self._info_fetches: Dict[HostKey, asyncio.Task] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    async def start(self):
+        """
+        Prepare the shared TLS context. Sessions are opened lazily per user.
+        """
+        if self._ssl_context is None:
+            self._ssl_context = _create_ssl_context()
+        logger.info(
+            f"Backend: z/OSMF client started (pool size {self.pool_size}, "
+            f"keep-alive {self.keepalive_timeout}s)"
+        )
+
+    async def close(self):
+        """
+        Close every pooled session and its connections.
+        """
+        sessions = [session for session, _ in self._sessions.values()]
+        self._sessions.clear()
+        self._csrf_tokens.clear()
+        self._system_info.clear()
+        fetches = [*self._csrf_refreshes.values(), *self._info_fetches.values()]
+        self._csrf_refreshes.clear()
+        self._info_fetches.clear()
+        for task in fetches:
+            task.cancel()
+        await asyncio.gather(*fetches, *self._closing, return_exceptions=True)
+        for session in sessions:
+            await session.close()
+        logger.info(f"Backend: z/OSMF client closed {len(sessions)} session(s)")
+
+    @staticmethod
+    def key(credentials) -> SessionKey:
+        return (credentials.host, str(credentials.port), credentials.username)
+
+    @staticmethod
+    def base_url(credentials) -> str:
+        return f"https://{credentials.host}:{credentials.port}/zosmf"
+
+    @staticmethod
+    def auth_header(credentials) -> Dict[str, str]:
+        auth = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
+        return {"Authorization": f"Basic {auth}"}
+
+    def session(self, credentials) -> aiohttp.ClientSession:
+        """
+        Return the pooled session for these credentials, opening it on first use.
+        """
+        key = self.key(credentials)
+        now = time.monotonic()
+        session = self._sessions[key][0] if key in self._sessions else None
+        if session is None or session.closed:
+            self._evict_sessions(now)
+            if self._ssl_context is None:
+                # start() was not called (e.g. outside the app lifespan)
+                self._ssl_context = _create_ssl_context()
+            connector = aiohttp.TCPConnector(
+                ssl=self._ssl_context,
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                # Every request carries Basic auth. Keeping z/OSMF's LtpaToken2
+                # cookie would let a later request with a wrong password ride on it.
+                cookie_jar=aiohttp.DummyCookieJar()
+            )
+            logger.info(f"Backend: Opened z/OSMF session for {key[2]}@{key[0]}:{key[1]}")
+        self._sessions[key] = (session, now)
+        self._sessions.move_to_end(key)
+        return session
+
+    def _evict_sessions(self, now: float):
+        """
+        Make room for one more session: close the idle ones, then, over the
+        limit, the least recently used ones older than a request timeout.
+        """
+        for key, (session, last_used) in list(self._sessions.items()):
+            idle = now - last_used
+            over_limit = len(self._sessions) >= self.max_sessions
+            if idle > self.session_idle_ttl or (over_limit and idle > self.request_timeout):
+                self._close_session(key, session)
+            else:
+                break  # the rest were used more recently
+        if len(self._sessions) >= self.max_sessions:
+            logger.warning(f"Backend: {len(self._sessions)} z/OSMF sessions busy, opening one over the limit")
+
+    def _close_session(self, key: SessionKey, session: aiohttp.ClientSession):
+        del self._sessions[key]
+        self._csrf_tokens.pop(key)
+        task = asyncio.get_running_loop().create_task(session.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+        logger.info(f"Backend: Closed idle z/OSMF session for {key[2]}@{key[0]}:{key[1]}")
+
+    def session_stats(self) -> dict:
+        return {"sessions": len(self._sessions), "max_sessions": self.max_sessions}
+
+    def headers(self, credentials, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Build the standard z/OSMF request headers, merged with any overrides.
+        """
+        request_headers = {
+            **self.auth_header(credentials),
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "X-CSRF-ZOSMF-HEADER": "*"
+        }
+        if headers:
+            request_headers.update(headers)
+        return request_headers
+
+    async def fetch_csrf_token(self, credentials) -> Optional[str]:
+        """
+        Pre-flight GET /zosmf/ to read the X-CSRF-ZOSMF-TOKEN header.
+        """
+        session = self.session(credentials)
+        async with session.get(
+            f"{self.base_url(credentials)}/",
+            headers=self.auth_header(credentials)
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise ZosmfError(response.status, f"CSRF token request failed: {error_text}")
+            return response.headers.get("X-CSRF-ZOSMF-TOKEN")
+
+    async def csrf_token(self, credentials, refresh: bool = False) -> Optional[str]:
+        """
+        Return the cached CSRF token for these credentials, fetching it when
+        missing, expired or when refresh is requested.
+
+        Concurrent misses for the same key share a single pre-flight.
+        """
+        key = self.key(credentials)
+        cached = self._csrf_tokens.get(key)
+        if not refresh and cached is not None:
+            return cached[0]
+
+        task = self._csrf_refreshes.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh_csrf_token(credentials))
+            self._csrf_refreshes[key] = task
+        return await asyncio.shield(task)
+
+    async def _refresh_csrf_token(self, credentials) -> Optional[str]:
+        key = self.key(credentials)
+        try:
+            token = await self.fetch_csrf_token(credentials)
+            self._csrf_tokens.set(key, (token,))
+            return token
+        finally:
+            self._csrf_refreshes.pop(key, None)
+
+    def invalidate_csrf_token(self, credentials):
+        self._csrf_tokens.pop(self.key(credentials), None)
+
+    async def authenticate(self, credentials):
+        """
+        Check the user's password with POST /zosmf/services/authenticate.
+
+        Goes straight over the pooled session (no CSRF pre-flight), so the
+        connection it opens is the one the user's later calls reuse. The
+        session keeps no cookies and the LtpaToken2 z/OSMF answers with is
+        not read, so only the supplied password is checked. Raises
+        ZosmfError when z/OSMF rejects the credentials.
+        """
+        session = self.session(credentials)
+        async with session.post(
+            f"{self.base_url(credentials)}/services/authenticate",
+            headers=self.headers(credentials)
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise ZosmfError(
+                    401 if response.status in (401, 403) else response.status,
+                    f"Authentication failed ({response.status}): {error_text}"
+                )
+
+    async def system_info(self, credentials) -> Dict:
+        """
+        Return GET /zosmf/info for the credentials' host, cached for
+        ZOSMF_INFO_TTL seconds. Concurrent misses share a single fetch.
+        """
+        key = (credentials.host, str(credentials.port))
+        info = self._system_info.get(key)
+        if info is not None:
+            return info
+
+        task = self._info_fetches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_system_info(credentials))
+            self._info_fetches[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_system_info(self, credentials) -> Dict:
+        key = (credentials.host, str(credentials.port))
+        try:
+            session = self.session(credentials)
+            async with session.get(
+                f"{self.base_url(credentials)}/info",
+                headers={"Accept": "application/json", "X-CSRF-ZOSMF-HEADER": "*"}
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise ZosmfError(response.status, f"z/OSMF info request failed: {error_text}")
+                info = await response.json()
+            self._system_info.set(key, info)
+            logger.info(f"Backend: Cached z/OSMF info for {key[0]}:{key[1]}")
+            return info
+        finally:
+            self._info_fetches.pop(key, None)
+
+    def info_stats(self) -> dict:
+        return self._system_info.stats()
+
+    @asynccontextmanager
+    async def request(
+        self,
+        credentials,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ):
+        """
+        Issue a request against /zosmf/{path} over the pooled session.
+
+        Uses the cached CSRF token; a 401/403 answered to a cached token is
+        treated as a stale token and retried once with a fresh one. Yields
+        the aiohttp response; the connection goes back to the pool when the
+        block exits.
+        """
+        session = self.session(credentials)
+        url = f"{self.base_url(credentials)}/{path}"
+        key = self.key(credentials)
+
+        for attempt in range(2):
+            was_cached = attempt == 0 and self._csrf_tokens.get(key) is not None
+            csrf_token = await self.csrf_token(credentials, refresh=attempt > 0)
+            request_headers = self.headers(credentials, headers)
+            if csrf_token:
+                request_headers["X-CSRF-ZOSMF-TOKEN"] = csrf_token
+
+            response = await session.request(method, url, headers=request_headers, **kwargs)
+            if response.status in (401, 403) and was_cached:
+                logger.info(f"Backend: z/OSMF returned {response.status}, refreshing CSRF token and retrying")
+                response.release()
+                self.invalidate_csrf_token(credentials)
+                continue
+
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+
+
+zosmf_client = ZosmfClient()
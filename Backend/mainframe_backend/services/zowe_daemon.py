@@ -0,0 +1,185 @@
+from typing import Dict, Optional
+import asyncio
+import os
+import shlex
+import logging
+from ..config.settings import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ZoweDaemon:
+    """
+    Keeps a long-lived Zowe CLI daemon (`zowe --daemon`) running for the
+    backend.
+
+    With the daemon up, the native `zowe` client hands each command to the
+    already-warm Node process instead of cold-starting the CLI. A background
+    health check probes the daemon socket and respawns the daemon, with
+    backoff, when it dies or stops answering. While it is unhealthy,
+    commands fall back to the plain (cold-start) CLI via ZOWE_USE_DAEMON=no.
+    A daemon that exits or is stopped before it ever answers counts as a
+    failed start, so a crash loop backs off too.
+    """
+
+    def __init__(
+        self,
+        command: Optional[str] = None,
+        daemon_dir: Optional[str] = None,
+        health_interval: Optional[float] = None
+    ):
+        self.command = shlex.split(command or settings.ZOWE_DAEMON_COMMAND)
+        self.daemon_dir = daemon_dir or settings.ZOWE_DAEMON_DIR or os.path.join(
+            os.path.expanduser("~"), ".zowe", "daemon"
+        )
+        self.health_interval = health_interval or settings.ZOWE_DAEMON_HEALTH_INTERVAL
+        self.max_backoff = settings.ZOWE_DAEMON_MAX_BACKOFF
+        self.enabled = settings.ZOWE_DAEMON_ENABLED
+        self.healthy = False
+        self.restarts = 0
+        self._unanswered = 0
+        # Whether the current daemon was spawned here and has answered a probe yet
+        self._spawned = False
+        self._answered = False
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def socket_path(self) -> str:
+        return os.path.join(self.daemon_dir, "daemon.sock")
+
+    async def start(self):
+        """
+        Spawn the daemon and start the health check loop.
+        """
+        if not self.enabled:
+            logger.info("Backend: Zowe daemon disabled, commands use the plain CLI")
+            return
+        if self._monitor is None or self._monitor.done():
+            self._closing = False
+            self._monitor = asyncio.create_task(self._supervise())
+
+    async def close(self):
+        """
+        Stop the health check and terminate the daemon (application shutdown).
+        """
+        if self._monitor is not None:
+            # The loop also checks the flag: a cancel racing a finished
+            # asyncio.wait_for or subprocess start can be swallowed
+            self._closing = True
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        await self._stop_process()
+        self.healthy = False
+
+    def env(self) -> Dict[str, str]:
+        """
+        Environment for `zowe` client processes: routes them to the daemon
+        while it is healthy, to the plain CLI otherwise.
+        """
+        if not self.enabled:
+            return dict(os.environ)
+        return {
+            **os.environ,
+            "ZOWE_DAEMON_DIR": self.daemon_dir,
+            "ZOWE_USE_DAEMON": "yes" if self.healthy else "no"
+        }
+
+    def metrics(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "pid": self._process.pid if self._process and self._process.returncode is None else None,
+            "restarts": self.restarts
+        }
+
+    async def _supervise(self):
+        backoff = self.health_interval
+        while not self._closing:
+            if self._process is None or self._process.returncode is not None:
+                self.healthy = False
+                if self._process is not None:
+                    logger.warning(f"Backend: Zowe daemon exited with code {self._process.returncode}, respawning")
+                    self.restarts += 1
+                if self._spawned and not self._answered:
+                    # Gone before it ever answered: a failed start, like a launch error
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+                self._spawned = False
+                if not await self._spawn():
+                    # Binary missing or failed to launch: retry with backoff
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+                    continue
+
+            healthy = await self._probe()
+            if healthy != self.healthy:
+                logger.info(f"Backend: Zowe daemon is {'healthy' if healthy else 'unhealthy'}")
+            self.healthy = healthy
+            if healthy:
+                self._answered = True
+                backoff = self.health_interval
+            elif self._process.returncode is None and self._unanswered >= settings.ZOWE_DAEMON_MAX_FAILED_PROBES:
+                # Running but not answering: kill it so the next pass respawns it
+                logger.warning("Backend: Zowe daemon stopped answering, restarting it")
+                await self._stop_process()
+                self.restarts += 1
+                continue
+            await asyncio.sleep(self.health_interval)
+
+    async def _spawn(self) -> bool:
+        os.makedirs(self.daemon_dir, exist_ok=True)
+        self._unanswered = 0
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                env={**os.environ, "ZOWE_DAEMON_DIR": self.daemon_dir}
+            )
+        except OSError as e:
+            logger.error(f"Backend: Could not start Zowe daemon ({' '.join(self.command)}): {str(e)}")
+            self._process = None
+            self.healthy = False
+            return False
+        logger.info(f"Backend: Started Zowe daemon (pid {self._process.pid})")
+        self._spawned = True
+        self._answered = False
+        return True
+
+    async def _probe(self) -> bool:
+        """
+        The daemon is healthy when its process is alive and, on POSIX, its
+        socket accepts a connection.
+        """
+        if self._process is None or self._process.returncode is not None:
+            return False
+        if os.name == 'nt':
+            # Named pipe; process liveness is the best cheap signal
+            return True
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_unix_connection(self.socket_path), 2.0)
+        except (OSError, asyncio.TimeoutError):
+            self._unanswered += 1
+            return False
+        writer.close()
+        await writer.wait_closed()
+        self._unanswered = 0
+        return True
+
+    async def _stop_process(self):
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), 5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+
+zowe_daemon = ZoweDaemon()
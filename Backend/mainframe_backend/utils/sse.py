@@ -0,0 +1,28 @@
+from typing import AsyncIterator, Dict
+from fastapi.responses import StreamingResponse
+import json
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def event_stream_response(events: AsyncIterator[Dict]) -> StreamingResponse:
+    """
+    Send generation events as server-sent events (`event: token|file|done`);
+    a failure mid-stream becomes a final `event: error`.
+    """
+    async def stream():
+        try:
+            async for event in events:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming generation: {str(e)}", exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
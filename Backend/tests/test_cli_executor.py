@@ -0,0 +1,44 @@
+import asyncio
+import sys
+import pytest
+from mainframe_backend.routers.auth import powershell_command
+from mainframe_backend.services.cli_executor import CLIExecutor, CLITimeoutError
+
+
+def test_arguments_reach_the_process_unchanged():
+    executor = CLIExecutor(max_concurrency=2, timeout=10)
+    argument = "pa ss;$HOME`'\"x"
+    result = asyncio.run(executor.run([sys.executable, "-c", "import sys; print(sys.argv[1])", argument]))
+    assert result.returncode == 0
+    assert result.stdout.strip() == argument
+    assert executor.metrics()["completed"] == 1
+
+
+def test_command_is_killed_after_its_timeout():
+    executor = CLIExecutor(max_concurrency=1, timeout=10)
+    with pytest.raises(CLITimeoutError):
+        asyncio.run(executor.run([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2))
+    assert executor.metrics()["timed_out"] == 1
+    assert executor.metrics()["running"] == 0
+
+
+def test_commands_beyond_the_limit_wait_their_turn():
+    executor = CLIExecutor(max_concurrency=1, timeout=10)
+    sleep = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+
+    async def run():
+        first = asyncio.create_task(executor.run(sleep))
+        second = asyncio.create_task(executor.run(sleep))
+        await asyncio.sleep(0.1)
+        assert executor.metrics()["running"] == 1
+        assert executor.metrics()["queued"] == 1
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+    assert executor.metrics()["completed"] == 2
+
+
+def test_powershell_wrapper_quotes_every_argument():
+    assert powershell_command(["zowe", "--password", "a b;$x`'y"]) == [
+        "powershell", "-Command", "& 'zowe' '--password' 'a b;$x`''y'"
+    ]
@@ -0,0 +1,58 @@
+import pytest
+from mainframe_backend.services.context_builder import (
+    SYSOUT_ALERTS, Attachment, ContextBuilder, count_tokens, message_tokens, trim_text
+)
+
+
+def job_log(lines: int, error_at: int = None) -> str:
+    return "\n".join(
+        "IEF450I HELLO STEP1 - ABEND=S0C7 U0000" if index == error_at else f"STEP{index:05} RECORD {index} OF THE JOB LOG"
+        for index in range(lines)
+    )
+
+
+def test_trimmed_sysout_keeps_head_tail_and_error_lines():
+    text = job_log(2000, error_at=1000)
+    trimmed = trim_text(text, 300, SYSOUT_ALERTS)
+    lines = trimmed.split("\n")
+    assert count_tokens(trimmed) <= 300
+    assert lines[0] == "STEP00000 RECORD 0 OF THE JOB LOG"
+    assert lines[-1] == "STEP01999 RECORD 1999 OF THE JOB LOG"
+    assert "IEF450I HELLO STEP1 - ABEND=S0C7 U0000" in lines
+    assert any(line.startswith("... [") and line.endswith("lines omitted] ...") for line in lines)
+
+
+def test_text_within_budget_is_untouched():
+    assert trim_text("//HELLO JOB\n//STEP1 EXEC PGM=IEFBR14", 100) == "//HELLO JOB\n//STEP1 EXEC PGM=IEFBR14"
+
+
+def test_attachments_are_packed_into_the_window():
+    builder = ContextBuilder(window=2000, max_output=1000, min_output=500)
+    small = Attachment("HELLO.JCL", "//HELLO JOB\n//STEP1 EXEC PGM=IEFBR14", "member")
+    large = Attachment("HELLO JESMSGLG", job_log(3000, error_at=2000), "sysout")
+    packed = builder.build("You are a z/OS assistant.", "Why did HELLO.JCL fail?", [large, small])
+
+    user_message = packed.messages[1]["content"]
+    # Mentioned in the prompt: packed first, and whole
+    assert user_message.startswith("--- member HELLO.JCL ---\n//HELLO JOB\n//STEP1 EXEC PGM=IEFBR14\n")
+    assert packed.trimmed == ["HELLO JESMSGLG"]
+    assert "ABEND=S0C7" in user_message
+    assert user_message.endswith("Why did HELLO.JCL fail?")
+    assert packed.prompt_tokens == message_tokens(packed.messages)
+    assert packed.prompt_tokens + packed.max_tokens <= 2000
+    assert packed.max_tokens >= 500
+
+
+def test_attachments_without_room_are_left_out():
+    builder = ContextBuilder(window=1200, max_output=600, min_output=600)
+    attachments = [Attachment(f"LOG{index}", job_log(500), "sysout") for index in range(6)]
+    packed = builder.build("sys", "Summarize the logs", attachments)
+    assert packed.dropped
+    assert packed.dropped == [attachment.name for attachment in attachments][-len(packed.dropped):]
+    assert "LOG5 left out: too large for the context window" in packed.messages[1]["content"]
+    assert packed.prompt_tokens + packed.max_tokens <= 1200
+
+
+def test_prompt_larger_than_the_window_is_rejected():
+    with pytest.raises(ValueError):
+        ContextBuilder(window=1000, max_output=500, min_output=500).build("sys", "word " * 1000)
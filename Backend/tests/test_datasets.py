@@ -0,0 +1,189 @@
+import asyncio
+import json
+import pytest
+from aiohttp import web
+from fastapi import HTTPException
+from mainframe_backend.routers import datasets
+from tests.zosmf_stub import REQUESTS, credentials, make_client, make_server
+
+
+def run_against_stub(monkeypatch, scenario, answer=None):
+    """
+    Run `scenario(server)` with the datasets router talking to a z/OSMF stub.
+    """
+    async def run():
+        server = make_server(answer)
+        await server.start_server()
+        client = make_client(server)
+        monkeypatch.setattr(datasets, "zosmf_client", client)
+        try:
+            return await scenario(server)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_make_zowe_request_forwards_headers(monkeypatch):
+    async def scenario(server):
+        await datasets.make_zowe_request(
+            credentials(),
+            "ds?dslevel=IBMUSER.*",
+            headers={"Accept": "text/plain", "X-IBM-Max-Items": "11"}
+        )
+        request, _ = server.app[REQUESTS][-1]
+        assert request.headers["Accept"] == "text/plain"
+        assert request.headers["X-IBM-Max-Items"] == "11"
+
+    run_against_stub(monkeypatch, scenario)
+
+
+def test_member_put_is_sent_as_plain_text(monkeypatch):
+    async def scenario(server):
+        await datasets.make_zowe_request(
+            credentials(),
+            "ds/IBMUSER.JCL(JOB1)",
+            method="PUT",
+            headers={"Content-Type": "text/plain"},
+            data="//JOB1 JOB"
+        )
+        request, body = server.app[REQUESTS][-1]
+        assert request.method == "PUT"
+        assert request.headers["Content-Type"].startswith("text/plain")
+        assert body == "//JOB1 JOB"
+
+    run_against_stub(monkeypatch, scenario)
+
+
+def test_fetch_page_asks_for_one_item_more_than_the_limit(monkeypatch):
+    answer = {"items": [{"dsname": f"IBMUSER.DS{index}"} for index in range(3)]}
+
+    async def scenario(server):
+        items, next_start = await datasets.fetch_page(credentials(), "ds?dslevel=IBMUSER.*", 'dsname', limit=2)
+        request, _ = server.app[REQUESTS][-1]
+        assert request.headers["X-IBM-Max-Items"] == "3"
+        assert [item['dsname'] for item in items] == ["IBMUSER.DS0", "IBMUSER.DS1"]
+        assert next_start == "IBMUSER.DS2"
+
+    run_against_stub(monkeypatch, scenario, answer)
+
+
+def test_listing_warms_the_attribute_cache(monkeypatch):
+    answer = {"items": [
+        {"dsname": "IBMUSER.JCL", "dsorg": "PO", "recfm": "FB", "lrecl": "80", "blksz": "27920", "vol": "VOL001", "dev": "3390"},
+        {"dsname": "IBMUSER.MIGRATED", "vol": "MIGRAT"}
+    ]}
+
+    async def scenario(server):
+        datasets.dataset_attributes.invalidate(lambda key: True)
+        await datasets.list_pattern(credentials(), "IBMUSER.*", asyncio.Semaphore(1))
+        request, _ = server.app[REQUESTS][-1]
+        assert request.headers["X-IBM-Attributes"] == "base"
+
+        attributes = datasets.dataset_attributes.get(datasets.attribute_key(credentials(), "IBMUSER.JCL"))
+        assert attributes["dsorg"] == "PO"
+        assert attributes["blksz"] == "27920"
+        assert attributes["dev"] == "3390"
+        # No dsorg: nothing worth caching
+        assert datasets.dataset_attributes.get(datasets.attribute_key(credentials(), "IBMUSER.MIGRATED")) is None
+
+        # Served from the cache, without another z/OSMF call
+        calls = len(server.app[REQUESTS])
+        assert (await datasets.get_dataset_attributes(credentials(), "ibmuser.jcl"))["recfm"] == "FB"
+        assert len(server.app[REQUESTS]) == calls
+
+    run_against_stub(monkeypatch, scenario, answer)
+
+
+async def read_stream(response) -> list:
+    lines = []
+    async for chunk in response.body_iterator:
+        lines.extend(json.loads(line) for line in chunk.splitlines() if line.strip())
+    return lines
+
+
+def test_stream_lists_datasets_then_a_summary(monkeypatch):
+    answer = {"items": [{"dsname": "IBMUSER.JCL", "dsorg": "PO"}, {"dsname": "IBMUSER.LOAD", "dsorg": "PO"}]}
+
+    async def scenario(server):
+        response = await datasets.stream_datasets(credentials(), ["IBMUSER.*"], current_user="IBMUSER")
+        lines = await read_stream(response)
+        assert [line["name"] for line in lines[:-1]] == ["IBMUSER.JCL", "IBMUSER.LOAD"]
+        assert lines[-1]["type"] == "summary"
+        assert lines[-1]["patterns"][0]["count"] == 2
+
+    run_against_stub(monkeypatch, scenario, answer)
+
+
+def test_stream_fails_with_502_when_every_pattern_fails(monkeypatch):
+    async def scenario(server):
+        with pytest.raises(HTTPException) as failure:
+            await datasets.stream_datasets(credentials("wrong"), ["IBMUSER.*", "PUBLIC.*"], current_user="IBMUSER")
+        assert failure.value.status_code == 502
+
+    run_against_stub(monkeypatch, scenario)
+
+
+def listing_by_pattern(listings: dict):
+    """A stub answer listing `listings[dslevel]`, or failing with 500 for unknown patterns."""
+    def answer(request):
+        items = listings.get(request.query.get("dslevel"))
+        if items is None:
+            return web.Response(status=500, text="catalog error")
+        return {"items": [{"dsname": name, "dsorg": "PS"} for name in items]}
+    return answer
+
+
+def test_patterns_are_merged_in_order_and_failures_reported(monkeypatch):
+    answer = listing_by_pattern({
+        "IBMUSER.*": ["IBMUSER.A", "SYS1.SHARED"],
+        "SYS1.*": ["SYS1.SHARED", "SYS1.B"]
+    })
+
+    async def scenario(server):
+        result = await datasets.get_datasets(
+            credentials(), ["ibmuser.*", "SYS1.*", "BAD.*"], limit=None, cursor=None, current_user="IBMUSER"
+        )
+        assert [(d.name, d.isPublic) for d in result.datasets] == [
+            ("IBMUSER.A", False), ("SYS1.SHARED", True), ("SYS1.B", True)
+        ]
+        assert [(p.pattern, p.count, p.error is not None) for p in result.patterns] == [
+            ("IBMUSER.*", 2, False), ("SYS1.*", 2, False), ("BAD.*", 0, True)
+        ]
+
+    run_against_stub(monkeypatch, scenario, answer)
+
+
+def test_all_patterns_failing_is_a_502(monkeypatch):
+    async def scenario(server):
+        with pytest.raises(HTTPException) as failure:
+            await datasets.get_datasets(credentials(), ["BAD.*"], limit=None, cursor=None, current_user="IBMUSER")
+        assert failure.value.status_code == 502
+
+    run_against_stub(monkeypatch, scenario, listing_by_pattern({}))
+
+
+def test_unchanged_member_is_revalidated_with_its_etag(monkeypatch):
+    def answer(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text="//JOB1 JOB", headers={"ETag": '"v1"'})
+
+    async def scenario(server):
+        datasets.member_contents.clear()
+        assert await datasets.fetch_member_text(credentials(), "IBMUSER.JCL", "JOB1") == "//JOB1 JOB"
+        first, _ = server.app[REQUESTS][-1]
+        assert "If-None-Match" not in first.headers
+
+        assert await datasets.fetch_member_text(credentials(), "IBMUSER.JCL", "JOB1") == "//JOB1 JOB"
+        second, _ = server.app[REQUESTS][-1]
+        assert second.headers["If-None-Match"] == '"v1"'
+
+        # A write drops the cached copy, so the next read downloads it again
+        datasets.invalidate_member_content(credentials(), "IBMUSER.JCL", "JOB1")
+        await datasets.fetch_member_text(credentials(), "IBMUSER.JCL", "JOB1")
+        third, _ = server.app[REQUESTS][-1]
+        assert "If-None-Match" not in third.headers
+
+    run_against_stub(monkeypatch, scenario, answer)
@@ -0,0 +1,80 @@
+import asyncio
+from mainframe_backend.services import groq_service as groq_module, zos_inventory
+from mainframe_backend.services.groq_service import GroqService
+from mainframe_backend.services.zosmf_client import ZosmfError
+from tests.zosmf_stub import credentials, make_client, make_server
+
+
+def counting_analyses(monkeypatch, service: GroqService) -> list:
+    """Replace the LLM call with numbered analyses; returns the digests it was called with."""
+    analyzed = []
+
+    async def analyze(digest, priority):
+        analyzed.append(digest)
+        await asyncio.sleep(0.01)
+        return {"analysis": f"analysis {len(analyzed)}", "recommendations": []}
+
+    monkeypatch.setattr(service, "_analyze_zos_structure", analyze)
+    return analyzed
+
+
+def run_against_stub(monkeypatch, scenario):
+    async def run():
+        server = make_server()
+        await server.start_server()
+        client = make_client(server)
+        monkeypatch.setattr(groq_module, "zosmf_client", client)
+        monkeypatch.setattr(zos_inventory, "zosmf_client", client)
+        try:
+            return await scenario()
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_cached_analysis_needs_the_right_password_and_app_user(monkeypatch):
+    service = GroqService()
+    analyzed = counting_analyses(monkeypatch, service)
+
+    async def scenario():
+        first = await service.analyze_zos_structure(credentials(), current_user="alice")
+        assert await service.analyze_zos_structure(credentials(), current_user="alice") == first
+        assert len(analyzed) == 1
+
+        try:
+            await service.analyze_zos_structure(credentials("wrong"), current_user="alice")
+        except ZosmfError as e:
+            assert e.status == 401
+        else:
+            raise AssertionError("a cached analysis was served for a wrong password")
+
+        other = await service.analyze_zos_structure(credentials(), current_user="bob")
+        assert other != first
+
+    run_against_stub(monkeypatch, scenario)
+
+
+def test_stale_analysis_is_served_while_it_refreshes(monkeypatch):
+    monkeypatch.setattr(groq_module.settings, "AI_ANALYSIS_REFRESH_INTERVAL", 0.05)
+    service = GroqService()
+    analyzed = counting_analyses(monkeypatch, service)
+
+    async def scenario():
+        # Concurrent first calls share one computation
+        first, second = await asyncio.gather(
+            service.analyze_zos_structure(credentials(), current_user="alice"),
+            service.analyze_zos_structure(credentials(), current_user="alice")
+        )
+        assert first == second == {"analysis": "analysis 1", "recommendations": []}
+
+        await asyncio.sleep(0.06)
+        # Stale: answered from the cache at once, refreshed in the background
+        assert (await service.analyze_zos_structure(credentials(), current_user="alice"))["analysis"] == "analysis 1"
+        assert len(service._analysis_refreshes) == 1
+        await asyncio.gather(*service._analysis_refreshes.values())
+        assert (await service.analyze_zos_structure(credentials(), current_user="alice"))["analysis"] == "analysis 2"
+        assert len(analyzed) == 2
+
+    run_against_stub(monkeypatch, scenario)
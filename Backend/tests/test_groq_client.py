@@ -0,0 +1,55 @@
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from mainframe_backend.services import groq_service as groq_service_module
+from mainframe_backend.services.groq_service import GroqService
+
+
+def completion_server(peers: list) -> TestServer:
+    """A stand-in for the chat completions endpoint recording each request's client address."""
+    async def complete(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"choices": [{"message": {"content": "ok"}}], "usage": {"total_tokens": 10}})
+
+    app = web.Application()
+    app.add_routes([web.post("/chat", complete)])
+    return TestServer(app, host="localhost")
+
+
+def test_completions_share_one_keep_alive_connection(monkeypatch):
+    monkeypatch.setattr(groq_service_module.settings, "GROQ_HTTP2", False)
+    peers = []
+
+    async def run():
+        server = completion_server(peers)
+        await server.start_server()
+        service = GroqService()
+        service.url = str(server.make_url("/chat"))
+        service.api_key = "test-key"
+        try:
+            client = service.client
+            for _ in range(3):
+                await service._complete({"messages": [{"role": "user", "content": "hi"}], "max_tokens": 10})
+            assert service.client is client
+        finally:
+            await service.close()
+            await server.close()
+        assert client.is_closed
+        assert service._client is None
+
+    asyncio.run(run())
+    assert len(peers) == 3
+    assert len(set(peers)) == 1
+
+
+def test_missing_h2_falls_back_to_http1(monkeypatch):
+    monkeypatch.setattr(groq_service_module.settings, "GROQ_HTTP2", True)
+    monkeypatch.setattr(groq_service_module, "HTTP2_AVAILABLE", False)
+    service = GroqService()
+
+    async def run():
+        service.client
+        await service.close()
+
+    asyncio.run(run())
+    assert service.http2 is False
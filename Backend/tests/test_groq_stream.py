@@ -0,0 +1,93 @@
+import asyncio
+import json
+import httpx
+from mainframe_backend.services.groq_service import GroqService
+from mainframe_backend.services.llm_scheduler import LLMScheduler
+from mainframe_backend.services.rate_limiter import TokenBucketLimiter
+
+
+def sse_body(deltas: list) -> list:
+    """The API's stream for `deltas`, cut into chunks that split events mid-line."""
+    events = "".join(
+        f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n\n" for delta in deltas
+    ) + ": keep-alive\n\ndata: [DONE]\n\n"
+    raw = events.encode()
+    return [raw[index:index + 7] for index in range(0, len(raw), 7)]
+
+
+def streaming_service(handler) -> GroqService:
+    service = GroqService()
+    service.limiter = TokenBucketLimiter(rpm=0, tpm=60000)
+    service.scheduler = LLMScheduler(service.limiter)
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def collect(service: GroqService, prompt: str, **kwargs) -> list:
+    async def run():
+        try:
+            return [event async for event in service.stream_code(prompt, **kwargs)]
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def test_stream_yields_tokens_files_and_a_final_result():
+    deltas = ["Here is the job:\n", "```jcl\n//JOB1 JOB\n", "//STEP1 EXEC PGM=IEFBR14\n", "```\n", "Done."]
+    sent = []
+
+    async def chunks():
+        for chunk in sse_body(deltas):
+            yield chunk
+
+    def handler(request):
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, content=chunks())
+
+    service = streaming_service(handler)
+    events = collect(service, "Write a JCL job")
+
+    assert sent[0]["stream"] is True
+    assert "".join(event["content"] for event in events if event["type"] == "token") == "".join(deltas)
+    files = [event["file"] for event in events if event["type"] == "file"]
+    assert len(files) == 1 and files[0]["content"].startswith("//JOB1 JOB")
+    # The file is sent as soon as its closing fence arrives, before the last token
+    file_index = next(index for index, event in enumerate(events) if event["type"] == "file")
+    assert events[file_index + 1:][0] == {"type": "token", "content": "Done."}
+    assert events[-1]["type"] == "done"
+    assert events[-1]["files"] == files
+
+
+def test_streamed_answer_is_cached_and_replayed():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, content=b"".join(sse_body(["Use ", "IEFBR14."])))
+
+    service = streaming_service(handler)
+
+    async def run():
+        try:
+            first = [event async for event in service.stream_code("What is a no-op program?")]
+            replay = [event async for event in service.stream_code("what is a  no-op program?")]
+            return first, replay
+        finally:
+            await service.close()
+
+    first, replay = asyncio.run(run())
+    assert len(calls) == 1
+    assert replay[0] == {"type": "token", "content": "Use IEFBR14."}
+    assert replay[-1] == first[-1]
+
+
+def test_stream_error_is_raised_and_its_reservation_returned():
+    service = streaming_service(lambda request: httpx.Response(400, text="model not found"))
+    try:
+        collect(service, "hello", use_cache=False)
+    except Exception as e:
+        assert "model not found" in str(e)
+    else:
+        raise AssertionError("a 400 was streamed as an answer")
+    assert service.limiter.stats()["tokens_available"] == 60000
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from mainframe_backend.services import job_waiter as job_waiter_module
+from mainframe_backend.services.job_waiter import JobWaiter
+from tests.zosmf_stub import REQUESTS, credentials, make_client, make_server
+
+
+def run_against_stub(monkeypatch, scenario, answer):
+    async def run():
+        server = make_server(answer)
+        await server.start_server()
+        client = make_client(server)
+        monkeypatch.setattr(job_waiter_module, "zosmf_client", client)
+        try:
+            return await scenario(server)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def statuses(*sequence):
+    """A stub answer walking through `sequence`, then repeating its last status."""
+    remaining = list(sequence)
+
+    def answer(request):
+        status = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        return {"jobname": "HELLO", "jobid": "JOB00042", "status": status, "retcode": "CC 0000" if status == "OUTPUT" else None}
+    return answer
+
+
+def test_concurrent_waits_share_one_poll_loop(monkeypatch):
+    waiter = JobWaiter(initial_delay=0.01, max_delay=0.02, timeout=5)
+
+    async def scenario(server):
+        seen = []
+        results = await asyncio.gather(
+            waiter.wait(credentials(), "HELLO", "JOB00042", on_status=lambda status: seen.append(status["status"])),
+            waiter.wait(credentials(), "HELLO", "JOB00042")
+        )
+        assert [result["retcode"] for result in results] == ["CC 0000", "CC 0000"]
+        # One status call per poll, not one per waiter
+        assert len(server.app[REQUESTS]) == 3
+        assert seen == ["INPUT", "ACTIVE", "OUTPUT"]
+        assert waiter.in_flight() == 0
+
+    run_against_stub(monkeypatch, scenario, statuses("INPUT", "ACTIVE", "OUTPUT"))
+
+
+def test_timeout_cancels_the_poll_once_no_one_waits(monkeypatch):
+    waiter = JobWaiter(initial_delay=0.01, max_delay=0.01, timeout=5)
+
+    async def scenario(server):
+        with pytest.raises(asyncio.TimeoutError):
+            await waiter.wait(credentials(), "HELLO", "JOB00042", timeout=0.05)
+        # The cancelled poll unwinds on the next loop iterations
+        await asyncio.sleep(0.01)
+        assert waiter.in_flight() == 0
+        polls = len(server.app[REQUESTS])
+        await asyncio.sleep(0.05)
+        assert len(server.app[REQUESTS]) == polls
+
+    run_against_stub(monkeypatch, scenario, statuses("ACTIVE"))
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import pytest
+from aiohttp import web
+from fastapi import HTTPException
+from mainframe_backend.auth.jwt import create_access_token
+from mainframe_backend.routers import jobs
+from mainframe_backend.services import spool
+from mainframe_backend.services.job_tracker import JobTracker
+from tests.zosmf_stub import REQUESTS, credentials, make_client, make_server
+
+
+def job_state(status: str, owner: str = "alice") -> dict:
+    return {"job_id": "JOB00042", "job_name": "HELLO", "owner": owner, "status": status, "return_code": None}
+
+
+def test_event_stream_takes_its_token_from_the_query_string():
+    assert jobs.event_stream_user(create_access_token({"sub": "alice"})) == "alice"
+    with pytest.raises(HTTPException) as failure:
+        jobs.event_stream_user("not-a-token")
+    assert failure.value.status_code == 401
+
+
+def test_event_stream_sends_current_state_then_changes(monkeypatch):
+    tracker = JobTracker()
+    monkeypatch.setattr(jobs, "job_tracker", tracker)
+
+    async def run():
+        tracker._publish(job_state("INPUT"))
+        tracker._publish(job_state("ACTIVE", owner="bob") | {"job_id": "JOB00043"})
+        response = await jobs.job_events(current_user="alice")
+        events = response.body_iterator
+        first = await events.__anext__()
+        assert first.startswith("event: job\n")
+        assert json.loads(first.split("data: ", 1)[1])["status"] == "INPUT"
+
+        tracker._publish(job_state("OUTPUT") | {"return_code": "CC 0000"})
+        second = json.loads((await events.__anext__()).split("data: ", 1)[1])
+        assert (second["status"], second["return_code"]) == ("OUTPUT", "CC 0000")
+
+        await events.aclose()
+        assert tracker._subscribers == {}
+
+    asyncio.run(run())
+
+
+class SpoolJob:
+    """
+    A stub z/OSMF job: its status, its spool files (id -> item) and their
+    records, served whole or by X-IBM-Record-Range.
+    """
+
+    def __init__(self, files: dict, records: dict, status: str = "OUTPUT", delay: float = 0):
+        self.files = files
+        self.records = records
+        self.status = status
+        self.delay = delay
+        self.reading = 0
+        self.max_reading = 0
+
+    async def __call__(self, request):
+        parts = request.path.split("/")
+        if parts[-1] == "files":
+            return [{"id": file_id, **item, "record-count": len(self.records.get(file_id, []))} for file_id, item in self.files.items()]
+        if parts[-1] != "records":
+            return {"jobname": "HELLO", "jobid": "JOB00042", "status": self.status, "retcode": "CC 0000"}
+        records = self.records[int(parts[-2])]
+        if "X-IBM-Record-Range" in request.headers:
+            start, count = (int(part) for part in request.headers["X-IBM-Record-Range"].split(","))
+            records = records[start:start + count]
+        self.reading += 1
+        self.max_reading = max(self.max_reading, self.reading)
+        await asyncio.sleep(self.delay)
+        self.reading -= 1
+        return web.Response(text="".join(record + "\n" for record in records))
+
+
+def run_against_stub(monkeypatch, scenario, answer):
+    async def run():
+        server = make_server(answer)
+        await server.start_server()
+        client = make_client(server)
+        monkeypatch.setattr(jobs, "zosmf_client", client)
+        monkeypatch.setattr(spool, "zosmf_client", client)
+        try:
+            return await scenario(server)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_job_output_reads_spool_files_concurrently(monkeypatch):
+    job = SpoolJob(
+        files={
+            2: {"ddname": "JESMSGLG", "stepname": "JES2", "byte-count": 20},
+            102: {"ddname": "SYSPRINT", "stepname": "STEP1", "byte-count": 10},
+            103: {"ddname": "SYSPRINT", "stepname": "STEP2", "byte-count": 10},
+            104: {"ddname": "SYSUT2", "stepname": "STEP2", "byte-count": 10 ** 9}
+        },
+        records={2: ["JOB00042 STARTED", "JOB00042 ENDED"], 102: ["STEP1 OUT"], 103: ["STEP2 OUT"], 104: []},
+        delay=0.02
+    )
+
+    async def scenario(server):
+        result = await jobs.get_job_output(
+            "JOB00042", credentials(), job_name="HELLO", ddnames=["*"], current_user="IBMUSER"
+        )
+        assert job.max_reading == 3
+        assert sorted(result["files"]) == ["JESMSGLG", "STEP1.SYSPRINT", "STEP2.SYSPRINT", "SYSUT2"]
+        assert result["files"]["STEP2.SYSPRINT"]["content"] == "STEP2 OUT\n"
+        assert result["output"] == "JOB00042 STARTED\nJOB00042 ENDED\n"
+        # Too large to inline: left for the records route
+        assert result["files"]["SYSUT2"]["truncated"]
+        assert result["files"]["SYSUT2"]["stream_url"] == "/api/jobs/JOB00042/files/104/records?job_name=HELLO"
+
+    run_against_stub(monkeypatch, scenario, job)
+
+
+def requested_ranges(server) -> list:
+    return [request.headers["X-IBM-Record-Range"] for request, _ in server.app[REQUESTS] if "X-IBM-Record-Range" in request.headers]
+
+
+def test_spool_file_is_streamed_a_window_at_a_time(monkeypatch):
+    monkeypatch.setattr(jobs.settings, "SPOOL_RANGE_RECORDS", 2)
+    job = SpoolJob(files={102: {"ddname": "SYSPRINT"}}, records={102: [f"LINE {n}" for n in range(5)]})
+
+    async def scenario(server):
+        response = await jobs.stream_spool_file(
+            "JOB00042", "102", credentials(), job_name="HELLO", start=0, count=None, tail=None, current_user="IBMUSER"
+        )
+        chunks = [chunk async for chunk in response.body_iterator]
+        assert chunks == ["LINE 0\nLINE 1\n", "LINE 2\nLINE 3\n", "LINE 4\n"]
+        assert requested_ranges(server) == ["0,2", "2,2", "4,2"]
+
+    run_against_stub(monkeypatch, scenario, job)
+
+
+def test_spool_tail_reads_only_the_last_records(monkeypatch):
+    monkeypatch.setattr(jobs.settings, "SPOOL_RANGE_RECORDS", 2)
+    job = SpoolJob(files={102: {"ddname": "SYSPRINT"}}, records={102: [f"LINE {n}" for n in range(5)]})
+
+    async def scenario(server):
+        response = await jobs.stream_spool_file(
+            "JOB00042", "102", credentials(), job_name="HELLO", start=0, count=None, tail=3, current_user="IBMUSER"
+        )
+        assert "".join([chunk async for chunk in response.body_iterator]) == "LINE 2\nLINE 3\nLINE 4\n"
+        assert requested_ranges(server) == ["2,2", "4,1"]
+
+    run_against_stub(monkeypatch, scenario, job)
+
+
+def test_spool_excerpt_keeps_the_head_and_tail_of_a_long_file(monkeypatch):
+    job = SpoolJob(files={102: {"ddname": "SYSPRINT"}}, records={102: [f"LINE {n}" for n in range(10)]})
+
+    async def scenario(server):
+        item = {"id": 102, "record-count": 10}
+        excerpt = await spool.read_spool_excerpt(credentials(), "jobs/HELLO/JOB00042", item, max_records=4)
+        assert excerpt == "LINE 0\nLINE 1\n... [6 records omitted] ...\nLINE 8\nLINE 9\n"
+
+    run_against_stub(monkeypatch, scenario, job)
+
+
+class FakeWebSocket:
+    """The parts of a WebSocket the tail route uses; `on_send` runs after every message."""
+
+    def __init__(self, request: dict, on_send=lambda message: None):
+        self.request = request
+        self.on_send = on_send
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def receive_json(self):
+        return self.request
+
+    async def send_json(self, message):
+        self.sent.append(message)
+        self.on_send(message)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+def test_tail_sends_only_new_records_until_the_job_ends(monkeypatch):
+    monkeypatch.setattr(jobs.settings, "JOB_TAIL_MIN_INTERVAL", 0.01)
+    job = SpoolJob(files={102: {"ddname": "SYSPRINT"}}, records={102: ["LINE 0", "LINE 1"]}, status="ACTIVE")
+
+    def job_writes_more(message):
+        if message["type"] == "records" and message["start"] == 0:
+            job.records[102].append("LINE 2")
+            job.status = "OUTPUT"
+
+    async def scenario(server):
+        websocket = FakeWebSocket({
+            "token": create_access_token({"sub": "IBMUSER"}),
+            "credentials": credentials().model_dump(),
+            "job_name": "HELLO"
+        }, job_writes_more)
+        await jobs.tail_job_output(websocket, "JOB00042")
+        assert websocket.sent == [
+            {"type": "records", "ddname": "SYSPRINT", "id": 102, "start": 0, "text": "LINE 0\nLINE 1\n"},
+            {"type": "records", "ddname": "SYSPRINT", "id": 102, "start": 2, "text": "LINE 2\n"},
+            {"type": "complete", "return_code": "CC 0000"}
+        ]
+        assert websocket.close_code == 1000
+
+    run_against_stub(monkeypatch, scenario, job)
+
+
+def test_tail_rejects_a_bad_token():
+    websocket = FakeWebSocket({"token": "not-a-token"})
+    asyncio.run(jobs.tail_job_output(websocket, "JOB00042"))
+    assert websocket.sent == [{"type": "error", "detail": "Could not validate credentials"}]
+    assert websocket.close_code == 1008
@@ -0,0 +1,84 @@
+import asyncio
+import httpx
+from mainframe_backend.services.groq_service import GroqService
+from mainframe_backend.services.llm_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, LLMScheduler
+from mainframe_backend.services.rate_limiter import TokenBucketLimiter
+
+
+def scripted(*responses):
+    """A `send` returning the given responses in turn."""
+    remaining = list(responses)
+
+    async def send():
+        return remaining.pop(0)
+
+    return send
+
+
+def test_retried_attempts_give_back_their_reservation():
+    limiter = TokenBucketLimiter(rpm=0, tpm=6000)
+    scheduler = LLMScheduler(limiter, max_concurrency=2)
+    send = scripted(httpx.Response(429, headers={"retry-after": "0.01"}), httpx.Response(200))
+
+    async def run():
+        async with scheduler.request(send, tokens=3000) as (response, reserved):
+            assert response.status_code == 200
+            limiter.settle(reserved, 1000)
+
+    asyncio.run(run())
+    assert limiter.stats()["tokens_available"] == 5000
+
+
+def test_interactive_call_overtakes_queued_background_calls():
+    limiter = TokenBucketLimiter(rpm=0, tpm=60000)
+    scheduler = LLMScheduler(limiter, max_concurrency=8)
+    sent = []
+
+    def recording(name):
+        async def send():
+            sent.append(name)
+            return httpx.Response(200)
+        return send
+
+    async def call(name, priority, tokens, hold=None):
+        async with scheduler.request(recording(name), priority, tokens) as (response, reserved):
+            if hold is not None:
+                await hold.wait()
+            limiter.settle(reserved, reserved)
+
+    async def run():
+        # The first call takes the whole bucket; everything after it has to wait
+        hold = asyncio.Event()
+        first = asyncio.create_task(call("background-0", PRIORITY_BACKGROUND, 60000, hold))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(call(f"background-{index}", PRIORITY_BACKGROUND, 100)) for index in range(1, 4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("interactive", PRIORITY_INTERACTIVE, 100)))
+        await asyncio.sleep(0)
+        hold.set()
+        await asyncio.gather(first, *tasks)
+
+    asyncio.run(run())
+    assert sent[:2] == ["background-0", "interactive"]
+
+
+def test_failed_completion_is_settled():
+    service = GroqService()
+    service.limiter = TokenBucketLimiter(rpm=0, tpm=6000)
+    service.scheduler = LLMScheduler(service.limiter)
+    service._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(400, text="bad request"))
+    )
+    request_data = {"messages": [{"role": "user", "content": "hello"}], "max_tokens": 2000}
+
+    async def run():
+        try:
+            await service._complete(request_data)
+        except Exception as e:
+            assert "bad request" in str(e)
+        else:
+            raise AssertionError("a 400 was treated as a completion")
+        await service._client.aclose()
+
+    asyncio.run(run())
+    assert service.limiter.stats()["tokens_available"] == 6000
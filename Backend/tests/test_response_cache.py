@@ -0,0 +1,57 @@
+import asyncio
+from mainframe_backend.services.context_builder import Attachment
+from mainframe_backend.services.groq_service import GroqService
+from mainframe_backend.services.response_cache import ResponseCache
+
+
+def test_prompts_differing_in_case_and_spacing_share_a_key():
+    assert ResponseCache.key("m", "chat", "sys", "Write  a JCL job") == ResponseCache.key("m", "chat", "sys", "write a jcl JOB")
+
+
+def test_attachments_are_keyed_exactly():
+    service = GroqService()
+
+    def key(prompt: str, content: str) -> str:
+        request_data = service._generation_request(prompt, "chat", [Attachment("JOB1", content, "member")])
+        return service._cache_key(request_data, "chat", prompt)
+
+    assert key("Explain JOB1", "//STEP1 DD DSN=PROD.X") == key("explain  job1", "//STEP1 DD DSN=PROD.X")
+    assert key("Explain JOB1", "//STEP1 DD DSN=PROD.X") != key("Explain JOB1", "//step1 dd dsn=prod.x")
+
+
+def test_answers_survive_a_restart_through_sqlite(tmp_path):
+    db_path = str(tmp_path / "ai_cache.db")
+
+    async def run():
+        cache = ResponseCache(db_path=db_path)
+        await cache.open()
+        await cache.set("fresh", {"response": "kept"}, ttl=60)
+        await cache.set("stale", {"response": "gone"}, ttl=0.01)
+        await cache.close()
+        await asyncio.sleep(0.02)
+
+        # A new process: empty memory, same database
+        restarted = ResponseCache(db_path=db_path)
+        await restarted.open()
+        try:
+            assert await restarted.get("fresh") == {"response": "kept"}
+            assert await restarted.get("stale") is None
+            assert restarted.stats()["disk_hits"] == 1
+            # The disk hit is now in memory
+            assert await restarted.get("fresh") == {"response": "kept"}
+            assert restarted.stats()["disk_hits"] == 1
+        finally:
+            await restarted.close()
+
+    asyncio.run(run())
+
+
+def test_without_a_database_the_cache_is_memory_only():
+    async def run():
+        cache = ResponseCache(db_path="")
+        await cache.open()
+        await cache.set("key", {"response": "value"}, ttl=60)
+        assert await cache.get("key") == {"response": "value"}
+        assert cache.stats()["persistent"] is False
+
+    asyncio.run(run())
@@ -0,0 +1,51 @@
+from mainframe_backend.services.response_parser import ResponseParser, parse_response
+
+ANSWER = """Create the job below.
+
+````HELLO.jcl
+//HELLO JOB
+//* a fence inside the file:
+```
+//STEP1 EXEC PGM=IEFBR14
+````
+
+```json
+{"commands": [{"command": "zowe zos-jobs submit data-set IBMUSER.JCL(HELLO)", "description": "Submit it"}]}
+```
+
+Then run zowe zos-jobs list jobs to watch it.
+"""
+
+
+def test_token_by_token_parse_matches_a_whole_parse():
+    whole = parse_response(ANSWER)
+    parser = ResponseParser()
+    events = []
+    for char in ANSWER:
+        events.extend(parser.feed(char))
+    events.extend(parser.close())
+
+    assert parser.result() == whole.result()
+    assert parser.commands == whole.commands
+    assert [event["type"] for event in events] == ["explanation", "file", "command", "command", "explanation"]
+
+
+def test_longer_fence_keeps_shorter_fences_in_the_file():
+    file = parse_response(ANSWER).files[0]
+    assert (file["name"], file["language"]) == ("HELLO.jcl", "jcl")
+    assert file["content"].splitlines() == [
+        "//HELLO JOB", "//* a fence inside the file:", "```", "//STEP1 EXEC PGM=IEFBR14"
+    ]
+
+
+def test_json_commands_win_over_commands_in_prose():
+    parser = parse_response(ANSWER)
+    assert parser.commands == [
+        {"command": "zowe zos-jobs submit data-set IBMUSER.JCL(HELLO)", "description": "Submit it"}
+    ]
+    assert parser.line_commands == [{"command": "zowe zos-jobs list jobs to watch it.", "description": ""}]
+
+
+def test_unterminated_block_is_closed_at_the_end():
+    parser = parse_response("```RUN.jcl\n//RUN JOB\n//STEP1 EXEC PGM=IEFBR14")
+    assert parser.files[0]["content"] == "//RUN JOB\n//STEP1 EXEC PGM=IEFBR14"
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import shlex
+import sys
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mainframe_backend.auth.jwt import create_access_token
+from mainframe_backend.routers import terminal
+
+
+def python_command(code: str) -> str:
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(code)}"
+
+
+def streamed(messages: list, stream: str) -> str:
+    return "".join(message["data"] for message in messages if message["type"] == "output" and message["stream"] == stream)
+
+
+def run_collecting(command: str, cancel_after: float = None) -> list:
+    messages = []
+
+    async def send(message: dict):
+        messages.append(message)
+
+    async def run():
+        cancelled = asyncio.Event()
+        if cancel_after is not None:
+            asyncio.get_running_loop().call_later(cancel_after, cancelled.set)
+        await asyncio.wait_for(terminal.run_command(send, command, cancelled), 10)
+
+    asyncio.run(run())
+    return messages
+
+
+def test_output_is_streamed_then_the_exit_code():
+    messages = run_collecting(python_command("import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"))
+    assert streamed(messages, "stdout") == "out\n"
+    assert streamed(messages, "stderr") == "err\n"
+    assert messages[-1] == {"type": "exit", "code": 3, "cancelled": False, "truncated": False}
+
+
+def test_cancel_kills_a_running_command():
+    messages = run_collecting(
+        python_command("import time; print('started', flush=True); time.sleep(30)"),
+        cancel_after=0.5
+    )
+    assert streamed(messages, "stdout") == "started\n"
+    assert messages[-1]["type"] == "exit"
+    assert messages[-1]["cancelled"]
+    assert messages[-1]["code"] != 0
+
+
+def test_output_past_the_limit_stops_the_command(monkeypatch):
+    monkeypatch.setattr(terminal.settings, "TERMINAL_MAX_OUTPUT_BYTES", 1000)
+    messages = run_collecting(python_command("import time\nwhile True: print('x' * 100, flush=True); time.sleep(0.001)"))
+    assert len(streamed(messages, "stdout")) <= 1000
+    assert any(message["type"] == "error" for message in messages)
+    assert messages[-1]["truncated"]
+
+
+def terminal_socket(client: TestClient, user: str):
+    return client.websocket_connect(f"/api/terminal/ws?token={create_access_token({'sub': user})}")
+
+
+def receive_until(websocket, predicate) -> dict:
+    while True:
+        message = json.loads(websocket.receive_text())
+        if predicate(message):
+            return message
+
+
+def test_commands_run_side_by_side_up_to_the_per_user_limit(monkeypatch):
+    monkeypatch.setattr(terminal.settings, "TERMINAL_MAX_COMMANDS_PER_USER", 2)
+    app = FastAPI()
+    app.include_router(terminal.router)
+    sleeping = python_command("import time; time.sleep(30)")
+
+    with TestClient(app) as client, terminal_socket(client, "alice") as first, terminal_socket(client, "alice") as second:
+        first.send_text(json.dumps({"type": "run", "command": sleeping, "id": "a"}))
+        first.send_text(json.dumps({"type": "run", "command": sleeping, "id": "b"}))
+        assert receive_until(first, lambda m: m["id"] == "b")["type"] == "started"
+
+        # The limit spans all of the user's sockets
+        second.send_text(python_command("print('hi')"))
+        assert receive_until(second, lambda m: True)["type"] == "error"
+        assert terminal.running_per_user == {"alice": 2}
+
+        # Cancelling one command frees a slot; the other keeps running
+        first.send_text(json.dumps({"type": "cancel", "id": "a"}))
+        exit_message = receive_until(first, lambda m: m["type"] == "exit")
+        assert (exit_message["id"], exit_message["cancelled"]) == ("a", True)
+        second.send_text(python_command("print('hi')"))
+        assert receive_until(second, lambda m: m["type"] == "exit")["code"] == 0
+
+    # Closing the sockets stops what was still running
+    assert terminal.running_per_user == {}
@@ -0,0 +1,82 @@
+import asyncio
+from mainframe_backend.services.zosmf_client import ZosmfError
+from tests.zosmf_stub import REQUESTS, credentials, make_client, make_server
+
+
+def test_pooled_session_does_not_reuse_login_cookie():
+    async def run():
+        server = make_server()
+        await server.start_server()
+        client = make_client(server)
+        try:
+            async with client.request(credentials(), "GET", "restfiles/ds?dslevel=IBMUSER.*") as response:
+                assert response.status == 200
+            async with client.request(credentials("wrong"), "GET", "restfiles/ds?dslevel=IBMUSER.*") as response:
+                assert response.status == 401
+            assert all("LtpaToken2" not in request.cookies for request, _ in server.app[REQUESTS])
+        finally:
+            await client.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_authenticate_checks_only_the_supplied_password():
+    async def run():
+        server = make_server()
+        await server.start_server()
+        client = make_client(server)
+        try:
+            await client.authenticate(credentials())
+            try:
+                await client.authenticate(credentials("wrong"))
+            except ZosmfError as e:
+                assert e.status == 401
+            else:
+                raise AssertionError("a wrong password was accepted after a good login")
+        finally:
+            await client.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_sessions_beyond_the_limit_close_the_least_recently_used():
+    async def run():
+        server = make_server()
+        await server.start_server()
+        client = make_client(server)
+        client.max_sessions = 2
+        try:
+            first = client.session(credentials(username="USER1"))
+            client.session(credentials(username="USER2"))
+            # Both old enough to have no request in flight; USER2 was used last
+            for key, (session, last_used) in client._sessions.items():
+                client._sessions[key] = (session, last_used - client.request_timeout - 1)
+            client.session(credentials(username="USER2"))
+            client.session(credentials(username="USER3"))
+            await asyncio.sleep(0)
+            assert [key[2] for key in client._sessions] == ["USER2", "USER3"]
+            assert first.closed
+        finally:
+            await client.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_close_forgets_cached_state():
+    async def run():
+        server = make_server()
+        await server.start_server()
+        client = make_client(server)
+        try:
+            async with client.request(credentials(), "GET", "restfiles/ds?dslevel=IBMUSER.*") as response:
+                assert response.status == 200
+            client._system_info.set(("localhost", "0"), {"zosmf_version": "27"})
+        finally:
+            await client.close()
+            await server.close()
+        assert len(client._sessions) == len(client._csrf_tokens) == len(client._system_info) == 0
+
+    asyncio.run(run())
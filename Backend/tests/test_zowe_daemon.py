@@ -0,0 +1,26 @@
+import asyncio
+import sys
+from mainframe_backend.services.zowe_daemon import ZoweDaemon
+
+
+def test_daemon_that_exits_at_once_is_respawned_with_backoff(monkeypatch, tmp_path):
+    daemon = ZoweDaemon(command=f'"{sys.executable}" -c pass', daemon_dir=str(tmp_path), health_interval=0.01)
+    daemon.enabled = True
+    daemon.max_backoff = 0.08
+    sleeps = []
+    sleep = asyncio.sleep
+
+    async def recording_sleep(delay, *args, **kwargs):
+        sleeps.append(delay)
+        await sleep(0.005)
+
+    async def run():
+        monkeypatch.setattr(asyncio, "sleep", recording_sleep)
+        await daemon.start()
+        while len(sleeps) < 16:
+            await sleep(0.01)
+        await daemon.close()
+
+    asyncio.run(run())
+    assert sorted(set(sleeps)) == [0.01, 0.02, 0.04, 0.08]
+    assert not daemon.healthy
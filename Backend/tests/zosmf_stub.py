@@ -0,0 +1,77 @@
+"""
+In-process stand-in for z/OSMF, served over plain HTTP.
+
+Basic auth is accepted only for GOOD_PASSWORD. Like z/OSMF, a successful
+login sets an LtpaToken2 cookie, and a request carrying that cookie is
+accepted whatever its Authorization header says.
+"""
+import base64
+import inspect
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from mainframe_backend.models.credentials import Credentials
+from mainframe_backend.services.zosmf_client import ZosmfClient
+
+GOOD_PASSWORD = "secret"
+# Every guarded request, with its body
+REQUESTS = web.AppKey("requests", list)
+ANSWER = web.AppKey("answer", object)
+
+
+def credentials(password: str = GOOD_PASSWORD, username: str = "IBMUSER") -> Credentials:
+    return Credentials(host="127.0.0.1", port="0", username=username, password=password)
+
+
+def _authorized(request: web.Request) -> bool:
+    if request.cookies.get("LtpaToken2") == "token":
+        return True
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Basic "):
+        return False
+    return base64.b64decode(header[6:]).decode().split(":", 1)[1] == GOOD_PASSWORD
+
+
+async def _guarded(request: web.Request) -> web.Response:
+    request.app[REQUESTS].append((request, await request.text()))
+    if not _authorized(request):
+        return web.Response(status=401, text="unauthorized")
+    answer = request.app[ANSWER]
+    if callable(answer):
+        # Per-request answers: a web.Response, or a JSON document
+        answer = answer(request)
+        if inspect.isawaitable(answer):
+            answer = await answer
+        response = answer if isinstance(answer, web.StreamResponse) else web.json_response(answer)
+    elif request.method == "PUT":
+        # Writes answer 204 No Content, like z/OSMF
+        response = web.Response(status=204)
+    else:
+        response = web.json_response(answer)
+    response.set_cookie("LtpaToken2", "token")
+    return response
+
+
+async def _csrf(request: web.Request) -> web.Response:
+    return web.Response(headers={"X-CSRF-ZOSMF-TOKEN": "csrf"})
+
+
+async def _handler(request: web.Request) -> web.Response:
+    return await _guarded(request)
+
+
+def make_server(answer=None) -> TestServer:
+    app = web.Application()
+    app[REQUESTS] = []
+    app[ANSWER] = answer if answer is not None else {"items": []}
+    app.add_routes([
+        web.get("/zosmf/", _csrf),
+        web.post("/zosmf/services/authenticate", _handler),
+        web.route("*", "/zosmf/{tail:.*}", _handler)
+    ])
+    return TestServer(app, host="localhost")
+
+
+def make_client(server: TestServer) -> ZosmfClient:
+    client = ZosmfClient()
+    client.base_url = lambda creds: f"http://localhost:{server.port}/zosmf"
+    return client
@@ -261,11 +261,28 @@ const [currentFile, setCurrentFile] = useState(null);
   };
 
   const fetchAnalysis = async () => {
+    const credRaw = localStorage.getItem('credentials');
+    const cred = credRaw ? JSON.parse(credRaw) : null;
+    if (!cred) {
+      console.error('Missing credentials');
+      return;
+    }
+
     try {
       const response = await fetch('http://localhost:8000/api/ai/analyze', {
+        method: 'POST',
         headers: {
+          'Content-Type': 'application/json',
           'Authorization': `Bearer ${localStorage.getItem('token')}`
-        }
+        },
+        body: JSON.stringify({
+          credentials: {
+            host: cred.host,
+            port: cred.port,
+            username: cred.username,
+            password: cred.password
+          }
+        })
       });
       if (response.ok) {
         const data = await response.json();
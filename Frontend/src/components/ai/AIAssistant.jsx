@@ -35,7 +35,7 @@ export const AIAssistant = () => {
         setActionMessages((prev) => [...prev, userMessage]);
       }
 
-      const response = await fetch('http://localhost:8000/api/ai/generate', {
+      const response = await fetch('http://localhost:8000/api/ai/generate/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -45,21 +45,44 @@ export const AIAssistant = () => {
       });
 
       if (!response.ok) throw new Error(`AI error ${response.status}`);
-      const data = await response.json();
 
-      const botMessage = {
-        role: 'assistant',
-        content: data.content || data.response || 'No response',
-      };
+      // Show the answer as it streams in: one assistant message, updated per token
+      const setMessages = activeTab === 'chat' ? setChatMessages : setActionMessages;
+      let content = '';
+      setMessages((prev) => [...prev, { role: 'assistant', content: '' }]);
+      const showContent = (text) =>
+        setMessages((prev) => [...prev.slice(0, -1), { role: 'assistant', content: text }]);
 
-      if (activeTab === 'actions' && data.commands) {
-        setSuggestedCommands(data.commands);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let done = null;
+      while (true) {
+        const { value, done: finished } = await reader.read();
+        if (finished) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+          const dataLine = raw.split('\n').find((line) => line.startsWith('data:'));
+          if (!dataLine) continue;
+          const event = JSON.parse(dataLine.slice(5));
+          if (event.type === 'token') {
+            content += event.content;
+            showContent(content);
+          } else if (event.type === 'done') {
+            done = event;
+          } else if (event.type === 'error') {
+            throw new Error(event.detail);
+          }
+        }
       }
 
-      if (activeTab === 'chat') {
-        setChatMessages((prev) => [...prev, botMessage]);
-      } else {
-        setActionMessages((prev) => [...prev, botMessage]);
+      if (done) {
+        showContent(done.content || done.response || content || 'No response');
+        if (activeTab === 'actions' && done.commands) {
+          setSuggestedCommands(done.commands);
+        }
       }
 
       setMessage('');
@@ -10,8 +10,10 @@ export const EditorArea = () => {
     activeTabId, 
     setActiveTab, 
     closeTab, 
-    updateTabContent 
+    updateTabContent,
+    submittedJobs
   } = useMainframe();
+  const [jobId, setJobId] = React.useState(null);
 
   React.useEffect(() => {
     const handleKeyDown = (e) => {
@@ -53,10 +55,15 @@ export const EditorArea = () => {
 
 
   const handleJobSubmit = async () => {
-    const res = await fetch(`${API_BASE}/jobs/submit`, {
+    const credentials = JSON.parse(localStorage.getItem('credentials'));
+    const res = await fetch('http://localhost:8000/api/jobs/submit', {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ code }) // You'll need to structure this on backend
+      headers: {
+        "Content-Type": "application/json",
+        "Authorization": `Bearer ${localStorage.getItem('token')}`
+      },
+      // Returns immediately; state changes arrive on the context's job event stream
+      body: JSON.stringify({ code: activeTab?.content || '', credentials })
     });
     const data = await res.json();
     setJobId(data.job_id);
@@ -97,6 +104,12 @@ export const EditorArea = () => {
               />
             )}
           </div>
+          {jobId && submittedJobs[jobId] && (
+            <div className="px-3 py-1 text-xs text-gray-300 bg-slate-800 border-t border-slate-700">
+              {submittedJobs[jobId].job_name} ({jobId}): {submittedJobs[jobId].status}
+              {submittedJobs[jobId].return_code && ` - ${submittedJobs[jobId].return_code}`}
+            </div>
+          )}
         </>
       ) : (
         <div className="h-full flex items-center justify-center bg-slate-800 text-gray-400">
@@ -16,17 +16,36 @@ const TerminalComponent = () => {
     term.current.open(terminalRef.current);
     term.current.write("Welcome to Zowe CLI Terminal\r\n> ");
 
-    socket.current = new WebSocket("ws://localhost:8000/api/terminal/ws");
+    const token = localStorage.getItem('token');
+    socket.current = new WebSocket(
+      `ws://localhost:8000/api/terminal/ws${token ? `?token=${encodeURIComponent(token)}` : ''}`
+    );
 
     socket.current.onmessage = (event) => {
-      term.current.write(`\r\n${event.data}\r\n> `);
+      const message = JSON.parse(event.data);
+      // Several commands may run at once; every message carries its command id
+      if (message.type === 'started') {
+        term.current.write(`[${message.id}] ${message.command}\r\n`);
+      } else if (message.type === 'output') {
+        // Output arrives in chunks while the command runs
+        term.current.write(message.data.replace(/\r?\n/g, '\r\n'));
+      } else if (message.type === 'exit') {
+        const status = message.cancelled ? 'cancelled' : `exit ${message.code}`;
+        term.current.write(`\r\n[${message.id}] ${status}\r\n> `);
+      } else if (message.type === 'error') {
+        term.current.write(`\r\n${message.id ? `[${message.id}] ` : ''}${message.message}\r\n`);
+      }
     };
 
     term.current.onData(data => {
       const code = data.charCodeAt(0);
 
+      // Handle Ctrl+C: cancel every running command
+      if (code === 3) {
+        socket.current.send(JSON.stringify({ type: 'cancel' }));
+      }
       // Handle backspace
-      if (code === 127) {
+      else if (code === 127) {
         if (inputBuffer.current.length > 0) {
           inputBuffer.current = inputBuffer.current.slice(0, -1);
           term.current.write('\b \b');
@@ -34,7 +53,7 @@ const TerminalComponent = () => {
       } 
       // Handle Enter
       else if (code === 13) {
-        socket.current.send(inputBuffer.current);
+        socket.current.send(JSON.stringify({ type: 'run', command: inputBuffer.current }));
         inputBuffer.current = '';
         term.current.write('\r\n');
       } 
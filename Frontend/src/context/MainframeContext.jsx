@@ -18,6 +18,8 @@ export const MainframeProvider = ({ children }) => {
   const [error, setError] = useState(null);
   const [credentials, setCredentials] = useState(null);
   const [userInfo, setUserInfo] = useState(null);
+  // job_id -> latest state of the jobs submitted from the editor
+  const [submittedJobs, setSubmittedJobs] = useState({});
 
   useEffect(() => {
     // Load credentials from localStorage
@@ -46,6 +48,23 @@ export const MainframeProvider = ({ children }) => {
     }
   }, []);
 
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!isConnected || !token) return;
+
+    // EventSource cannot send an Authorization header, so the token goes in the query string
+    const source = new EventSource(`http://localhost:8000/api/jobs/events?token=${encodeURIComponent(token)}`);
+    source.addEventListener('job', (event) => {
+      const state = JSON.parse(event.data);
+      setSubmittedJobs(prev => ({ ...prev, [state.job_id]: state }));
+      if (state.status === 'OUTPUT') {
+        fetchJobs();
+      }
+    });
+    source.onerror = () => console.warn('Job event stream interrupted, reconnecting');
+    return () => source.close();
+  }, [isConnected]);
+
   const connectToMainframe = async (credentials) => {
     setLoading(true);
     setError(null);
@@ -164,7 +183,7 @@ export const MainframeProvider = ({ children }) => {
       port: credentials.port
     });
 
-    const response = await fetch('http://localhost:8000/api/datasets/', {
+    const response = await fetch('http://localhost:8000/api/datasets/stream', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -173,20 +192,46 @@ export const MainframeProvider = ({ children }) => {
       body: JSON.stringify(credentials)
     });
 
-    const data = await response.json();
-    console.log('Datasets response:', data);
-
     if (!response.ok) {
+      const data = await response.json();
       throw new Error(data.detail || 'Failed to fetch datasets');
     }
 
-    if (!data.datasets || !Array.isArray(data.datasets)) {
-      console.error('Invalid datasets response format:', data);
-      throw new Error('Invalid response format from server');
+    // NDJSON: one dataset per line, then a summary line. Render each chunk
+    // as it arrives so the explorer shows the first datasets immediately.
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const received = [];
+    let buffer = '';
+    let summary = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const record = JSON.parse(line);
+        if (record.type === 'summary') {
+          summary = record;
+        } else {
+          received.push(record);
+        }
+      }
+      setDatasets([...received]);
     }
 
-    setDatasets(data.datasets);
-    console.log('Successfully fetched datasets:', data.datasets);
+    const patternResults = summary?.patterns || [];
+    const failed = patternResults.filter(p => p.error);
+    if (patternResults.length && failed.length === patternResults.length) {
+      throw new Error(`All dataset listings failed: ${failed[0].error}`);
+    }
+    if (failed.length) {
+      console.warn('Some dataset patterns failed:', failed);
+    }
+    console.log('Successfully fetched datasets:', received.length);
   } catch (error) {
     console.error('Error fetching datasets:', error);
     setError(error.message || 'Failed to fetch datasets');
@@ -262,6 +307,7 @@ export const MainframeProvider = ({ children }) => {
     isConnected,
     datasets,
     jobs,
+    submittedJobs,
     loading,
     error,
     userInfo,